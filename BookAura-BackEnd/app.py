@@ -16,13 +16,19 @@ from controllers.books_view_controller import app as books_views_app
 from controllers.bookmarks_controller import app as bookmarks_app
 from controllers.reading_history_controller import app as reading_history_app
 from controllers.optimized_dashboard_controller import optimized_dashboard
+from db import request_connection
+from utils.pagination import NEXT_CURSOR_HEADER
 
 # Load environment variables from .env
 load_dotenv()
 
 # Create the Flask app instance
 app = Flask(__name__)
-CORS(app)
+# Let browsers read the pagination cursor and validators on cross-origin responses
+CORS(app, expose_headers=[NEXT_CURSOR_HEADER, 'ETag'])
+
+# Share one pooled database connection across all models within a request
+request_connection.init_app(app)
 
 # Set the SECRET_KEY from the .env file
 app.config['SECRET_KEY'] = os.getenv('SECRET_KEY', 'default_secret_key')
@@ -0,0 +1,142 @@
+"""
+ASGI entry point for the BookAura API.
+
+Run with any ASGI server, e.g. ``uvicorn asgi:application``.
+
+The read-heavy dashboard and catalog endpoints below are served natively on
+AsyncDatabasePool, so their queries run concurrently on one event loop.
+Every other request is handed to the Flask app from app.py unchanged.
+"""
+import asyncio
+import json
+import logging
+from urllib.parse import parse_qs
+
+from asgiref.wsgi import WsgiToAsgi
+
+from app import app as flask_app
+from db.async_pool import AsyncDatabasePool
+from db.view_counter import view_counter
+from models.books import BooksModel, book_page_key
+from utils.pagination import NEXT_CURSOR_HEADER, parse_page_args, fetch_limit, split_page
+
+logger = logging.getLogger(__name__)
+
+books_model = BooksModel()
+wsgi_application = WsgiToAsgi(flask_app)
+
+TIME_RANGE_DAYS = {'7d': 7, '30d': 30, '90d': 90}
+EXPOSED_HEADERS = (NEXT_CURSOR_HEADER, 'ETag')
+
+
+async def send_json(send, payload, status=200, headers=None):
+    """Send a JSON response, matching the CORS headers flask_cors adds."""
+    body = json.dumps(payload, default=str).encode('utf-8')
+    await send({
+        'type': 'http.response.start',
+        'status': status,
+        'headers': [
+            (b'content-type', b'application/json'),
+            (b'content-length', str(len(body)).encode('ascii')),
+            (b'access-control-allow-origin', b'*'),
+            (b'access-control-expose-headers', ', '.join(EXPOSED_HEADERS).encode('ascii')),
+        ] + [(name.lower().encode('ascii'), value.encode('ascii')) for name, value in (headers or {}).items()],
+    })
+    await send({'type': 'http.response.body', 'body': body})
+
+
+def query_param(scope, name, default=None):
+    values = parse_qs(scope.get('query_string', b'').decode('latin-1')).get(name)
+    return values[0] if values else default
+
+
+async def dashboard_overview(scope, receive, send):
+    """GET /optimized-dashboard/overview: dashboard figures fetched in parallel."""
+    days = TIME_RANGE_DAYS.get(query_param(scope, 'timeRange', '7d'), 7)
+    total_books, categories, publisher_growth, books_chart = await asyncio.gather(
+        books_model.get_books_count(),
+        books_model.get_books_category_distribution(),
+        books_model.get_publisher_growth(days),
+        books_model.get_books_chart_data(days),
+    )
+    await send_json(send, {
+        'totalBooks': total_books,
+        'categoryDistribution': categories,
+        'publisherGrowth': publisher_growth,
+        'booksChart': books_chart,
+    })
+
+
+async def public_books(scope, receive, send):
+    """
+    GET /books/public: the public catalog, or with ?limit= (max 200) one
+    page of it. Pass the previous page's X-Next-Cursor as ?cursor= for the
+    next one; ?offset= still works but scans every skipped row.
+    """
+    try:
+        limit, after = parse_page_args(query_param(scope, 'limit'), query_param(scope, 'cursor'), 2)
+        offset = query_param(scope, 'offset')
+        offset = int(offset) if offset is not None and after is None else None
+    except ValueError as e:
+        await send_json(send, {'error': str(e)}, status=400)
+        return
+
+    rows, next_cursor = split_page(
+        await books_model.fetch_public_books_async(fetch_limit(limit), offset, after), limit, book_page_key
+    )
+    books = [{
+        'book_id': row['book_id'],
+        'author_id': row['author_id'],
+        'author_name': row['author_name'],
+        'title': row['title'],
+        'description': row['description'],
+        'file_url': row['fileUrl'],
+        'audio_url': row['audioUrl'],
+        'is_public': row['is_public'],
+        'is_approved': row['is_approved'],
+        'uploaded_at': row['uploaded_at'],
+        'uploaded_by_role': row['uploaded_by_role'],
+        'cover_url': f"{row['coverUrl']}" if row['coverUrl'] else None,
+        'categories': row['categories'].split(', ') if row['categories'] else [],
+        'views': row['views']
+    } for row in rows]
+    await send_json(send, books, headers={NEXT_CURSOR_HEADER: next_cursor} if next_cursor else None)
+
+
+ASYNC_ROUTES = {
+    ('GET', '/optimized-dashboard/overview'): dashboard_overview,
+    ('GET', '/books/public'): public_books,
+}
+
+
+async def lifespan(scope, receive, send):
+    """Open the async pool on startup; on shutdown write pending views and close it."""
+    while True:
+        message = await receive()
+        if message['type'] == 'lifespan.startup':
+            try:
+                await AsyncDatabasePool.init_pool()
+            except Exception as e:
+                logger.error(f"Failed to initialize async database pool: {e}")
+                await send({'type': 'lifespan.startup.failed', 'message': str(e)})
+                return
+            await send({'type': 'lifespan.startup.complete'})
+        elif message['type'] == 'lifespan.shutdown':
+            await asyncio.to_thread(view_counter.flush)
+            await AsyncDatabasePool.close_pool()
+            await send({'type': 'lifespan.shutdown.complete'})
+            return
+
+
+async def application(scope, receive, send):
+    if scope['type'] == 'lifespan':
+        await lifespan(scope, receive, send)
+        return
+
+    if scope['type'] == 'http':
+        handler = ASYNC_ROUTES.get((scope['method'], scope['path'].rstrip('/') or '/'))
+        if handler is not None:
+            await handler(scope, receive, send)
+            return
+
+    await wsgi_application(scope, receive, send)
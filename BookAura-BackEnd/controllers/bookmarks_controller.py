@@ -1,15 +1,35 @@
 from flask import request, jsonify, Blueprint
 from models.bookmarks import BookmarksModel
 from utils.auth_utils import decode_token
+from utils.pagination import page_args, fetch_limit, split_page, page_response
+from utils.response_cache import cached_response, book_tag, user_bookmarks_tag
 
 app = Blueprint('bookmarks', __name__)
 bookmarks_model = BookmarksModel()
 
+USER_BOOKMARKS_TTL = 60
+
+
+def token_user_id(**view_args):
+    """Cache key suffix for per-user responses; None (no caching) without a valid token."""
+    token = request.headers.get('Authorization')
+    decoded_token = decode_token(token) if token else None
+    return decoded_token['user_id'] if decoded_token else None
+
+
+def user_bookmarks_tags(bookmarks, variant, **view_args):
+    return {user_bookmarks_tag(variant)} | {book_tag(row['book_id']) for row in bookmarks or []}
+
 @app.route('/', methods=['GET'])
 def get_all_bookmarks():
-    rows = bookmarks_model.fetch_all_bookmarks()
+    try:
+        limit, after = page_args(1)
+    except ValueError as e:
+        return jsonify({'error': str(e)}), 400
+    rows, next_cursor = split_page(bookmarks_model.fetch_all_bookmarks(limit=fetch_limit(limit), after=after), limit,
+                                   lambda row: [row[0]])
     bookmarks = [{'bookmark_id': row[0], 'user_id': row[1], 'book_id': row[2]} for row in rows]
-    return jsonify(bookmarks)
+    return page_response(bookmarks, next_cursor)
 
 @app.route('/<int:bookmark_id>', methods=['GET'])
 def get_bookmark(bookmark_id):
@@ -35,6 +55,7 @@ def delete_bookmark(bookmark_id):
     return jsonify({'message': 'Bookmark deleted successfully'}), 200
 
 @app.route('/user', methods=['GET'])
+@cached_response(USER_BOOKMARKS_TTL, tags=user_bookmarks_tags, vary=token_user_id)
 def get_bookmarks_by_user():
     token = request.headers.get('Authorization')
     if not token:
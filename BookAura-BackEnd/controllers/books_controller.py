@@ -1,14 +1,17 @@
 from flask import request, jsonify, Blueprint, send_from_directory
-from models.books import BooksModel
+from models.books import BooksModel, book_page_key
+from models.processing_jobs import processing_jobs_model
 import os
 import time
 from werkzeug.utils import secure_filename
 from utils.auth_utils import decode_token
+from utils.conditional_requests import versioned_response
+from utils.pagination import page_args, fetch_limit, split_page, page_response
+from utils.response_cache import cached_response, book_tag, category_tag, BOOK_LIST_TAG, BOOK_SEARCH_TAG
 import subprocess
 import json
 import pdfplumber
 import logging
-import threading
 
 
 app = Blueprint('books', __name__)
@@ -24,6 +27,31 @@ os.makedirs(UPLOAD_FOLDER, exist_ok=True)
 AUDIO_UPLOAD_FOLDER = 'audio_uploads/'
 os.makedirs(AUDIO_UPLOAD_FOLDER, exist_ok=True)
 
+# Response cache TTLs (seconds) for the anonymous catalog endpoints. Edits
+# invalidate the affected entries at once; the TTL bounds how stale view
+# counts and other workers' in-memory caches can get.
+BOOK_LIST_TTL = 60
+BOOK_SEARCH_TTL = 30
+BOOK_CATEGORY_TTL = 60
+FULL_BOOK_TTL = 120
+
+
+def book_list_tags(books, **view_args):
+    return {BOOK_LIST_TAG}
+
+
+def search_tags(books, **view_args):
+    return {BOOK_SEARCH_TAG} | {book_tag(book['book_id']) for book in books or []}
+
+
+def category_books_tags(books, category_id, **view_args):
+    return {category_tag(category_id)} | {book_tag(book['book_id']) for book in books or []}
+
+
+def full_book_tags(data, book_id, **view_args):
+    related = (data or {}).get('related_by_category', []) + (data or {}).get('related_by_author', [])
+    return {book_tag(book_id)} | {book_tag(book['book_id']) for book in related}
+
 def upload_cover_file(file, title):
     try:
         if not file or not title:
@@ -73,22 +101,11 @@ def upload_file(file, title):
         # Save PDF file
         file.save(pdf_path)
         
-        # Trigger translation and audio conversion synchronously
+        # Trigger translation synchronously; audio is queued by create_book
         try:
             trigger_translation(pdf_path)
         except Exception as trans_error:
             print(f"Translation error: {str(trans_error)}")
-            
-        try:
-            final_script_path = os.path.abspath(os.path.join(os.path.dirname(__file__), "../services/final.py"))
-            subprocess.Popen(
-                ['python', final_script_path, pdf_path],
-                stdout=subprocess.PIPE,
-                stderr=subprocess.PIPE
-            )
-            print(f"Started final.py for audio conversion: {os.path.basename(pdf_path)}")            
-        except Exception as audio_error:  
-            print(f"Audio conversion error: {str(audio_error)}")
 
         return pdf_path, audio_path
 
@@ -106,29 +123,6 @@ HINDI_TTS_MODEL_ID = "633c02befd966563f61bc2be"  # Hindi TTS
 TRANSLATE_CHUNK_SIZE = 200000
 TTS_CHUNK_SIZE = 25000
 
-def process_book_async(pdf_path, book_id, book_title):
-    """
-    Process book translations and audio in a detached background process.
-    """
-    try:
-        logger.info(f"Starting background processing for book {book_id}: {book_title}")
-        # Locate final.py
-        final_script = os.path.abspath(
-            os.path.join(os.path.dirname(__file__), "../services/final.py")
-        )
-        if not os.path.exists(final_script):
-            logger.error(f"Audio conversion script not found: {final_script}")
-            return
-
-        cmd = ["python", final_script, pdf_path]
-        logger.info(f"Launching detached process: {' '.join(cmd)}")
-        # fire-and-forget; no communicate()
-        subprocess.Popen(cmd, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
-    except Exception as e:
-        logger.error(f"Error launching audio conversion for book {book_id}: {e}")
-        import traceback; logger.error(traceback.format_exc())
-
-
 def check_and_approve_partial_results(book_id, pdf_path):
     """Check if any audio files were generated and approve the book if at least one exists"""
     try:
@@ -181,11 +175,16 @@ import os
 import pdfplumber
 import pyttsx3
 import re
+import sys
 import requests
 import base64
 from pydub import AudioSegment
 import json  # Ensure json is imported inside the script too
 
+# Runs from controllers/; share the backend's pooled keep-alive session
+sys.path.insert(0, os.path.abspath(".."))
+from utils.http_client import get_session
+
 TRANSLATE_URL = "https://meity-auth.ulcacontrib.org/ulca/apis/v0/model/compute"
 MARATHI_TRANSLATE_MODEL_ID = "641d1d7c8ecee6735a1b37c3"  # English → Marathi
 HINDI_TRANSLATE_MODEL_ID = "641d1d6592a6a31751ff1f49"   # English → Hindi
@@ -322,7 +321,7 @@ def translate_text(text, target_lang="mr"):
 
     response = None  # Initialize response to None
     try:
-        response = requests.post(TRANSLATE_URL, json=payload, headers=headers, timeout=120)  # Increased timeout
+        response = get_session().post(TRANSLATE_URL, json=payload, headers=headers, timeout=120)  # Increased timeout
         response.raise_for_status()  # Raise an exception for bad status codes (4xx or 5xx)
         # Check if response JSON and expected keys exist
         response_json = response.json()
@@ -385,7 +384,7 @@ def convert_text_to_speech(text, output_folder, language):
 
             response = None  # Initialize response
             try:
-                response = requests.post(
+                response = get_session().post(
                     "https://meity-auth.ulcacontrib.org/ulca/apis/v0/model/compute",  # New TTS API URL
                     json=payload,
                     headers={{"Content-Type": "application/json"}} ,
@@ -515,9 +514,16 @@ def serve_audio_file(filename):
 
 
 @app.route('/', methods=['GET'])
+@versioned_response(lambda: books_model.get_catalog_version())
+@cached_response(BOOK_LIST_TTL, tags=book_list_tags)
 def get_all_books():
-    base_url = request.host_url
-    rows = books_model.get_all_books()
+    try:
+        limit, after = page_args(2)
+    except ValueError as e:
+        return jsonify({'error': str(e)}), 400
+    rows, next_cursor = split_page(
+        books_model.get_all_books(limit=fetch_limit(limit), after=after), limit, book_page_key
+    )
     books = [{
         'book_id': row['book_id'],
         'author_id': row['author_id'],
@@ -534,9 +540,10 @@ def get_all_books():
         'categories': row['categories'].split(', ') if row['categories'] else [],
         'views': row['views']
     } for row in rows]
-    return jsonify(books)
+    return page_response(books, next_cursor)
 
 @app.route('/<int:book_id>', methods=['GET'])
+@versioned_response(lambda book_id: books_model.get_book_version(book_id))
 def get_book(book_id):
     row = books_model.get_book_by_id(book_id)
     if row is None:
@@ -636,18 +643,12 @@ def create_book():
                 cover_url=cover_url
             )
             
-            # Now that we have the book_id, start background processing
+            # Now that we have the book_id, queue it for scripts/run_book_workers.py
+            job_id = None
             if book_id:
-                logger.info(f"Book created successfully with ID: {book_id}, starting processing")
-                
-                # Start processing in a separate thread
-                processing_thread = threading.Thread(
-                    target=process_book_async, 
-                    args=(file_url, book_id, data['title'])
-                )
-                processing_thread.daemon = True
-                processing_thread.start()
-                
+                logger.info(f"Book created successfully with ID: {book_id}, queueing processing")
+                job_id = processing_jobs_model.enqueue(book_id, os.path.abspath(file_url))
+
         except Exception as db_error:
             logger.error(f"Database error: {str(db_error)}")
             return jsonify({'error': 'Failed to create book record'}), 500
@@ -655,6 +656,7 @@ def create_book():
         return jsonify({
             'message': 'Book created successfully',
             'book_id': book_id,
+            'job_id': job_id,
             'file_url': file_url,
             'cover_url': cover_url,
             'audio_url': audio_url
@@ -695,11 +697,8 @@ def delete_book(book_id):
         # print(decoded_token)
         user_id = decoded_token['user_id']
         
-        # Create a fresh instance of the model to ensure clean connection
-        fresh_books_model = BooksModel()
-        
         # Check if the book exists
-        book = fresh_books_model.get_book_by_id(book_id)
+        book = books_model.get_book_by_id(book_id)
         if not book:
             return jsonify({'error': 'Book not found'}), 404
         
@@ -751,14 +750,8 @@ def delete_book(book_id):
             logger.error(f"Error deleting files: {str(file_error)}")
             # Continue with database deletion even if file deletion fails
         
-        # Delete the book from the database with a fresh connection
-        result = fresh_books_model.delete_book(book_id)
-        
-        # Explicitly close any open connections
-        try:
-            fresh_books_model.close_all_connections()
-        except Exception as close_error:
-            logger.error(f"Error closing connections: {str(close_error)}")
+        # Delete the book from the database
+        result = books_model.delete_book(book_id)
         
         if result:
             return jsonify({'message': f'Book {book_id} deleted successfully'}), 200
@@ -872,6 +865,7 @@ def get_book_author(book_id):
     return jsonify({'author_name': author})
 
 @app.route('/search/<string:query>', methods=['GET'])
+@cached_response(BOOK_SEARCH_TTL, tags=search_tags)
 def search_books(query):
     rows = books_model.search_books(query)
     books = [{
@@ -892,6 +886,7 @@ def search_books(query):
     return jsonify(books)
 
 @app.route('/category/<int:category_id>', methods=['GET'])
+@cached_response(BOOK_CATEGORY_TTL, tags=category_books_tags)
 def get_books_by_category(category_id):
     rows = books_model.fetch_books_by_category(category_id)
     books = [{
@@ -912,6 +907,8 @@ def get_books_by_category(category_id):
     return jsonify(books)
 
 @app.route('/full/<int:book_id>', methods=['GET'])
+@versioned_response(lambda book_id: books_model.get_catalog_version())
+@cached_response(FULL_BOOK_TTL, tags=full_book_tags)
 def get_full_book(book_id):
     book_data = books_model.fetch_complete_book(book_id)
     if not book_data:
@@ -929,7 +926,13 @@ def get_books_by_publisher():
         return jsonify({'error': 'Invalid token'}), 401
     
     publisher_id = user['user_id']
-    rows = books_model.fetch_books_by_publisher(publisher_id)
+    try:
+        limit, after = page_args(2)
+    except ValueError as e:
+        return jsonify({'error': str(e)}), 400
+    rows, next_cursor = split_page(
+        books_model.fetch_books_by_publisher(publisher_id, limit=fetch_limit(limit), after=after), limit, book_page_key
+    )
     
     books = [{
         'book_id': row['book_id'],
@@ -947,7 +950,7 @@ def get_books_by_publisher():
         'views': row['views']
     } for row in rows]
     
-    return jsonify(books)
+    return page_response(books, next_cursor)
 
 @app.route('/<int:book_id>/approve', methods=['POST'])
 def approve_book(book_id):
@@ -962,3 +965,74 @@ def approve_book(book_id):
     except Exception as e:
         logger.error(f"Error in approve_book endpoint: {str(e)}")
         return jsonify({'error': f'Internal server error: {str(e)}'}), 500
+
+
+PLATFORM_ADMINISTRATOR_ROLE = 1
+
+def _job_json(job, include_error=False):
+    data = {
+        'job_id': job['job_id'],
+        'book_id': job['book_id'],
+        'status': job['status'],
+        'attempts': job['attempts'],
+        'max_attempts': job['max_attempts'],
+        'run_after': str(job['run_after']) if job['run_after'] else None,
+        'created_at': str(job['created_at']),
+        'finished_at': str(job['finished_at']) if job['finished_at'] else None
+    }
+    # Exception text and server paths; administrators only
+    if include_error:
+        data['last_error'] = job['last_error']
+    return data
+
+def _job_caller():
+    """
+    Decoded token of the caller of a job route.
+
+    Returns:
+        (decoded_token, None), or (None, error response) without a valid token
+    """
+    token = request.headers.get('Authorization')
+    if not token:
+        return None, (jsonify({'error': 'Authorization token is required'}), 401)
+    decoded_token = decode_token(token)
+    if not decoded_token or 'user_id' not in decoded_token:
+        return None, (jsonify({'error': 'Invalid token'}), 401)
+    return decoded_token, None
+
+def _job_access_error(decoded_token, book_id):
+    """Error response unless the caller owns the book or is a platform administrator, else None."""
+    if decoded_token.get('role_id') == PLATFORM_ADMINISTRATOR_ROLE:
+        return None
+    owner_id = books_model.get_book_owner(book_id)
+    if owner_id is None:
+        return jsonify({'error': 'Book not found'}), 404
+    if owner_id != decoded_token['user_id']:
+        return jsonify({'error': 'Unauthorized to view processing jobs for this book'}), 403
+    return None
+
+@app.route('/jobs/<int:job_id>', methods=['GET'])
+def get_processing_job(job_id):
+    decoded_token, error = _job_caller()
+    if error:
+        return error
+    job = processing_jobs_model.get_job(job_id)
+    if job is None:
+        return jsonify({'error': 'Job not found'}), 404
+    error = _job_access_error(decoded_token, job['book_id'])
+    if error:
+        return error
+    is_admin = decoded_token.get('role_id') == PLATFORM_ADMINISTRATOR_ROLE
+    return jsonify(_job_json(job, include_error=is_admin))
+
+@app.route('/<int:book_id>/jobs', methods=['GET'])
+def get_book_processing_jobs(book_id):
+    decoded_token, error = _job_caller()
+    if error:
+        return error
+    error = _job_access_error(decoded_token, book_id)
+    if error:
+        return error
+    is_admin = decoded_token.get('role_id') == PLATFORM_ADMINISTRATOR_ROLE
+    jobs = processing_jobs_model.get_jobs_for_book(book_id) or []
+    return jsonify([_job_json(job, include_error=is_admin) for job in jobs])
@@ -1,11 +1,20 @@
 from flask import request, jsonify, Blueprint
 from models.categories import CategoriesModel
 import traceback
+from utils.conditional_requests import versioned_response
+from utils.response_cache import cached_response, CATEGORIES_TAG
 
 app = Blueprint('categories', __name__)
 categories_model = CategoriesModel()
 
+CATEGORIES_TTL = 300
+
+
+def categories_tags(categories, **view_args):
+    return {CATEGORIES_TAG}
+
 @app.route('/', methods=['GET'])
+@cached_response(CATEGORIES_TTL, tags=categories_tags)
 def get_all_categories():
     try:
         rows = categories_model.fetch_all_categories()
@@ -17,6 +26,7 @@ def get_all_categories():
         return jsonify({'error': 'Failed to fetch categories', 'details': str(e)}), 500
 
 @app.route('/<int:category_id>', methods=['GET'])
+@versioned_response(lambda category_id: categories_model.get_category_version(category_id))
 def get_category(category_id):
     try:
         row = categories_model.fetch_category_by_id(category_id)
@@ -1,6 +1,7 @@
 from flask import request, jsonify, Blueprint
 from models.moderator import ModeratorsModel
 from utils.auth_utils import decode_token, validate_password_by_user_id
+from utils.streaming import export_format, stream_rows_response
 from functools import wraps
 
 app = Blueprint('moderator', __name__)
@@ -95,6 +96,17 @@ def get_content_challenges():
     challenges = moderators_model.get_content_challenges()
     return jsonify(challenges)
 
+@app.route('/content-challenges/export', methods=['GET'])
+@token_required
+def export_content_challenges():
+    """All challenges as NDJSON (default) or, with ?format=json, one streamed JSON array."""
+    try:
+        fmt = export_format()
+    except ValueError as e:
+        return jsonify({'error': str(e)}), 400
+    return stream_rows_response(moderators_model.stream_content_challenges(), fmt=fmt,
+                                filename='content_challenges')
+
 @app.route('/content-challenges/<int:challenge_id>/review', methods=['POST'])
 @token_required
 def review_challenge(challenge_id):
@@ -1,5 +1,6 @@
 from flask import Blueprint, jsonify, request
 from services.dashboard_service import DashboardService
+from services.dashboard_snapshot import dashboard_snapshots
 import logging
 
 # Configure logging
@@ -41,6 +42,28 @@ def get_publisher_growth():
         logger.error(f"Error in get_publisher_growth endpoint: {e}")
         return jsonify({"error": "Failed to retrieve publisher growth data"}), 500
 
+@optimized_dashboard.route('/moderator-growth', methods=['GET'])
+def get_moderator_growth():
+    """Get moderator sign-ups per month."""
+    try:
+        time_range = request.args.get('timeRange', '30d')
+        data = DashboardService.get_growth_data('moderators', time_range)
+        return jsonify(data)
+    except Exception as e:
+        logger.error(f"Error in get_moderator_growth endpoint: {e}")
+        return jsonify({"error": "Failed to retrieve moderator growth data"}), 500
+
+@optimized_dashboard.route('/user-growth', methods=['GET'])
+def get_user_growth():
+    """Get user sign-ups per month."""
+    try:
+        time_range = request.args.get('timeRange', '30d')
+        data = DashboardService.get_growth_data('users', time_range)
+        return jsonify(data)
+    except Exception as e:
+        logger.error(f"Error in get_user_growth endpoint: {e}")
+        return jsonify({"error": "Failed to retrieve user growth data"}), 500
+
 @optimized_dashboard.route('/category-distribution', methods=['GET'])
 def get_category_distribution():
     """Get book category distribution."""
@@ -63,10 +86,14 @@ def get_top_content():
 
 @optimized_dashboard.route('/all-data', methods=['GET'])
 def get_all_data():
-    """Get all dashboard data in a single request."""
+    """
+    Get all dashboard data in a single request, served from the
+    precomputed snapshot. ?refresh=true rebuilds it first.
+    """
     try:
         time_range = request.args.get('timeRange', '30d')
-        data = DashboardService.get_all_dashboard_data(time_range)
+        refresh = request.args.get('refresh', '').lower() in ('1', 'true', 'yes')
+        data = dashboard_snapshots.get(time_range, refresh=refresh)
         return jsonify(data)
     except Exception as e:
         logger.error(f"Error in get_all_data endpoint: {e}")
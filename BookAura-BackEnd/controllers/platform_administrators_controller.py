@@ -5,9 +5,14 @@ from models.moderator import ModeratorsModel
 from models.books import BooksModel
 from models.book_view import BooksViewsModel
 from models.reading_history import ReadingHistoryModel
+from db.connection_pool import DatabasePool
+from db.query_stats import QueryStats
+from db.routing import ReplicaRouter
 from utils.auth_utils import decode_token, validate_password_by_user_id
+from utils.response_cache import ResponseCache
+from utils.streaming import export_format, stream_rows_response
+from services.dashboard_snapshot import dashboard_snapshots
 from functools import wraps
-from datetime import datetime, timedelta
 import logging
 
 # Configure logging
@@ -76,23 +81,12 @@ def delete_platform_administrator(admin_id):
 @token_required
 def get_dashboard_stats():
     try:
-        # Get total number of publishers
-        total_publishers = len(publishers_model.fetch_all_publishers())
-        
-        # Get total number of moderators
-        total_moderators = len(moderator_model.fetch_all_moderators())
-        
-        # Get total number of books
-        total_books = len(books_model.get_all_books())
-        
-        # Get total number of flagged content
-        flagged_publishers = len([p for p in publishers_model.fetch_all_publishers() if p[2] == 1])  # is_flagged is at index 2
-        
-        # Get active readers in the last 30 days
-        active_readers = reading_history_model.count_active_readers(30)
-        
-        # Get total views
-        total_views = books_views_model.get_total_views()
+        # Publisher, flagged publisher, moderator and book totals in one query
+        counts = platform_administrator_model.get_dashboard_counts()
+        total_publishers = counts['total_publishers']
+        total_moderators = counts['total_moderators']
+        total_books = counts['total_books']
+        flagged_publishers = counts['flagged_publishers']
         
         # Calculate month-over-month changes (for demonstration)
         # In a real app, you would compare with last month's data
@@ -153,8 +147,7 @@ def get_chart_data():
             days = 90
         
         # Get daily views data
-        conn = books_views_model.get_connection()
-        daily_views = books_views_model.get_daily_views(days=days, conn=conn)
+        daily_views = books_views_model.get_daily_views(days=days)
         
         # Format the data for the chart
         chart_data = []
@@ -198,9 +191,6 @@ def get_chart_data():
                     "value": views
                 })
         
-        if conn and conn.is_connected():
-            conn.close()
-            
         return jsonify(chart_data)
     except Exception as e:
         logger.error(f"Error getting chart data: {e}")
@@ -272,12 +262,12 @@ def get_all_dashboard_data():
     try:
         time_range = request.args.get('timeRange', '7d')
         
-        # Create a new connection for each model operation to avoid "Commands out of sync" error
         # Get dashboard stats
-        total_publishers = len(publishers_model.fetch_all_publishers2())
-        total_moderators = len(moderator_model.fetch_all_moderators2())
-        total_books = len(books_model.get_all_books2())
-        flagged_publishers = len([p for p in publishers_model.fetch_all_publishers2() if p[2] == 1])
+        counts = platform_administrator_model.get_dashboard_counts()
+        total_publishers = counts['total_publishers']
+        total_moderators = counts['total_moderators']
+        total_books = counts['total_books']
+        flagged_publishers = counts['flagged_publishers']
         
         # Calculate month-over-month changes (for demonstration)
         publisher_change = "15%"
@@ -323,7 +313,7 @@ def get_all_dashboard_data():
         elif time_range == '90d':
             days = 90
         
-        daily_views = books_views_model.get_daily_views2(days)
+        daily_views = books_views_model.get_daily_views(days)
         chart_data = []
         
         if time_range == '7d':
@@ -362,19 +352,8 @@ def get_all_dashboard_data():
                     "value": views
                 })
         
-        # Get publisher growth data
-        growth_data = []
-        today = datetime.now()
-        
-        for i in range(5, -1, -1):
-            month_start = today.replace(day=1) - timedelta(days=30*i)
-            month_name = month_start.strftime("%b")
-            publishers_count = publishers_model.count_publishers_by_month2(month_start.month, month_start.year)
-            
-            growth_data.append({
-                "name": month_name,
-                "publishers": publishers_count
-            })
+        # Get publisher growth data for the last 6 months
+        growth_data = publishers_model.get_growth_data()
         
         # Get category distribution data
         category_data = books_model.get_books_by_category2()
@@ -401,4 +380,60 @@ def get_all_dashboard_data():
         return jsonify({
             'error': 'Failed to retrieve dashboard data',
             'message': str(e)
-        }), 500
\ No newline at end of file
+        }), 500
+
+def is_platform_administrator():
+    return request.user.get('role_id') == 1
+
+@app.route('/db-stats', methods=['GET'])
+@token_required
+def get_db_stats():
+    """Per-statement query timings plus connection pool and response cache counters."""
+    if not is_platform_administrator():
+        return jsonify({'error': 'Unauthorized'}), 403
+    try:
+        limit = request.args.get('limit', 50, type=int)
+        order_by = request.args.get('orderBy', 'total_ms')
+        return jsonify({
+            'queries': QueryStats.snapshot(limit=limit, order_by=order_by),
+            'pool': DatabasePool.stats(),
+            'replicas': ReplicaRouter.stats(),
+            'response_cache': ResponseCache.stats(),
+            'dashboard_snapshots': dashboard_snapshots.stats(),
+        })
+    except Exception as e:
+        logger.error(f"Error getting database stats: {e}")
+        return jsonify({'error': 'Failed to retrieve database stats', 'message': str(e)}), 500
+
+@app.route('/export/books', methods=['GET'])
+@token_required
+def export_books():
+    """Every book as NDJSON (default) or, with ?format=json, one streamed JSON array."""
+    if not is_platform_administrator():
+        return jsonify({'error': 'Unauthorized'}), 403
+    try:
+        fmt = export_format()
+    except ValueError as e:
+        return jsonify({'error': str(e)}), 400
+    return stream_rows_response(books_model.stream_all_books(), fmt=fmt, filename='books')
+
+@app.route('/export/publishers', methods=['GET'])
+@token_required
+def export_publishers():
+    """Every publisher as NDJSON (default) or, with ?format=json, one streamed JSON array."""
+    if not is_platform_administrator():
+        return jsonify({'error': 'Unauthorized'}), 403
+    try:
+        fmt = export_format()
+    except ValueError as e:
+        return jsonify({'error': str(e)}), 400
+    return stream_rows_response(publishers_model.stream_all_publishers(), fmt=fmt, filename='publishers')
+
+@app.route('/db-stats', methods=['DELETE'])
+@token_required
+def reset_db_stats():
+    """Clear the query timing aggregates, e.g. before a measurement run."""
+    if not is_platform_administrator():
+        return jsonify({'error': 'Unauthorized'}), 403
+    QueryStats.reset()
+    return jsonify({'message': 'Query stats reset'})
@@ -4,6 +4,7 @@ from models.books import BooksModel
 from models.book_view import BooksViewsModel
 from models.reading_history import ReadingHistoryModel
 from utils.auth_utils import decode_token, validate_password_by_user_id
+from utils.pagination import page_args, fetch_limit, split_page, page_response
 from functools import wraps
 from datetime import datetime, timedelta
 import logging
@@ -41,9 +42,14 @@ def token_required(f):
 
 @app.route('/', methods=['GET'])
 def get_all_publishers():
-    rows = publishers_model.fetch_all_publishers()
+    try:
+        limit, after = page_args(1)
+    except ValueError as e:
+        return jsonify({'error': str(e)}), 400
+    rows, next_cursor = split_page(publishers_model.fetch_all_publishers(limit=fetch_limit(limit), after=after), limit,
+                                   lambda row: [row[0]])
     publishers = [{'publisher_id': row[0], 'user_id': row[1], 'is_flagged': row[2], 'is_approved': row[3]} for row in rows]
-    return jsonify(publishers)
+    return page_response(publishers, next_cursor)
 
 @app.route('/<int:publisher_id>', methods=['GET'])
 def get_publisher(publisher_id):
@@ -154,8 +160,7 @@ def get_publisher_analytics(publisher_id):
         
         # Get total books published - with proper connection handling
         try:
-            books_conn = BooksModel()
-            total_books = books_conn.count_books_by_publisher(user_id) or 0
+            total_books = books_model.count_books_by_publisher(user_id) or 0
             analytics_data['total_books'] = total_books
         except Exception as e:
             logger.error(f"Error getting book count: {e}")
@@ -193,10 +198,10 @@ def get_publisher_analytics(publisher_id):
             logger.error(f"Error getting recent readers: {e}")
             # Keep default value
         
-        # Generate monthly revenue/views data
+        # Monthly views from the daily view buckets
         try:
             if analytics_data['total_views'] > 0:
-                analytics_data['monthly_revenue'] = generate_monthly_data(analytics_data['total_views'])
+                analytics_data['monthly_revenue'] = generate_monthly_data(user_id)
         except Exception as e:
             logger.error(f"Error generating monthly data: {e}")
             # Keep default value
@@ -217,27 +222,12 @@ def get_publisher_analytics(publisher_id):
             'recent_readers': []
         }), 500
 
-def generate_monthly_data(total_views):
-    """Generate monthly data based on total views"""
-    monthly_data = []
-    today = datetime.now()
-    
-    # Create a distribution pattern (more recent months get more views)
-    distribution = [0.05, 0.10, 0.15, 0.20, 0.25, 0.25]  # 5%, 10%, 15%, 20%, 25%, 25%
-    
-    for i in range(5, -1, -1):
-        month_start = today.replace(day=1) - timedelta(days=30*i)
-        month_name = month_start.strftime("%b")  # Short month name
-        
-        # Convert distribution value to float before multiplication
-        month_views = int(float(total_views) * distribution[5-i])
-        
-        monthly_data.append({
-            "name": month_name,
-            "total": month_views
-        })
-    
-    return monthly_data
+def generate_monthly_data(publisher_id, months=6):
+    """Views per month for a publisher's books over the last `months` months"""
+    return [
+        {"name": month.strftime("%b"), "total": views}
+        for month, views in books_views_model.get_monthly_views(months=months, publisher_id=publisher_id)
+    ]
 
 def generate_sample_monthly_data():
     """Generate sample monthly data for fallback"""
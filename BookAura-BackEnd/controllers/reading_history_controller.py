@@ -1,6 +1,7 @@
 from flask import request, jsonify, Blueprint
 from models.reading_history import ReadingHistoryModel
 from utils.auth_utils import decode_token
+from utils.pagination import page_args, fetch_limit, split_page, page_response
 
 app = Blueprint('reading_history', __name__)
 reading_history_model = ReadingHistoryModel()
@@ -14,9 +15,14 @@ def get_all_reading_history():
     decoded_token = decode_token(token)
     if not decoded_token:
         return jsonify({'error': 'Invalid token'}), 401
-    rows = reading_history_model.fetch_all_reading_history()
+    try:
+        limit, after = page_args(1)
+    except ValueError as e:
+        return jsonify({'error': str(e)}), 400
+    rows = reading_history_model.fetch_all_reading_history(limit=fetch_limit(limit), after=after)
+    rows, next_cursor = split_page(rows, limit, lambda row: [row[0]])
     reading_history = [{'history_id': row[0], 'user_id': row[1], 'book_id': row[2], 'date': row[3]} for row in rows]
-    return jsonify(reading_history)
+    return page_response(reading_history, next_cursor)
 
 @app.route('/<int:history_id>', methods=['GET'])
 def get_reading_history(history_id):
@@ -1,6 +1,7 @@
 from flask import request, jsonify, Blueprint
 from models.users import UsersModel
 from utils.auth_utils import decode_token,validate_password_by_user_id,encode_password
+from utils.pagination import page_args, fetch_limit, split_page, page_response
 
 
 
@@ -10,9 +11,14 @@ users_model = UsersModel()
 
 @app.route('/', methods=['GET'])
 def get_all_users():
-    rows = users_model.fetch_all_users()
+    try:
+        limit, after = page_args(1)
+    except ValueError as e:
+        return jsonify({'error': str(e)}), 400
+    rows, next_cursor = split_page(users_model.fetch_all_users(limit=fetch_limit(limit), after=after), limit,
+                                   lambda row: [row['user_id']])
     # users = [{'user_id': row[0], 'username': row[1], 'email': row[2]} for row in rows]
-    return jsonify(rows)
+    return page_response(rows, next_cursor)
 
 @app.route('/<int:user_id>', methods=['GET'])
 def get_user(user_id):
@@ -0,0 +1,134 @@
+import asyncio
+import logging
+import time
+from contextlib import asynccontextmanager
+
+from db.config import get_db_config, get_pool_config
+from db.query_stats import QueryStats, find_caller
+
+logger = logging.getLogger(__name__)
+
+
+class AsyncDatabasePool:
+    """
+    Singleton wrapper around an aiomysql pool for the ASGI deployment.
+    Uses the same connection settings and sizing as DatabasePool (see db.config),
+    so async reads never tie up a worker thread while waiting on MySQL.
+    """
+    _instance = None
+    _pool = None
+    _lock = None
+
+    def __new__(cls):
+        if cls._instance is None:
+            cls._instance = super(AsyncDatabasePool, cls).__new__(cls)
+        return cls._instance
+
+    @classmethod
+    async def init_pool(cls):
+        """Create the aiomysql pool; safe to call more than once."""
+        if cls._lock is None:
+            cls._lock = asyncio.Lock()
+        async with cls._lock:
+            if cls._pool is not None:
+                return cls._pool
+
+            # Imported here so the WSGI app does not need aiomysql installed
+            import aiomysql
+
+            config = get_db_config()
+            pool_config = get_pool_config()
+            cls._pool = await aiomysql.create_pool(
+                host=config['host'],
+                port=config['port'],
+                db=config['database'],
+                user=config['user'],
+                password=config['password'],
+                connect_timeout=config['connection_timeout'],
+                autocommit=True,
+                minsize=1,
+                maxsize=pool_config['pool_size'] + pool_config['max_overflow'],
+                cursorclass=aiomysql.DictCursor,
+            )
+            logger.info(
+                "Async database connection pool initialized "
+                f"(maxsize={pool_config['pool_size'] + pool_config['max_overflow']})"
+            )
+            return cls._pool
+
+    @classmethod
+    async def close_pool(cls):
+        """Close every connection in the pool and wait for them to finish."""
+        if cls._pool is None:
+            return
+        pool, cls._pool = cls._pool, None
+        pool.close()
+        await pool.wait_closed()
+        logger.info("Async database connection pool closed")
+
+    @classmethod
+    @asynccontextmanager
+    async def acquire(cls):
+        """
+        Check a connection out of the pool for the duration of the block.
+        Waits up to DB_POOL_TIMEOUT seconds when every connection is in use.
+        """
+        pool = cls._pool or await cls.init_pool()
+        timeout = get_pool_config()['timeout']
+        conn = await asyncio.wait_for(pool.acquire(), timeout)
+        try:
+            yield conn
+        finally:
+            pool.release(conn)
+
+    @classmethod
+    async def fetch_all(cls, query, params=None):
+        """
+        Execute a query and return all rows.
+
+        Args:
+            query: SQL query with %s placeholders
+            params: Query parameters
+
+        Returns:
+            List of row dictionaries
+        """
+        # Looked up here, before the awaits, while the calling model is still on the stack
+        caller = find_caller() if QueryStats.enabled() else None
+        async with cls.acquire() as conn:
+            async with conn.cursor() as cur:
+                started = time.perf_counter()
+                await cur.execute(query, params or ())
+                rows = list(await cur.fetchall())
+                if QueryStats.enabled():
+                    QueryStats.record(query, time.perf_counter() - started, len(rows), caller)
+                return rows
+
+    @classmethod
+    async def fetch_one(cls, query, params=None):
+        """
+        Execute a query and return the first row.
+
+        Args:
+            query: SQL query with %s placeholders
+            params: Query parameters
+
+        Returns:
+            Row dictionary, or None when the query returned nothing
+        """
+        # Looked up here, before the awaits, while the calling model is still on the stack
+        caller = find_caller() if QueryStats.enabled() else None
+        async with cls.acquire() as conn:
+            async with conn.cursor() as cur:
+                started = time.perf_counter()
+                await cur.execute(query, params or ())
+                row = await cur.fetchone()
+                if QueryStats.enabled():
+                    QueryStats.record(query, time.perf_counter() - started, 1 if row else 0, caller)
+                return row
+
+    @classmethod
+    async def fetch_value(cls, query, params=None):
+        """Execute a query and return the first column of the first row."""
+        row = await cls.fetch_one(query, params)
+        return next(iter(row.values())) if row else None
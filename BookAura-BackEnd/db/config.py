@@ -0,0 +1,291 @@
+import os
+from dotenv import load_dotenv
+
+# Load environment variables
+load_dotenv()
+
+
+def _env_int(name, default):
+    """Read an integer setting from the environment, falling back to the default."""
+    value = os.getenv(name)
+    return int(value) if value not in (None, "") else default
+
+
+def _env_float(name, default):
+    """Read a float setting from the environment, falling back to the default."""
+    value = os.getenv(name)
+    return float(value) if value not in (None, "") else default
+
+
+def _env_bool(name, default):
+    """Read a boolean setting from the environment, falling back to the default."""
+    value = os.getenv(name)
+    if value in (None, ""):
+        return default
+    return value.strip().lower() in ("1", "true", "yes", "on")
+
+
+def get_db_config():
+    """
+    Connection settings for the MySQL server, read from the environment.
+
+    Returns:
+        Keyword arguments suitable for mysql.connector.connect
+    """
+    return {
+        "host": os.getenv("DB_HOST", "localhost"),
+        "port": _env_int("DB_PORT", 3306),
+        "database": os.getenv("DB_NAME", "bookauradb"),
+        "user": os.getenv("DB_USER", "root"),
+        "password": os.getenv("DB_PASSWORD", "root"),
+        "connection_timeout": _env_int("DB_CONNECT_TIMEOUT", 30),
+        "autocommit": False,
+    }
+
+
+def get_pool_config():
+    """
+    Sizing and instrumentation settings for the shared connection pool.
+
+    DB_POOL_SIZE connections are kept open once created; up to
+    DB_POOL_MAX_OVERFLOW extra connections may be opened under load and are
+    closed again when returned. A checkout waits at most DB_POOL_TIMEOUT
+    seconds for a free connection. Connections held longer than
+    DB_POOL_LEAK_THRESHOLD seconds are reported as suspected leaks.
+
+    With DB_POOL_PRE_PING, idle connections are pinged before being handed
+    out. Connections older than DB_POOL_RECYCLE seconds are closed and
+    replaced, and a background sweep every DB_POOL_RECYCLE_INTERVAL seconds
+    closes idle ones past that age. Opening a connection is retried up to
+    DB_CONNECT_RETRIES times with jittered exponential backoff starting at
+    DB_CONNECT_BACKOFF seconds and capped at DB_CONNECT_BACKOFF_MAX.
+
+    Each connection keeps up to DB_POOL_STATEMENT_CACHE_SIZE server-side
+    prepared statements for the hot catalog queries (0 disables the cache).
+    """
+    return {
+        "pool_size": _env_int("DB_POOL_SIZE", 10),
+        "max_overflow": _env_int("DB_POOL_MAX_OVERFLOW", 5),
+        "timeout": _env_float("DB_POOL_TIMEOUT", 30.0),
+        "leak_threshold": _env_float("DB_POOL_LEAK_THRESHOLD", 60.0),
+        "reset_session": _env_bool("DB_POOL_RESET_SESSION", True),
+        "pre_ping": _env_bool("DB_POOL_PRE_PING", True),
+        "recycle": _env_float("DB_POOL_RECYCLE", 3600.0),
+        "recycle_interval": _env_float("DB_POOL_RECYCLE_INTERVAL", 60.0),
+        "connect_retries": _env_int("DB_CONNECT_RETRIES", 5),
+        "backoff_base": _env_float("DB_CONNECT_BACKOFF", 0.1),
+        "backoff_max": _env_float("DB_CONNECT_BACKOFF_MAX", 5.0),
+        "statement_cache_size": _env_int("DB_POOL_STATEMENT_CACHE_SIZE", 32),
+    }
+
+
+def get_replica_configs():
+    """
+    Connection settings for each read replica.
+
+    DB_REPLICA_HOSTS is a comma-separated list of host[:port] entries; the
+    other settings (database, user, password) default to the primary's and
+    can be overridden with DB_REPLICA_USER and DB_REPLICA_PASSWORD.
+    For local testing point it at a second MySQL instance, e.g.
+    DB_REPLICA_HOSTS=127.0.0.1:3307, and set DB_REPLICA_ASSUME_IN_SYNC=1
+    if that instance is not actually replicating (see get_routing_config).
+
+    Returns:
+        List of keyword-argument dicts for mysql.connector.connect; empty
+        when no replicas are configured
+    """
+    primary = get_db_config()
+    replicas = []
+    for entry in os.getenv("DB_REPLICA_HOSTS", "").split(","):
+        entry = entry.strip()
+        if not entry:
+            continue
+        host, _, port = entry.partition(":")
+        replicas.append({
+            **primary,
+            "host": host,
+            "port": int(port) if port else primary["port"],
+            "user": os.getenv("DB_REPLICA_USER", primary["user"]),
+            "password": os.getenv("DB_REPLICA_PASSWORD", primary["password"]),
+        })
+    return replicas
+
+
+def get_routing_config():
+    """
+    Read-replica routing settings.
+
+    Replicas more than DB_REPLICA_MAX_LAG seconds behind the primary are
+    skipped; lag is re-measured at most every DB_REPLICA_LAG_CHECK_INTERVAL
+    seconds per replica.
+
+    A server with no replication configured (SHOW REPLICA STATUS returns no
+    row) is skipped too, unless DB_REPLICA_ASSUME_IN_SYNC is set, in which
+    case it counts as zero lag. Use that for a plain MySQL instance standing
+    in for a replica in local testing, or when replication is managed
+    outside MySQL. A replica whose replication is configured but stopped
+    is still skipped.
+    """
+    return {
+        "max_lag": _env_float("DB_REPLICA_MAX_LAG", 5.0),
+        "lag_check_interval": _env_float("DB_REPLICA_LAG_CHECK_INTERVAL", 5.0),
+        "assume_in_sync": _env_bool("DB_REPLICA_ASSUME_IN_SYNC", False),
+    }
+
+
+def get_query_stats_config():
+    """
+    Query instrumentation settings.
+
+    DB_QUERY_STATS turns per-statement timing on or off; statements taking
+    at least DB_SLOW_QUERY_MS milliseconds are logged as slow queries.
+    At most DB_QUERY_STATS_MAX_STATEMENTS distinct statements are tracked.
+    """
+    return {
+        "enabled": _env_bool("DB_QUERY_STATS", True),
+        "slow_query_ms": _env_float("DB_SLOW_QUERY_MS", 200.0),
+        "max_statements": _env_int("DB_QUERY_STATS_MAX_STATEMENTS", 1000),
+    }
+
+
+def get_view_counter_config():
+    """
+    Write-behind view counter settings.
+
+    Book views are accumulated in memory and written in one batch every
+    VIEW_FLUSH_INTERVAL seconds, or as soon as VIEW_FLUSH_MAX_PENDING views
+    are waiting. VIEW_WRITE_BEHIND=false writes each view immediately.
+    """
+    return {
+        "enabled": _env_bool("VIEW_WRITE_BEHIND", True),
+        "flush_interval": _env_float("VIEW_FLUSH_INTERVAL", 2.0),
+        "max_pending": _env_int("VIEW_FLUSH_MAX_PENDING", 1000),
+    }
+
+
+def get_dashboard_snapshot_config():
+    """
+    Precomputed admin dashboard settings.
+
+    The payload for each time range is rebuilt every
+    DASHBOARD_SNAPSHOT_INTERVAL seconds by a background thread and served
+    from memory. An on-demand refresh is ignored while the snapshot is
+    younger than DASHBOARD_SNAPSHOT_MIN_REFRESH seconds.
+    DASHBOARD_SNAPSHOT=false computes the payload on every request.
+    """
+    return {
+        "enabled": _env_bool("DASHBOARD_SNAPSHOT", True),
+        "interval": _env_float("DASHBOARD_SNAPSHOT_INTERVAL", 300.0),
+        "min_refresh": _env_float("DASHBOARD_SNAPSHOT_MIN_REFRESH", 10.0),
+    }
+
+
+def get_response_cache_config():
+    """
+    Response cache settings for the anonymous catalog endpoints.
+
+    RESPONSE_CACHE_BACKEND is "memory" (a per-process LRU holding at most
+    RESPONSE_CACHE_MAX_ENTRIES responses) or "redis", shared by every worker
+    at RESPONSE_CACHE_REDIS_URL. Invalidations only reach other worker
+    processes with the shared backend; with "memory" they rely on the TTLs.
+    """
+    return {
+        "enabled": _env_bool("RESPONSE_CACHE", True),
+        "backend": os.getenv("RESPONSE_CACHE_BACKEND", "memory").strip().lower(),
+        "max_entries": _env_int("RESPONSE_CACHE_MAX_ENTRIES", 1024),
+        "redis_url": os.getenv("RESPONSE_CACHE_REDIS_URL", "redis://localhost:6379/0"),
+        "key_prefix": os.getenv("RESPONSE_CACHE_KEY_PREFIX", "bookaura:response:"),
+    }
+
+
+def get_export_config():
+    """
+    Streaming export settings.
+
+    Exports read EXPORT_BATCH_SIZE rows at a time from an unbuffered cursor
+    and write each batch to the response before fetching the next, so memory
+    stays bounded by one batch however large the table is.
+    """
+    return {
+        "batch_size": _env_int("EXPORT_BATCH_SIZE", 500),
+    }
+
+
+def get_job_queue_config():
+    """
+    Book processing job queue settings.
+
+    BOOK_WORKERS worker processes each run one job at a time. A failed job
+    is retried up to JOB_MAX_ATTEMPTS times in total, waiting
+    JOB_RETRY_BASE_DELAY seconds doubled per attempt (at most
+    JOB_RETRY_MAX_DELAY). A worker refreshes the heartbeat of its running
+    job every JOB_HEARTBEAT_INTERVAL seconds; a job whose heartbeat is
+    older than JOB_STALE_TIMEOUT seconds is assumed abandoned and
+    requeued, however long it has been running.
+    """
+    return {
+        "workers": _env_int("BOOK_WORKERS", 2),
+        "max_attempts": _env_int("JOB_MAX_ATTEMPTS", 3),
+        "retry_base_delay": _env_float("JOB_RETRY_BASE_DELAY", 30.0),
+        "retry_max_delay": _env_float("JOB_RETRY_MAX_DELAY", 1800.0),
+        "poll_interval": _env_float("JOB_POLL_INTERVAL", 2.0),
+        "heartbeat_interval": _env_float("JOB_HEARTBEAT_INTERVAL", 30.0),
+        "stale_timeout": _env_float("JOB_STALE_TIMEOUT", 300.0),
+    }
+
+
+def get_ulca_config():
+    """
+    Client settings for the ULCA translation and TTS compute endpoint.
+
+    Requests are started at most ULCA_RATE per second, with bursts of up to
+    ULCA_BURST, and no more than ULCA_MAX_IN_FLIGHT are outstanding at once
+    across the whole process. 429 and 5xx responses and connection errors
+    are retried up to ULCA_MAX_RETRIES times with exponential backoff from
+    ULCA_BACKOFF_BASE seconds, capped at ULCA_BACKOFF_MAX.
+    """
+    return {
+        "url": os.getenv("ULCA_COMPUTE_URL", "https://meity-auth.ulcacontrib.org/ulca/apis/v0/model/compute"),
+        "rate": _env_float("ULCA_RATE", 2.0),
+        "burst": _env_int("ULCA_BURST", 4),
+        "max_in_flight": _env_int("ULCA_MAX_IN_FLIGHT", 4),
+        "max_retries": _env_int("ULCA_MAX_RETRIES", 4),
+        "backoff_base": _env_float("ULCA_BACKOFF_BASE", 1.0),
+        "backoff_max": _env_float("ULCA_BACKOFF_MAX", 30.0),
+        "timeout": _env_float("ULCA_TIMEOUT", 60.0),
+    }
+
+
+def get_http_client_config():
+    """
+    Settings for the shared outbound HTTP session (utils/http_client.py).
+
+    Up to HTTP_POOL_MAXSIZE keep-alive connections are kept per host, for
+    HTTP_POOL_HOSTS hosts. With HTTP_POOL_BLOCK a caller waits for a free
+    connection instead of opening an extra one that is thrown away.
+    HTTP_CONNECT_TIMEOUT and HTTP_READ_TIMEOUT apply to requests that do
+    not pass their own timeout.
+    """
+    return {
+        "pool_hosts": _env_int("HTTP_POOL_HOSTS", 4),
+        "pool_maxsize": _env_int("HTTP_POOL_MAXSIZE", 8),
+        "pool_block": _env_bool("HTTP_POOL_BLOCK", True),
+        "connect_timeout": _env_float("HTTP_CONNECT_TIMEOUT", 10.0),
+        "read_timeout": _env_float("HTTP_READ_TIMEOUT", 60.0),
+    }
+
+
+def get_translation_memory_config():
+    """
+    Translation memory (cached ULCA results per chunk) settings.
+
+    TRANSLATION_MEMORY turns the cache on or off. Once the cached content
+    passes TRANSLATION_MEMORY_MAX_MB, the least recently used rows are
+    evicted down to 90% of it. The size is checked after every
+    TRANSLATION_MEMORY_EVICT_EVERY stored chunks.
+    """
+    return {
+        "enabled": _env_bool("TRANSLATION_MEMORY", True),
+        "max_bytes": _env_int("TRANSLATION_MEMORY_MAX_MB", 2048) * 1024 * 1024,
+        "evict_every": _env_int("TRANSLATION_MEMORY_EVICT_EVERY", 200),
+    }
@@ -1,77 +1,500 @@
 import mysql.connector
-from mysql.connector import pooling
+from mysql.connector import errors
+from collections import deque, OrderedDict
 import logging
+import random
+import threading
+import time
+
+from db.config import get_db_config, get_pool_config
+from db.query_stats import QueryStats, TimedCursor
 
 # Configure logging
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+# Errors worth retrying when opening a connection: server unreachable,
+# gone away, lost connection, or too many connections.
+RETRYABLE_ERRNOS = {1040, 2002, 2003, 2006, 2013, 2055}
+
+
+class PoolTimeoutError(errors.PoolError):
+    """Raised when no connection becomes available within the checkout timeout."""
+
+
+class PooledConnection:
+    """
+    Wrapper around a MySQL connection checked out from the DatabasePool.
+    Behaves like the underlying connection; close() returns it to the pool.
+    """
+
+    def __init__(self, pool, cnx):
+        self._pool = pool
+        self._cnx = cnx
+        self._checked_out_at = time.monotonic()
+
+    def __getattr__(self, name):
+        cnx = self.__dict__.get('_cnx')
+        if cnx is None:
+            raise errors.InterfaceError("Connection has already been returned to the pool")
+        return getattr(cnx, name)
+
+    def is_connected(self):
+        """Check whether the connection is still checked out and alive."""
+        return self._cnx is not None and self._cnx.is_connected()
+
+    def cursor(self, *args, **kwargs):
+        """Open a cursor; its statements are timed in QueryStats when enabled."""
+        cnx = self.__dict__.get('_cnx')
+        if cnx is None:
+            raise errors.InterfaceError("Connection has already been returned to the pool")
+        cursor = cnx.cursor(*args, **kwargs)
+        return TimedCursor(cursor) if QueryStats.enabled() else cursor
+
+    def prepared_cursor(self, query):
+        """
+        Dictionary cursor for a server-side prepared statement of this query.
+        The cursor is cached on the physical connection and reused by later
+        checkouts, so MySQL parses the query once per connection. Do not close it.
+        """
+        cnx = self.__dict__.get('_cnx')
+        if cnx is None:
+            raise errors.InterfaceError("Connection has already been returned to the pool")
+        return self._pool._prepared_cursor(cnx, query)
+
+    def close(self):
+        """Return the connection to the pool instead of closing it."""
+        cnx, self._cnx = self._cnx, None
+        if cnx is not None:
+            self._pool._release(cnx, self._checked_out_at)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.close()
+
+    def __del__(self):
+        # A wrapper garbage-collected while still holding a connection was
+        # never closed by its caller: reclaim the slot and count the leak.
+        cnx = self.__dict__.get('_cnx')
+        if cnx is not None:
+            self._cnx = None
+            try:
+                self._pool._reclaim_leaked(cnx, self._checked_out_at)
+            except Exception:
+                pass
+
+
 class DatabasePool:
     """
     Singleton class to manage a single database connection pool for the entire application.
+    Size, overflow and timeouts come from the environment (see db.config), and the pool
+    keeps counters for checkout wait time, connections in use and leaked connections.
+    Idle connections are validated on checkout and recycled past a maximum age, so a
+    MySQL restart or wait_timeout costs one reconnect rather than a failed query.
     """
     _instance = None
-    _pool = None
+    _server_config = None
+    _pool_overrides = {}
+    _config = None
+    _pool_config = None
+    _cond = threading.Condition()
+    _idle = deque()
+    _checked_out = {}
+    _created = {}
+    _statements = {}
+    _total = 0
+    _invalidated_at = 0.0
+    _recycler = None
+    _stats = {
+        'checkouts': 0,
+        'checkout_wait_total': 0.0,
+        'checkout_wait_max': 0.0,
+        'timeouts': 0,
+        'leaked': 0,
+        'overflow_opened': 0,
+        'discarded': 0,
+        'recycled': 0,
+        'ping_failures': 0,
+        'connect_retries': 0,
+        'statement_cache_hits': 0,
+        'statement_cache_misses': 0,
+    }
 
     def __new__(cls):
         if cls._instance is None:
             cls._instance = super(DatabasePool, cls).__new__(cls)
-            cls._initialize_pool()
         return cls._instance
 
+    @classmethod
+    def create_pool(cls, name, server_config, **pool_overrides):
+        """
+        Create a separate pool, with its own connections and counters, for
+        another MySQL server (e.g. a read replica).
+
+        Args:
+            name: Class name for the new pool, used in logs
+            server_config: Connection settings as returned by get_db_config
+            pool_overrides: Values replacing the ones from get_pool_config
+
+        Returns:
+            A DatabasePool subclass used exactly like DatabasePool
+        """
+        return type(name, (cls,), {
+            '_instance': None,
+            '_server_config': server_config,
+            '_pool_overrides': pool_overrides,
+            '_config': None,
+            '_pool_config': None,
+            '_cond': threading.Condition(),
+            '_idle': deque(),
+            '_checked_out': {},
+            '_created': {},
+            '_statements': {},
+            '_total': 0,
+            '_invalidated_at': 0.0,
+            '_recycler': None,
+            '_stats': dict.fromkeys(cls._stats, 0),
+        })
+
     @classmethod
     def _initialize_pool(cls):
-        """Initialize the connection pool with appropriate settings."""
-        try:
-            cls._pool = pooling.MySQLConnectionPool(
-                pool_name="bookaura_pool",
-                pool_size=10,  # Reduced from multiple pools to a single pool with reasonable size
-                pool_reset_session=True,
-                host="localhost",
-                database="bookauradb",
-                user="root",
-                password="root",
-                autocommit=False,
-                connect_timeout=30
+        """Load the pool settings; connections themselves are opened lazily."""
+        with cls._cond:
+            if cls._pool_config is not None:
+                return
+            cls._config = cls._server_config or get_db_config()
+            cls._pool_config = {**get_pool_config(), **cls._pool_overrides}
+            if cls._pool_config['recycle'] > 0 and cls._pool_config['recycle_interval'] > 0:
+                cls._recycler = threading.Thread(
+                    target=cls._recycle_idle_loop, name="db-pool-recycler", daemon=True
+                )
+                cls._recycler.start()
+            logger.info(
+                f"{cls.__name__} connection pool initialized "
+                f"(size={cls._pool_config['pool_size']}, "
+                f"max_overflow={cls._pool_config['max_overflow']}, "
+                f"timeout={cls._pool_config['timeout']}s)"
             )
-            logger.info("Database connection pool initialized successfully")
-        except Exception as e:
-            logger.error(f"Failed to initialize connection pool: {e}")
-            raise
+
+    @classmethod
+    def _connect(cls, deadline=None):
+        """
+        Open a new physical connection to the database, retrying transient
+        failures with jittered exponential backoff.
+
+        Args:
+            deadline: time.monotonic() value after which no more retries are made
+        """
+        retries = cls._pool_config['connect_retries']
+        attempt = 0
+        while True:
+            try:
+                cnx = mysql.connector.connect(**cls._config)
+                break
+            except errors.Error as e:
+                retryable = (
+                    isinstance(e, (errors.InterfaceError, errors.OperationalError))
+                    or e.errno in RETRYABLE_ERRNOS
+                )
+                if not retryable or attempt >= retries:
+                    raise
+                # Full jitter: spread reconnecting workers over the whole window
+                delay = random.uniform(0, min(
+                    cls._pool_config['backoff_max'],
+                    cls._pool_config['backoff_base'] * (2 ** attempt)
+                ))
+                if deadline is not None and time.monotonic() + delay > deadline:
+                    raise
+                attempt += 1
+                with cls._cond:
+                    cls._stats['connect_retries'] += 1
+                logger.warning(
+                    f"Database connection failed ({e}); retry {attempt}/{retries} in {delay:.2f}s"
+                )
+                time.sleep(delay)
+
+        with cls._cond:
+            cls._created[id(cnx)] = time.monotonic()
+        return cnx
+
+    @classmethod
+    def _prepared_cursor(cls, cnx, query):
+        """Get or create the cached prepared cursor for a query on one connection."""
+        size = cls._pool_config['statement_cache_size']
+        if size <= 0:
+            cur = cnx.cursor(dictionary=True)
+            return TimedCursor(cur) if QueryStats.enabled() else cur
+
+        # Only the thread holding the connection touches its cache
+        cache = cls._statements.get(id(cnx))
+        if cache is None:
+            cache = cls._statements[id(cnx)] = OrderedDict()
+
+        cur = cache.get(query)
+        if cur is not None:
+            cache.move_to_end(query)
+            cls._stats['statement_cache_hits'] += 1
+            return cur
+
+        cur = cnx.cursor(prepared=True, dictionary=True)
+        if QueryStats.enabled():
+            cur = TimedCursor(cur)
+        cache[query] = cur
+        cls._stats['statement_cache_misses'] += 1
+        if len(cache) > size:
+            _, evicted = cache.popitem(last=False)
+            try:
+                # Closing a prepared cursor deallocates the statement on the server
+                evicted.close()
+            except Exception:
+                pass
+        return cur
+
+    @classmethod
+    def _is_usable(cls, cnx):
+        """
+        Check an idle connection before handing it out.
+        Rejects connections past the recycle age or opened before a detected
+        outage, and pings the rest when pre_ping is enabled.
+        """
+        created = cls._created.get(id(cnx), 0.0)
+        recycle = cls._pool_config['recycle']
+        if recycle > 0 and time.monotonic() - created > recycle:
+            with cls._cond:
+                cls._stats['recycled'] += 1
+            return False
+        if created <= cls._invalidated_at:
+            return False
+        if cls._pool_config['pre_ping']:
+            try:
+                cnx.ping(reconnect=False)
+            except Exception as e:
+                # Anything opened before now likely died with the same server
+                # restart; skip pinging those one by one.
+                with cls._cond:
+                    cls._stats['ping_failures'] += 1
+                    cls._invalidated_at = time.monotonic()
+                logger.warning(f"Discarding stale pooled connection: {e}")
+                return False
+        return True
+
+    @classmethod
+    def _discard(cls, cnx):
+        """Close a connection that failed validation and free its slot."""
+        with cls._cond:
+            cls._total -= 1
+            cls._stats['discarded'] += 1
+            cls._cond.notify()
+        cls._close_quietly(cnx)
+
+    @classmethod
+    def _recycle_idle_loop(cls):
+        """Background sweep closing idle connections older than the recycle age."""
+        while True:
+            time.sleep(cls._pool_config['recycle_interval'])
+            try:
+                cls.recycle_idle()
+            except Exception as e:
+                logger.error(f"Error recycling idle connections: {e}")
+
+    @classmethod
+    def recycle_idle(cls):
+        """
+        Close idle connections past the recycle age.
+
+        Returns:
+            Number of connections closed
+        """
+        cutoff = time.monotonic() - cls._pool_config['recycle']
+        with cls._cond:
+            expired = [cnx for cnx in cls._idle if cls._created.get(id(cnx), 0.0) < cutoff]
+            for cnx in expired:
+                cls._idle.remove(cnx)
+            cls._total -= len(expired)
+            cls._stats['recycled'] += len(expired)
+            if expired:
+                cls._cond.notify_all()
+        for cnx in expired:
+            cls._close_quietly(cnx)
+        if expired:
+            logger.info(f"Recycled {len(expired)} idle database connections")
+        return len(expired)
 
     @classmethod
     def get_connection(cls):
-        """Get a database connection from the pool."""
-        if cls._pool is None:
+        """
+        Get a database connection from the pool.
+        Waits up to the configured timeout when every connection is in use;
+        idle connections that fail validation are replaced transparently.
+        """
+        if cls._pool_config is None:
             cls._initialize_pool()
-        return cls._pool.get_connection()
+
+        pool_size = cls._pool_config['pool_size']
+        limit = pool_size + cls._pool_config['max_overflow']
+        started = time.monotonic()
+        deadline = started + cls._pool_config['timeout']
+
+        while True:
+            cnx = None
+            with cls._cond:
+                while True:
+                    if cls._idle:
+                        cnx = cls._idle.pop()
+                        break
+                    if cls._total < limit:
+                        cls._total += 1
+                        if cls._total > pool_size:
+                            cls._stats['overflow_opened'] += 1
+                        break
+                    remaining = deadline - time.monotonic()
+                    if remaining <= 0:
+                        cls._stats['timeouts'] += 1
+                        raise PoolTimeoutError(
+                            f"No database connection available within {cls._pool_config['timeout']}s "
+                            f"({cls._total} open, all in use)"
+                        )
+                    cls._cond.wait(remaining)
+
+            if cnx is None:
+                try:
+                    cnx = cls._connect(deadline)
+                except Exception:
+                    with cls._cond:
+                        cls._total -= 1
+                        cls._cond.notify()
+                    raise
+                break
+
+            if cls._is_usable(cnx):
+                break
+            cls._discard(cnx)
+
+        waited = time.monotonic() - started
+        conn = PooledConnection(cls, cnx)
+        with cls._cond:
+            cls._checked_out[id(cnx)] = (conn._checked_out_at, threading.current_thread().name)
+            cls._stats['checkouts'] += 1
+            cls._stats['checkout_wait_total'] += waited
+            cls._stats['checkout_wait_max'] = max(cls._stats['checkout_wait_max'], waited)
+        return conn
+
+    @classmethod
+    def _release(cls, cnx, checked_out_at):
+        """Put a returned connection back into the idle set, or close it."""
+        held = time.monotonic() - checked_out_at
+        if held > cls._pool_config['leak_threshold']:
+            logger.warning(f"Database connection was held for {held:.1f}s before being returned")
+
+        healthy = True
+        try:
+            # COM_RESET_CONNECTION would deallocate cached prepared statements,
+            # so connections holding some are only rolled back
+            if cls._pool_config['reset_session'] and not cls._statements.get(id(cnx)):
+                cnx.reset_session()
+            elif cnx.in_transaction:
+                cnx.rollback()
+        except Exception as e:
+            logger.debug(f"Discarding connection that failed to reset: {e}")
+            healthy = False
+
+        with cls._cond:
+            cls._checked_out.pop(id(cnx), None)
+            if healthy and cls._total <= cls._pool_config['pool_size']:
+                cls._idle.append(cnx)
+                cnx = None
+            else:
+                cls._total -= 1
+                if not healthy:
+                    cls._stats['discarded'] += 1
+            cls._cond.notify()
+
+        if cnx is not None:
+            cls._close_quietly(cnx)
+
+    @classmethod
+    def _reclaim_leaked(cls, cnx, checked_out_at):
+        """Close a connection whose wrapper was dropped without being returned."""
+        held = time.monotonic() - checked_out_at
+        logger.warning(f"Reclaiming leaked database connection (held {held:.1f}s, never returned)")
+        with cls._cond:
+            cls._checked_out.pop(id(cnx), None)
+            cls._total -= 1
+            cls._stats['leaked'] += 1
+            cls._cond.notify()
+        cls._close_quietly(cnx)
+
+    @classmethod
+    def _close_quietly(cls, cnx):
+        cls._created.pop(id(cnx), None)
+        cls._statements.pop(id(cnx), None)
+        try:
+            cnx.close()
+        except Exception:
+            pass
 
     @staticmethod
     def close_connection(conn):
-        """Safely close a database connection."""
-        if conn and conn.is_connected():
+        """Safely return a database connection to the pool."""
+        if conn:
             conn.close()
-            logger.debug("Database connection closed")
+            logger.debug("Database connection returned to pool")
+
+    @classmethod
+    def stats(cls):
+        """
+        Snapshot of the pool counters.
+
+        Returns:
+            Dictionary with open/idle/in-use counts, checkout wait times,
+            timeouts, leaked connections and currently suspected leaks
+        """
+        with cls._cond:
+            now = time.monotonic()
+            threshold = cls._pool_config['leak_threshold'] if cls._pool_config else None
+            suspected = [
+                {'thread': thread, 'held_seconds': round(now - since, 3)}
+                for since, thread in cls._checked_out.values()
+                if threshold is not None and now - since > threshold
+            ]
+            checkouts = cls._stats['checkouts']
+            return {
+                'pool_size': cls._pool_config['pool_size'] if cls._pool_config else None,
+                'max_overflow': cls._pool_config['max_overflow'] if cls._pool_config else None,
+                'open': cls._total,
+                'idle': len(cls._idle),
+                'in_use': len(cls._checked_out),
+                'checkouts': checkouts,
+                'checkout_wait_avg_ms': round(cls._stats['checkout_wait_total'] / checkouts * 1000, 3) if checkouts else 0.0,
+                'checkout_wait_max_ms': round(cls._stats['checkout_wait_max'] * 1000, 3),
+                'timeouts': cls._stats['timeouts'],
+                'overflow_opened': cls._stats['overflow_opened'],
+                'discarded': cls._stats['discarded'],
+                'recycled': cls._stats['recycled'],
+                'ping_failures': cls._stats['ping_failures'],
+                'connect_retries': cls._stats['connect_retries'],
+                'statement_cache_hits': cls._stats['statement_cache_hits'],
+                'statement_cache_misses': cls._stats['statement_cache_misses'],
+                'leaked': cls._stats['leaked'],
+                'suspected_leaks': suspected,
+            }
 
     def close_all_connections(self):
         """
-        Close all active connections in the pool.
-        This is useful for ensuring a clean state after critical operations.
+        Close all idle connections in the pool.
+        Connections currently checked out are left untouched.
         """
         try:
-            if self._pool:
-                # Get the underlying pool object
-                pool = self._pool._cnx_pool
-                if hasattr(pool, '_queue'):
-                    # Empty the queue and close each connection
-                    while not pool._queue.empty():
-                        try:
-                            cnx = pool._queue.get(block=False)
-                            if cnx and cnx.is_connected():
-                                cnx.close()
-                        except Exception:
-                            pass
-                logger.info("All connections in the pool have been closed")
+            with self._cond:
+                idle = list(self._idle)
+                self._idle.clear()
+                type(self)._total -= len(idle)
+                self._cond.notify_all()
+            for cnx in idle:
+                self._close_quietly(cnx)
+            logger.info("All idle connections in the pool have been closed")
             return True
         except Exception as e:
             logger.error(f"Error closing all connections in pool: {e}")
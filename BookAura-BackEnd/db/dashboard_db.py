@@ -1,6 +1,9 @@
 import mysql.connector
 import logging
 from contextlib import contextmanager
+from db.connection_pool import DatabasePool
+from db.request_connection import get_request_connection
+from db.routing import get_replica_connection
 
 # Configure logging
 logging.basicConfig(level=logging.INFO)
@@ -8,35 +11,35 @@ logger = logging.getLogger(__name__)
 
 class DashboardDB:
     """
-    Dedicated database connection manager for dashboard operations.
-    Uses a single connection with proper resource management.
+    Database helper for dashboard operations.
+    Borrows connections from the shared DatabasePool with proper resource management.
     """
     
     @staticmethod
     @contextmanager
-    def get_connection():
+    def get_connection(read_only=False):
         """
         Context manager for database connections.
-        Ensures connections are properly closed after use.
+        Read-only work goes to a read replica when one is healthy; otherwise
+        reuses the current request's connection when there is one. Ensures
+        connections are returned to the pool after use.
         """
         conn = None
         try:
-            conn = mysql.connector.connect(
-                host="localhost",
-                database="bookauradb",
-                user="root",
-                password="root",
-                connection_timeout=30
+            conn = (
+                (read_only and get_replica_connection())
+                or get_request_connection()
+                or DatabasePool.get_connection()
             )
-            logger.debug("Dashboard DB connection opened")
+            logger.debug("Dashboard DB connection checked out")
             yield conn
         except mysql.connector.Error as err:
             logger.error(f"Database connection error: {err}")
             raise
         finally:
-            if conn and conn.is_connected():
-                conn.close()
-                logger.debug("Dashboard DB connection closed")
+            if conn:
+                DatabasePool.close_connection(conn)
+                logger.debug("Dashboard DB connection returned")
     
     @staticmethod
     def execute_query(query, params=None, fetch=True, commit=False):
@@ -52,7 +55,7 @@ class DashboardDB:
         Returns:
             Query results if fetch=True, otherwise None
         """
-        with DashboardDB.get_connection() as conn:
+        with DashboardDB.get_connection(read_only=fetch and not commit) as conn:
             cursor = conn.cursor(dictionary=True)
             try:
                 if params:
@@ -82,7 +85,7 @@ class DashboardDB:
         Returns:
             Single row result or None
         """
-        with DashboardDB.get_connection() as conn:
+        with DashboardDB.get_connection(read_only=True) as conn:
             cursor = conn.cursor(dictionary=True)
             try:
                 if params:
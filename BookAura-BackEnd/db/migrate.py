@@ -0,0 +1,174 @@
+import hashlib
+import logging
+import os
+import re
+
+import mysql.connector
+from mysql.connector import errors
+
+from db.config import get_db_config
+
+logger = logging.getLogger(__name__)
+
+MIGRATIONS_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'migrations')
+MIGRATION_FILE = re.compile(r'^(\d+)_([\w-]+)\.sql$')
+
+# Errors meaning a DDL step already took effect (duplicate column name,
+# duplicate key name, key already dropped), so a migration that failed
+# halfway can be re-run.
+ALREADY_APPLIED_ERRNOS = {1060, 1061, 1091}
+
+CREATE_MIGRATIONS_TABLE = """
+    CREATE TABLE IF NOT EXISTS schema_migrations (
+        version INT NOT NULL PRIMARY KEY,
+        name VARCHAR(255) NOT NULL,
+        checksum CHAR(64) NOT NULL,
+        applied_at TIMESTAMP NOT NULL DEFAULT CURRENT_TIMESTAMP
+    )
+"""
+
+
+class Migration:
+    """A versioned SQL file from db/migrations, e.g. 0002_views_unique_book_id.sql."""
+
+    def __init__(self, version, name, path):
+        self.version = version
+        self.name = name
+        self.path = path
+
+    @property
+    def sql(self):
+        with open(self.path, encoding='utf-8') as f:
+            return f.read()
+
+    @property
+    def checksum(self):
+        return hashlib.sha256(self.sql.encode('utf-8')).hexdigest()
+
+    def statements(self):
+        """Split the file into statements; each one ends with a semicolon at end of line."""
+        lines = [line for line in self.sql.splitlines() if not line.strip().startswith('--')]
+        return [stmt.strip() for stmt in re.split(r';\s*$', '\n'.join(lines), flags=re.M) if stmt.strip()]
+
+
+def discover_migrations():
+    """
+    Migrations found in db/migrations, ordered by version.
+
+    Raises:
+        ValueError: if two files share a version number
+    """
+    migrations = {}
+    for filename in os.listdir(MIGRATIONS_DIR):
+        match = MIGRATION_FILE.match(filename)
+        if not match:
+            continue
+        version = int(match.group(1))
+        if version in migrations:
+            raise ValueError(f"Duplicate migration version {version}: {filename}")
+        migrations[version] = Migration(version, match.group(2), os.path.join(MIGRATIONS_DIR, filename))
+    return [migrations[v] for v in sorted(migrations)]
+
+
+def get_migration_connection():
+    """Dedicated connection for schema changes, outside the application pool."""
+    return mysql.connector.connect(**get_db_config())
+
+
+def applied_migrations(conn):
+    """
+    Versions already recorded in schema_migrations.
+
+    Returns:
+        Dictionary mapping version to the checksum recorded when it was applied
+    """
+    cur = conn.cursor()
+    try:
+        cur.execute(CREATE_MIGRATIONS_TABLE)
+        cur.execute("SELECT version, checksum FROM schema_migrations")
+        return {version: checksum for version, checksum in cur.fetchall()}
+    finally:
+        cur.close()
+
+
+def apply_migration(conn, migration):
+    """
+    Run one migration and record it.
+    DML statements share a transaction; MySQL commits implicitly around DDL.
+    """
+    cur = conn.cursor()
+    try:
+        for statement in migration.statements():
+            try:
+                cur.execute(statement)
+                if cur.with_rows:
+                    cur.fetchall()
+            except errors.Error as e:
+                if e.errno not in ALREADY_APPLIED_ERRNOS:
+                    raise
+                logger.info(f"Skipping step already applied in {migration.version:04d}: {e.msg}")
+        cur.execute(
+            "INSERT INTO schema_migrations (version, name, checksum) VALUES (%s, %s, %s)",
+            (migration.version, migration.name, migration.checksum)
+        )
+        conn.commit()
+    except Exception:
+        conn.rollback()
+        raise
+    finally:
+        cur.close()
+
+
+def migrate(target=None, dry_run=False):
+    """
+    Apply pending migrations in version order.
+
+    Args:
+        target: Highest version to apply (default: all)
+        dry_run: Only list what would run
+
+    Returns:
+        List of versions applied (or that would be applied)
+    """
+    conn = get_migration_connection()
+    try:
+        applied = applied_migrations(conn)
+        pending = [
+            m for m in discover_migrations()
+            if m.version not in applied and (target is None or m.version <= target)
+        ]
+        for migration in pending:
+            if dry_run:
+                logger.info(f"Would apply {migration.version:04d}_{migration.name}")
+                continue
+            logger.info(f"Applying {migration.version:04d}_{migration.name}")
+            apply_migration(conn, migration)
+        return [m.version for m in pending]
+    finally:
+        conn.close()
+
+
+def migration_status():
+    """
+    Applied/pending state of every migration.
+
+    Returns:
+        List of dictionaries with version, name and status
+        (applied, pending, or changed when the file no longer matches its checksum)
+    """
+    conn = get_migration_connection()
+    try:
+        applied = applied_migrations(conn)
+    finally:
+        conn.close()
+
+    status = []
+    for migration in discover_migrations():
+        if migration.version not in applied:
+            state = 'pending'
+        elif applied[migration.version] != migration.checksum:
+            state = 'changed'
+        else:
+            state = 'applied'
+        status.append({'version': migration.version, 'name': migration.name, 'status': state})
+    return status
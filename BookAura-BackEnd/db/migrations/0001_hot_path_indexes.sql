@@ -0,0 +1,13 @@
+-- Composite indexes for the hot access paths.
+
+-- Approved-book listings and upload trends filter on is_approved and range/sort on uploaded_at
+ALTER TABLE books ADD INDEX idx_books_approved_uploaded (is_approved, uploaded_at);
+
+-- A user's reading history, most recent first, and active-reader counts
+ALTER TABLE reading_history ADD INDEX idx_reading_history_user_last_read (user_id, last_read_at);
+
+-- "Is this book bookmarked by this user" lookups and a user's bookmark list
+ALTER TABLE bookmarks ADD INDEX idx_bookmarks_user_book (user_id, book_id);
+
+-- Category pages start from category_id and need book_id without a row lookup
+ALTER TABLE book_category ADD INDEX idx_book_category_category_book (category_id, book_id);
@@ -0,0 +1,23 @@
+-- One views row per book.
+-- The UPDATE-then-INSERT in increment_book_views could race and insert
+-- duplicate rows for the same book; fold them into the oldest row, then
+-- enforce uniqueness so it cannot happen again. Both DML statements run in
+-- one transaction, so concurrent increments wait on the row locks.
+
+UPDATE views v
+JOIN (
+    SELECT book_id, MIN(book_view_id) AS keep_id, SUM(book_view) AS total_views
+    FROM views
+    GROUP BY book_id
+    HAVING COUNT(*) > 1
+) dup ON v.book_view_id = dup.keep_id
+SET v.book_view = dup.total_views;
+
+DELETE v
+FROM views v
+JOIN views keep_row ON keep_row.book_id = v.book_id AND keep_row.book_view_id < v.book_view_id;
+
+ALTER TABLE views ADD UNIQUE KEY uq_views_book_id (book_id);
+
+-- The unique key now backs the foreign key, so the plain index is redundant
+ALTER TABLE views DROP INDEX book_id;
@@ -0,0 +1,2 @@
+-- search_books uses MATCH(b.title) AGAINST(...), which requires a FULLTEXT index
+ALTER TABLE books ADD FULLTEXT INDEX ft_books_title (title);
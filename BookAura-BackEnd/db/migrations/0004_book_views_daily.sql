@@ -0,0 +1,16 @@
+-- Per-book, per-day view counters.
+-- views only holds a lifetime total per book, so dashboards had to invent
+-- their daily and monthly series. The view counter now adds each flush to
+-- the (book_id, view_date) bucket in the same transaction as views, and
+-- time series are read from here in O(days) rows. There is no history to
+-- backfill from: buckets start filling once this migration is applied.
+
+CREATE TABLE IF NOT EXISTS book_views_daily (
+    book_id INT NOT NULL,
+    view_date DATE NOT NULL,
+    views INT UNSIGNED NOT NULL DEFAULT 0,
+    PRIMARY KEY (book_id, view_date),
+    -- Covers the platform-wide SUM(views) ... GROUP BY view_date range scan
+    KEY idx_book_views_daily_date_views (view_date, views),
+    CONSTRAINT fk_book_views_daily_book FOREIGN KEY (book_id) REFERENCES books (book_id) ON DELETE CASCADE
+);
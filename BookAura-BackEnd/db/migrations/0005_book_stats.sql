@@ -0,0 +1,45 @@
+-- One denormalised row per book for the catalog queries.
+-- fetch_public_books, search_books, fetch_books_by_category and
+-- get_top_books used to join users, book_category, categories and views and
+-- GROUP BY b.book_id on every request. book_stats keeps the author name,
+-- the category list and the view, reader and bookmark counts per book; it
+-- is maintained by the writes in models/ and db/view_counter.py (see
+-- models/book_stats.py) and can be rebuilt with scripts/rebuild_book_stats.py.
+
+CREATE TABLE IF NOT EXISTS book_stats (
+    book_id INT NOT NULL PRIMARY KEY,
+    author_name VARCHAR(255) NULL,
+    categories VARCHAR(1024) NOT NULL DEFAULT '',
+    views BIGINT UNSIGNED NOT NULL DEFAULT 0,
+    readers INT UNSIGNED NOT NULL DEFAULT 0,
+    bookmarks INT UNSIGNED NOT NULL DEFAULT 0,
+    updated_at TIMESTAMP NOT NULL DEFAULT CURRENT_TIMESTAMP ON UPDATE CURRENT_TIMESTAMP,
+    -- get_top_books walks this index in descending order and stops at LIMIT
+    KEY idx_book_stats_views (views),
+    CONSTRAINT fk_book_stats_book FOREIGN KEY (book_id) REFERENCES books (book_id) ON DELETE CASCADE
+);
+
+-- Backfill; same statement as BookStatsModel.rebuild()
+INSERT INTO book_stats (book_id, author_name, categories, views, readers, bookmarks)
+SELECT * FROM (
+    SELECT
+        b.book_id,
+        u.username AS author_name,
+        COALESCE((
+            SELECT GROUP_CONCAT(c.category_name ORDER BY c.category_name SEPARATOR ', ')
+            FROM book_category bc
+            JOIN categories c ON bc.category_id = c.category_id
+            WHERE bc.book_id = b.book_id
+        ), '') AS categories,
+        COALESCE((SELECT SUM(v.book_view) FROM views v WHERE v.book_id = b.book_id), 0) AS views,
+        (SELECT COUNT(DISTINCT rh.user_id) FROM reading_history rh WHERE rh.book_id = b.book_id) AS readers,
+        (SELECT COUNT(*) FROM bookmarks bm WHERE bm.book_id = b.book_id) AS bookmarks
+    FROM books b
+    LEFT JOIN users u ON b.user_id = u.user_id
+) AS src
+ON DUPLICATE KEY UPDATE
+    author_name = src.author_name,
+    categories = src.categories,
+    views = src.views,
+    readers = src.readers,
+    bookmarks = src.bookmarks;
@@ -0,0 +1,12 @@
+-- Indexes for the keyset-paginated book listings.
+-- Pages are ordered by (uploaded_at, book_id) descending and continue from a
+-- cursor, so each page is an index range scan of limit + 1 rows instead of a
+-- filesort of the whole table. InnoDB appends the primary key to secondary
+-- indexes, which supplies the book_id tiebreak. The public listing already
+-- has idx_books_approved_uploaded from 0001.
+
+-- GET /books/: every book, newest first
+ALTER TABLE books ADD INDEX idx_books_uploaded (uploaded_at);
+
+-- GET /books/publisher/: one publisher's books, newest first
+ALTER TABLE books ADD INDEX idx_books_user_uploaded (user_id, uploaded_at);
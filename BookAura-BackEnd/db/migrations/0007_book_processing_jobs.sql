@@ -0,0 +1,26 @@
+-- Durable queue for the PDF translation and audio pipeline (services/final.py).
+-- Uploads used to fork a detached interpreter per book, with no limit on
+-- concurrency, no retries and nothing left behind after a restart. Each
+-- upload now adds a row here; scripts/run_book_workers.py claims queued
+-- rows with SELECT ... FOR UPDATE SKIP LOCKED, retries failures with
+-- exponential backoff and requeues jobs whose worker died mid-run.
+
+CREATE TABLE IF NOT EXISTS book_processing_jobs (
+    job_id BIGINT NOT NULL AUTO_INCREMENT PRIMARY KEY,
+    book_id INT NULL,
+    pdf_path VARCHAR(1024) NOT NULL,
+    status ENUM('queued', 'running', 'succeeded', 'failed') NOT NULL DEFAULT 'queued',
+    attempts INT UNSIGNED NOT NULL DEFAULT 0,
+    max_attempts INT UNSIGNED NOT NULL DEFAULT 3,
+    run_after TIMESTAMP NOT NULL DEFAULT CURRENT_TIMESTAMP,
+    locked_by VARCHAR(255) NULL,
+    locked_at TIMESTAMP NULL,
+    last_error TEXT NULL,
+    created_at TIMESTAMP NOT NULL DEFAULT CURRENT_TIMESTAMP,
+    updated_at TIMESTAMP NOT NULL DEFAULT CURRENT_TIMESTAMP ON UPDATE CURRENT_TIMESTAMP,
+    finished_at TIMESTAMP NULL,
+    -- Claiming scans queued jobs that are due, oldest first
+    KEY idx_book_processing_jobs_claim (status, run_after),
+    KEY idx_book_processing_jobs_book (book_id),
+    CONSTRAINT fk_book_processing_jobs_book FOREIGN KEY (book_id) REFERENCES books (book_id) ON DELETE CASCADE
+);
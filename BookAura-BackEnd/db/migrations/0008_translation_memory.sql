@@ -0,0 +1,21 @@
+-- Content-addressed cache of ULCA results per chunk (services/final.py).
+-- Re-uploaded PDFs and shared boilerplate (licences, front matter) used to
+-- be translated and synthesised again chunk by chunk. Rows are keyed by
+-- the model, the target language and the SHA-256 of the normalised chunk;
+-- content holds the translated text (UTF-8) or the TTS audio (WAV).
+-- TranslationMemoryModel evicts least recently used rows once the total
+-- content size passes TRANSLATION_MEMORY_MAX_MB.
+
+CREATE TABLE IF NOT EXISTS translation_memory (
+    model_id VARCHAR(64) NOT NULL,
+    target_lang VARCHAR(16) NOT NULL,
+    chunk_hash CHAR(64) NOT NULL,
+    content LONGBLOB NOT NULL,
+    content_bytes INT UNSIGNED NOT NULL,
+    hits INT UNSIGNED NOT NULL DEFAULT 0,
+    created_at TIMESTAMP NOT NULL DEFAULT CURRENT_TIMESTAMP,
+    last_used_at TIMESTAMP NOT NULL DEFAULT CURRENT_TIMESTAMP,
+    PRIMARY KEY (model_id, target_lang, chunk_hash),
+    -- Eviction removes the least recently used rows first
+    KEY idx_translation_memory_last_used (last_used_at)
+);
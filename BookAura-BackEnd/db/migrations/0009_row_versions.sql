@@ -0,0 +1,16 @@
+-- Row versions for conditional GETs (utils/conditional_requests.py).
+-- GET /books/<id> and GET /categories/<id> build their ETag from these
+-- columns with a primary key lookup, so an unchanged resource is answered
+-- 304 without the detail query or JSON encoding. books and categories had
+-- no change timestamp; book_stats.updated_at already changes with the
+-- author name, category list and counts. Microsecond precision keeps two
+-- edits within the same second from sharing a version.
+
+ALTER TABLE books
+    ADD COLUMN updated_at TIMESTAMP(6) NOT NULL DEFAULT CURRENT_TIMESTAMP(6) ON UPDATE CURRENT_TIMESTAMP(6);
+
+ALTER TABLE categories
+    ADD COLUMN updated_at TIMESTAMP(6) NOT NULL DEFAULT CURRENT_TIMESTAMP(6) ON UPDATE CURRENT_TIMESTAMP(6);
+
+ALTER TABLE book_stats
+    MODIFY COLUMN updated_at TIMESTAMP(6) NOT NULL DEFAULT CURRENT_TIMESTAMP(6) ON UPDATE CURRENT_TIMESTAMP(6);
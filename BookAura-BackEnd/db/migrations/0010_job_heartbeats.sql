@@ -0,0 +1,14 @@
+-- Heartbeats for running book processing jobs (services/book_jobs.py).
+-- Jobs used to be requeued once they had been running longer than
+-- JOB_STALE_TIMEOUT, even when their worker was still busy with a long
+-- book, so two workers could process the same PDF at once. A running
+-- worker now refreshes heartbeat_at every JOB_HEARTBEAT_INTERVAL seconds
+-- and only jobs with a stale heartbeat are requeued; completing or
+-- failing a job checks locked_by, so a worker that lost the job has its
+-- result discarded.
+
+ALTER TABLE book_processing_jobs
+    ADD COLUMN heartbeat_at TIMESTAMP(6) NULL AFTER locked_at;
+
+-- Jobs already running count as alive since they were claimed
+UPDATE book_processing_jobs SET heartbeat_at = locked_at WHERE status = 'running';
@@ -0,0 +1,8 @@
+-- Indexes for BooksModel.get_catalog_version, the ETag of GET /books/ and
+-- GET /books/full/<id> (utils/conditional_requests.py). With them
+-- MAX(updated_at) reads one end of an index instead of every row, so an
+-- unchanged poll of the catalog is answered 304 without the listing query.
+
+ALTER TABLE books ADD INDEX idx_books_updated_at (updated_at);
+
+ALTER TABLE book_stats ADD INDEX idx_book_stats_updated_at (updated_at);
@@ -0,0 +1,11 @@
+-- books.uploaded_at is the keyset pagination key of the book listings
+-- (models/books.py BOOK_PAGE_KEY) but was declared NULL. A page ending on
+-- a NULL row produced a cursor that decode_cursor rejects, and
+-- `uploaded_at < %s` never matches NULL, so such rows were unreachable
+-- after the first page. Existing NULLs get a date at the bottom of the
+-- TIMESTAMP range (a day in, so it is valid in any session time zone),
+-- so they keep sorting last in the newest-first listings.
+
+UPDATE books SET uploaded_at = '1970-01-02 00:00:00' WHERE uploaded_at IS NULL;
+
+ALTER TABLE books MODIFY COLUMN uploaded_at TIMESTAMP NOT NULL DEFAULT CURRENT_TIMESTAMP;
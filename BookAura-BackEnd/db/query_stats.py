@@ -0,0 +1,226 @@
+import logging
+import re
+import sys
+import threading
+import time
+
+from db.config import get_query_stats_config
+
+logger = logging.getLogger(__name__)
+
+# Upper bounds (ms) of the latency histogram buckets; the last bucket is open-ended
+LATENCY_BUCKETS_MS = (1, 5, 10, 25, 50, 100, 250, 500, 1000, 2500, 5000)
+
+# Modules whose functions count as "the caller" of a statement
+CALLER_MODULE_PREFIXES = ('models.', 'services.', 'controllers.', 'scripts.')
+# Shared query helpers, skipped so the model method that called them is reported
+CALLER_SKIP_MODULES = ('models.base_model',)
+
+_WHITESPACE = re.compile(r'\s+')
+
+
+def normalize_statement(statement):
+    """Collapse whitespace so the same query text always aggregates together."""
+    if isinstance(statement, (bytes, bytearray)):
+        statement = statement.decode('utf-8', 'replace')
+    return _WHITESPACE.sub(' ', statement).strip()
+
+
+def find_caller():
+    """
+    Name of the innermost model/service function on the stack, e.g.
+    "BooksModel.fetch_public_books", or "unknown" when there is none.
+    Before Python 3.11 code objects have no co_qualname, so only the
+    function name is reported.
+    """
+    frame = sys._getframe(2)
+    while frame is not None:
+        module = frame.f_globals.get('__name__', '')
+        if module.startswith(CALLER_MODULE_PREFIXES) and module not in CALLER_SKIP_MODULES:
+            code = frame.f_code
+            return getattr(code, 'co_qualname', code.co_name)
+        frame = frame.f_back
+    return 'unknown'
+
+
+class QueryStats:
+    """
+    Process-wide aggregates of SQL statement timings.
+    Each (statement, caller) pair keeps a call count, total/max latency,
+    rows returned or affected, and a latency histogram. Statements slower
+    than DB_SLOW_QUERY_MS are logged as they happen.
+    """
+    _lock = threading.Lock()
+    _entries = {}
+    _config = None
+
+    @classmethod
+    def _get_config(cls):
+        if cls._config is None:
+            cls._config = get_query_stats_config()
+        return cls._config
+
+    @classmethod
+    def enabled(cls):
+        return cls._get_config()['enabled']
+
+    @classmethod
+    def record(cls, statement, elapsed, rows=0, caller=None):
+        """
+        Add one execution to the aggregates.
+
+        Args:
+            statement: SQL text as executed
+            elapsed: Execution time in seconds
+            rows: Rows affected by the statement
+            caller: Calling model method; looked up from the stack when omitted
+
+        Returns:
+            The aggregate key, for attributing rows fetched later (see add_rows)
+        """
+        caller = caller or find_caller()
+        statement = normalize_statement(statement)
+        elapsed_ms = elapsed * 1000
+        key = (statement, caller)
+
+        bucket = len(LATENCY_BUCKETS_MS)
+        for i, bound in enumerate(LATENCY_BUCKETS_MS):
+            if elapsed_ms <= bound:
+                bucket = i
+                break
+
+        with cls._lock:
+            entry = cls._entries.get(key)
+            if entry is None and len(cls._entries) >= cls._get_config()['max_statements']:
+                # Keep memory bounded when statements embed literal values
+                key = ('(other statements)', caller)
+                entry = cls._entries.get(key)
+            if entry is None:
+                entry = cls._entries[key] = {
+                    'count': 0,
+                    'total_ms': 0.0,
+                    'max_ms': 0.0,
+                    'rows': 0,
+                    'slow': 0,
+                    'histogram': [0] * (len(LATENCY_BUCKETS_MS) + 1),
+                }
+            entry['count'] += 1
+            entry['total_ms'] += elapsed_ms
+            entry['max_ms'] = max(entry['max_ms'], elapsed_ms)
+            entry['rows'] += max(rows or 0, 0)
+            entry['histogram'][bucket] += 1
+
+            slow = elapsed_ms >= cls._get_config()['slow_query_ms']
+            if slow:
+                entry['slow'] += 1
+
+        if slow:
+            logger.warning(f"Slow query ({elapsed_ms:.1f} ms) in {caller}: {statement[:500]}")
+        return key
+
+    @classmethod
+    def add_rows(cls, key, rows):
+        """Count rows fetched after the statement was recorded."""
+        if key is None or not rows:
+            return
+        with cls._lock:
+            entry = cls._entries.get(key)
+            if entry is not None:
+                entry['rows'] += rows
+
+    @classmethod
+    def snapshot(cls, limit=50, order_by='total_ms'):
+        """
+        Aggregates for the most expensive statements.
+
+        Args:
+            limit: Maximum number of statements to return
+            order_by: total_ms, max_ms, avg_ms, count, rows or slow
+
+        Returns:
+            List of dictionaries, most expensive first
+        """
+        labels = [f"<={bound}ms" for bound in LATENCY_BUCKETS_MS]
+        labels.append(f">{LATENCY_BUCKETS_MS[-1]}ms")
+        with cls._lock:
+            items = [(key, dict(entry)) for key, entry in cls._entries.items()]
+
+        results = []
+        for (statement, caller), entry in items:
+            results.append({
+                'statement': statement,
+                'caller': caller,
+                'count': entry['count'],
+                'total_ms': round(entry['total_ms'], 3),
+                'avg_ms': round(entry['total_ms'] / entry['count'], 3),
+                'max_ms': round(entry['max_ms'], 3),
+                'rows': entry['rows'],
+                'slow': entry['slow'],
+                'histogram': dict(zip(labels, entry['histogram'])),
+            })
+        if order_by not in ('total_ms', 'max_ms', 'avg_ms', 'count', 'rows', 'slow'):
+            order_by = 'total_ms'
+        results.sort(key=lambda r: r[order_by], reverse=True)
+        return results[:limit]
+
+    @classmethod
+    def reset(cls):
+        """Clear all aggregates."""
+        with cls._lock:
+            cls._entries.clear()
+
+
+class TimedCursor:
+    """
+    Cursor wrapper that records every execute in QueryStats.
+    Behaves like the wrapped mysql.connector cursor.
+    """
+
+    def __init__(self, cursor):
+        self._cursor = cursor
+        self._key = None
+
+    def __getattr__(self, name):
+        return getattr(self._cursor, name)
+
+    def __iter__(self):
+        return iter(self._cursor)
+
+    def _timed(self, method, operation, *args, **kwargs):
+        caller = find_caller()
+        started = time.perf_counter()
+        try:
+            return method(operation, *args, **kwargs)
+        finally:
+            elapsed = time.perf_counter() - started
+            # rowcount is meaningful here only for statements without a result set
+            rows = self._cursor.rowcount if self._cursor.description is None else 0
+            self._key = QueryStats.record(operation, elapsed, rows, caller)
+
+    def execute(self, operation, *args, **kwargs):
+        return self._timed(self._cursor.execute, operation, *args, **kwargs)
+
+    def executemany(self, operation, *args, **kwargs):
+        return self._timed(self._cursor.executemany, operation, *args, **kwargs)
+
+    def fetchone(self):
+        row = self._cursor.fetchone()
+        if row is not None:
+            QueryStats.add_rows(self._key, 1)
+        return row
+
+    def fetchmany(self, *args, **kwargs):
+        rows = self._cursor.fetchmany(*args, **kwargs)
+        QueryStats.add_rows(self._key, len(rows))
+        return rows
+
+    def fetchall(self):
+        rows = self._cursor.fetchall()
+        QueryStats.add_rows(self._key, len(rows))
+        return rows
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self._cursor.close()
@@ -0,0 +1,86 @@
+from flask import g, has_app_context
+from db.connection_pool import DatabasePool
+import logging
+
+logger = logging.getLogger(__name__)
+
+
+class RequestConnection:
+    """
+    View of the connection bound to the current Flask request.
+    Model code can close() it as usual; the underlying pooled connection
+    stays checked out until the request's app context is torn down.
+    """
+
+    def __init__(self, conn):
+        self._conn = conn
+
+    def __getattr__(self, name):
+        return getattr(self._conn, name)
+
+    def is_connected(self):
+        return self._conn.is_connected()
+
+    def commit(self):
+        """Commit, and keep the rest of the request's reads on the primary."""
+        self._conn.commit()
+        pin_to_primary()
+
+    def close(self):
+        """End any open transaction but keep the connection for the rest of the request."""
+        try:
+            if self._conn.is_connected() and self._conn.in_transaction:
+                self._conn.rollback()
+        except Exception as e:
+            logger.debug(f"Rollback on request connection failed: {e}")
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.close()
+
+
+def pin_to_primary():
+    """Send the remaining reads of this request to the primary (read-your-writes)."""
+    if has_app_context():
+        g._db_pinned_primary = True
+
+
+def is_pinned_to_primary():
+    """Whether this request has written and must read from the primary."""
+    return has_app_context() and g.get('_db_pinned_primary', False)
+
+
+def get_request_connection():
+    """
+    Get the connection bound to the current Flask request, checking one out
+    of the pool on first use.
+
+    Returns:
+        RequestConnection, or None when called outside an app context
+    """
+    if not has_app_context():
+        return None
+
+    conn = g.get('_db_conn')
+    if conn is None or not conn.is_connected():
+        if conn is not None:
+            DatabasePool.close_connection(conn)
+        conn = DatabasePool.get_connection()
+        g._db_conn = conn
+        logger.debug("Checked out request-scoped database connection")
+    return RequestConnection(conn)
+
+
+def release_request_connection(exception=None):
+    """Return the request's connection to the pool; registered with teardown_appcontext."""
+    conn = g.pop('_db_conn', None)
+    if conn is not None:
+        DatabasePool.close_connection(conn)
+        logger.debug("Returned request-scoped database connection")
+
+
+def init_app(app):
+    """Release the request-scoped connection when each app context ends."""
+    app.teardown_appcontext(release_request_connection)
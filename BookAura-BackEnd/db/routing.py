@@ -0,0 +1,171 @@
+import functools
+import itertools
+import logging
+import threading
+import time
+from contextvars import ContextVar
+
+from db.config import get_replica_configs, get_routing_config
+from db.connection_pool import DatabasePool
+from db.request_connection import is_pinned_to_primary
+
+logger = logging.getLogger(__name__)
+
+_read_only = ContextVar('db_read_only', default=False)
+
+
+def read_only(func):
+    """
+    Mark a model method as read-only so BaseModel.get_connection may serve
+    it from a read replica.
+    """
+    @functools.wraps(func)
+    def wrapper(*args, **kwargs):
+        token = _read_only.set(True)
+        try:
+            return func(*args, **kwargs)
+        finally:
+            _read_only.reset(token)
+    return wrapper
+
+
+def in_read_only():
+    """Whether the current call is inside a @read_only method."""
+    return _read_only.get()
+
+
+class ReplicaRouter:
+    """
+    Routes read-only work to a set of read replicas, each with its own pool.
+    Replicas are used round-robin, skipping any that lag behind the primary by
+    more than the configured threshold or that fail to connect. Reads fall back
+    to the primary when no replica qualifies or the request has already written.
+    """
+    _replicas = None
+    _health = {}
+    _lock = threading.Lock()
+    _counter = itertools.count()
+    _routing_config = None
+
+    @classmethod
+    def _get_replicas(cls):
+        if cls._replicas is None:
+            with cls._lock:
+                if cls._replicas is None:
+                    cls._routing_config = get_routing_config()
+                    cls._replicas = [
+                        # A down replica should fail fast so reads fall back to the primary
+                        DatabasePool.create_pool(f"ReplicaPool{i}", config, connect_retries=1)
+                        for i, config in enumerate(get_replica_configs())
+                    ]
+                    if cls._replicas:
+                        logger.info(f"Read routing enabled with {len(cls._replicas)} replica(s)")
+        return cls._replicas
+
+    @staticmethod
+    def _measure_lag(pool, assume_in_sync=False):
+        """
+        Seconds the replica is behind its source, or None if it is not
+        replicating or cannot be reached. A server with no replication
+        configured at all counts as 0 when assume_in_sync is set
+        (DB_REPLICA_ASSUME_IN_SYNC).
+        """
+        conn = pool.get_connection()
+        try:
+            cur = conn.cursor(dictionary=True)
+            try:
+                try:
+                    cur.execute("SHOW REPLICA STATUS")
+                except Exception:
+                    # MySQL before 8.0.22
+                    cur.execute("SHOW SLAVE STATUS")
+                row = cur.fetchone()
+            finally:
+                cur.close()
+        finally:
+            DatabasePool.close_connection(conn)
+
+        if not row:
+            return 0.0 if assume_in_sync else None
+        lag = row.get('Seconds_Behind_Source', row.get('Seconds_Behind_Master'))
+        return float(lag) if lag is not None else None
+
+    @classmethod
+    def _is_healthy(cls, pool):
+        """Check (at most once per lag_check_interval) that a replica is usable."""
+        now = time.monotonic()
+        with cls._lock:
+            checked_at, healthy, lag = cls._health.get(pool, (0.0, False, None))
+            if checked_at and now - checked_at < cls._routing_config['lag_check_interval']:
+                return healthy
+            # Claim the refresh so concurrent callers keep the previous verdict
+            cls._health[pool] = (now, healthy, lag)
+
+        try:
+            lag = cls._measure_lag(pool, cls._routing_config['assume_in_sync'])
+        except Exception as e:
+            logger.warning(f"{pool.__name__} unavailable: {e}")
+            lag = None
+        healthy = lag is not None and lag <= cls._routing_config['max_lag']
+        if not healthy:
+            logger.warning(f"{pool.__name__} skipped for reads (lag: {lag})")
+        with cls._lock:
+            cls._health[pool] = (time.monotonic(), healthy, lag)
+        return healthy
+
+    @classmethod
+    def _mark_unhealthy(cls, pool):
+        with cls._lock:
+            cls._health[pool] = (time.monotonic(), False, None)
+
+    @classmethod
+    def get_connection(cls):
+        """
+        Check a connection out of a healthy replica.
+
+        Returns:
+            PooledConnection, or None when reads should go to the primary
+        """
+        if is_pinned_to_primary():
+            return None
+        replicas = cls._get_replicas()
+        if not replicas:
+            return None
+
+        start = next(cls._counter)
+        for i in range(len(replicas)):
+            pool = replicas[(start + i) % len(replicas)]
+            if not cls._is_healthy(pool):
+                continue
+            try:
+                return pool.get_connection()
+            except Exception as e:
+                logger.warning(f"Falling back from {pool.__name__}: {e}")
+                cls._mark_unhealthy(pool)
+        return None
+
+    @classmethod
+    def stats(cls):
+        """
+        Replica health and pool counters.
+
+        Returns:
+            List of dictionaries, one per configured replica
+        """
+        with cls._lock:
+            health = dict(cls._health)
+        return [
+            {
+                'name': pool.__name__,
+                'host': f"{pool._server_config['host']}:{pool._server_config['port']}",
+                'healthy': health.get(pool, (0.0, None, None))[1],
+                'lag_seconds': health.get(pool, (0.0, None, None))[2],
+                'pool': pool.stats(),
+            }
+            for pool in (cls._get_replicas() or [])
+        ]
+
+
+def get_replica_connection():
+    """Replica connection for a read, or None to use the primary."""
+    return ReplicaRouter.get_connection()
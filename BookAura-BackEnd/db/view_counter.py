@@ -0,0 +1,208 @@
+import atexit
+import logging
+import threading
+from datetime import date
+
+from mysql.connector import errors
+
+from db.config import get_view_counter_config
+from db.connection_pool import DatabasePool
+
+logger = logging.getLogger(__name__)
+
+# Needs the UNIQUE key on views.book_id (migration 0002)
+UPSERT_VIEWS = (
+    "INSERT INTO views (book_id, book_view) VALUES {values} AS new "
+    "ON DUPLICATE KEY UPDATE book_view = views.book_view + new.book_view"
+)
+
+# Per-day buckets read by the dashboard time series (migration 0004)
+UPSERT_DAILY_VIEWS = (
+    "INSERT INTO book_views_daily (book_id, view_date, views) VALUES {values} AS new "
+    "ON DUPLICATE KEY UPDATE views = book_views_daily.views + new.views"
+)
+
+# Keeps the catalog's denormalised view count in step (migration 0005)
+UPSERT_BOOK_STATS_VIEWS = (
+    "INSERT INTO book_stats (book_id, views) VALUES {values} AS new "
+    "ON DUPLICATE KEY UPDATE views = book_stats.views + new.views"
+)
+
+
+class ViewCounter:
+    """
+    Thread-safe write-behind accumulator for book views.
+
+    increment() only bumps an in-memory counter per (book_id, day). A
+    background thread writes all pending counts every flush_interval
+    seconds, or sooner once max_pending views are waiting, and a final flush
+    runs at interpreter exit. Each flush upserts the lifetime totals in views
+    and the per-day buckets in book_views_daily, and adds to book_stats.views,
+    all in one transaction.
+
+    Durability: views are acknowledged before they reach MySQL. A clean
+    shutdown loses nothing; a hard crash (SIGKILL, OOM, power loss) loses at
+    most the views accumulated since the last flush, i.e. roughly
+    flush_interval seconds or max_pending views, whichever comes first.
+    A failed flush puts its counts back so they are retried.
+    """
+
+    def __init__(self, config=None):
+        self._config = config or get_view_counter_config()
+        self._lock = threading.Lock()
+        self._flush_lock = threading.Lock()
+        self._pending = {}
+        self._pending_total = 0
+        self._wake = threading.Event()
+        self._stopped = threading.Event()
+        self._thread = None
+        self._stats = {'views': 0, 'flushes': 0, 'rows_written': 0, 'failed_flushes': 0, 'dropped': 0}
+
+    def _ensure_started(self):
+        # Started lazily so forked workers and one-off scripts each get their own thread
+        if self._thread is None or not self._thread.is_alive():
+            with self._lock:
+                if self._thread is None or not self._thread.is_alive():
+                    self._thread = threading.Thread(target=self._run, name="view-counter-flush", daemon=True)
+                    self._thread.start()
+
+    def increment(self, book_id, count=1):
+        """Record views for a book; written to the database on the next flush."""
+        key = (book_id, date.today())
+        if not self._config['enabled']:
+            return self._write({key: count})
+
+        self._ensure_started()
+        with self._lock:
+            self._pending[key] = self._pending.get(key, 0) + count
+            self._pending_total += count
+            self._stats['views'] += count
+            full = self._pending_total >= self._config['max_pending']
+        if full:
+            self._wake.set()
+        return True
+
+    def pending(self, book_id=None):
+        """Views not yet written, for one book or in total."""
+        with self._lock:
+            if book_id is None:
+                return self._pending_total
+            return sum(count for (pending_id, _), count in self._pending.items() if pending_id == book_id)
+
+    def _run(self):
+        while not self._stopped.is_set():
+            self._wake.wait(self._config['flush_interval'])
+            self._wake.clear()
+            self.flush()
+
+    def flush(self):
+        """
+        Write all pending views now.
+
+        Returns:
+            True if everything pending was written (or nothing was pending)
+        """
+        with self._flush_lock:
+            with self._lock:
+                batch, self._pending = self._pending, {}
+                self._pending_total = 0
+            if not batch:
+                return True
+
+            if self._write(batch):
+                return True
+
+            # Put the counts back so the next flush retries them
+            with self._lock:
+                for key, count in batch.items():
+                    self._pending[key] = self._pending.get(key, 0) + count
+                    self._pending_total += count
+                self._stats['failed_flushes'] += 1
+            return False
+
+    def _write(self, batch):
+        """Upsert a {(book_id, day): views} batch into views and book_views_daily."""
+        # Sorted so concurrent flushers lock rows in the same order
+        daily_rows = sorted(batch.items())
+        conn = None
+        try:
+            conn = DatabasePool.get_connection()
+            with conn.cursor() as cur:
+                try:
+                    self._upsert(cur, daily_rows)
+                except errors.IntegrityError:
+                    # A view for a book that no longer exists fails the whole
+                    # batch; retry book by book and drop only the offending ones
+                    conn.rollback()
+                    daily_rows = self._write_books(cur, daily_rows)
+                conn.commit()
+            with self._lock:
+                self._stats['flushes'] += 1
+                self._stats['rows_written'] += len(daily_rows)
+            return True
+        except Exception as e:
+            if conn:
+                try:
+                    conn.rollback()
+                except Exception:
+                    pass
+            logger.error(f"Failed to flush {len(batch)} book view counts: {e}")
+            return False
+        finally:
+            if conn:
+                DatabasePool.close_connection(conn)
+
+    @staticmethod
+    def _upsert(cur, daily_rows):
+        totals = {}
+        for (book_id, _), count in daily_rows:
+            totals[book_id] = totals.get(book_id, 0) + count
+        total_rows = sorted(totals.items())
+
+        total_values = [value for row in total_rows for value in row]
+        cur.execute(UPSERT_VIEWS.format(values=", ".join(["(%s, %s)"] * len(total_rows))), total_values)
+        cur.execute(UPSERT_BOOK_STATS_VIEWS.format(values=", ".join(["(%s, %s)"] * len(total_rows))), total_values)
+        cur.execute(
+            UPSERT_DAILY_VIEWS.format(values=", ".join(["(%s, %s, %s)"] * len(daily_rows))),
+            [value for (book_id, day), count in daily_rows for value in (book_id, day, count)]
+        )
+
+    def _write_books(self, cur, daily_rows):
+        by_book = {}
+        for (book_id, day), count in daily_rows:
+            by_book.setdefault(book_id, []).append(((book_id, day), count))
+
+        written = []
+        for book_id, rows in by_book.items():
+            try:
+                self._upsert(cur, rows)
+                written.extend(rows)
+            except errors.IntegrityError as e:
+                count = sum(c for _, c in rows)
+                logger.warning(f"Dropping {count} views for book {book_id}: {e}")
+                with self._lock:
+                    self._stats['dropped'] += count
+        return written
+
+    def shutdown(self):
+        """Stop the background thread and write whatever is still pending."""
+        self._stopped.set()
+        self._wake.set()
+        if self._thread is not None and self._thread is not threading.current_thread():
+            self._thread.join(timeout=self._config['flush_interval'] + 5)
+        if not self.flush():
+            logger.error(f"{self.pending()} book views could not be written at shutdown")
+
+    def stats(self):
+        """Counters for views accepted, flushes, rows written and pending views."""
+        with self._lock:
+            return {
+                **self._stats,
+                'pending': self._pending_total,
+                'pending_books': len({book_id for book_id, _ in self._pending}),
+            }
+
+
+# Global instance that can be imported
+view_counter = ViewCounter()
+atexit.register(view_counter.shutdown)
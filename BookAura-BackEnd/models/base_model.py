@@ -1,4 +1,8 @@
 from db.connection_pool import DatabasePool
+from db.request_connection import get_request_connection
+from db.routing import in_read_only, get_replica_connection
+from db.config import get_export_config
+from contextlib import contextmanager
 import logging
 
 logger = logging.getLogger(__name__)
@@ -14,9 +18,77 @@ class BaseModel:
         self.db_pool = DatabasePool()
     
     def get_connection(self):
-        """Get a connection from the pool."""
+        """
+        Get a connection. Methods marked @read_only are served from a read
+        replica when one is healthy; everything else reuses the current Flask
+        request's connection when there is one and checks out from the pool
+        otherwise.
+        """
+        if in_read_only():
+            conn = get_replica_connection()
+            if conn is not None:
+                return conn
+        conn = get_request_connection()
+        if conn is not None:
+            return conn
         return self.db_pool.get_connection()
     
+    @contextmanager
+    def connection(self):
+        """
+        Context manager that provides a connection (see get_connection)
+        and releases it when the block exits.
+        """
+        conn = self.get_connection()
+        try:
+            yield conn
+        finally:
+            self.db_pool.close_connection(conn)
+    
+    def stream_query(self, query, params=None, batch_size=None):
+        """
+        Yield the rows of a read query in batches without holding the whole
+        result in memory.
+
+        Rows come from an unbuffered cursor, so MySQL sends them as they are
+        fetched. The query runs on a connection of its own (a replica when
+        one is healthy) that stays checked out until the generator finishes
+        or is closed; it is not the request's shared connection, which a
+        half-read result would block.
+
+        Args:
+            query: SQL query to execute
+            params: Parameters for the query
+            batch_size: Rows per batch (default EXPORT_BATCH_SIZE)
+
+        Yields:
+            Lists of up to batch_size dictionaries
+        """
+        batch_size = batch_size or get_export_config()['batch_size']
+        conn = get_replica_connection() or self.db_pool.get_connection()
+        cursor = None
+        exhausted = False
+        try:
+            cursor = conn.cursor(dictionary=True, buffered=False)
+            cursor.execute(query, params or ())
+            while True:
+                rows = cursor.fetchmany(batch_size)
+                if not rows:
+                    exhausted = True
+                    break
+                yield rows
+        finally:
+            if cursor is not None:
+                try:
+                    cursor.close()
+                except Exception as e:
+                    # Stopped early (client went away) with rows still unread;
+                    # the pool discards the connection when its reset fails
+                    logger.debug(f"Closing partially read export cursor: {e}")
+            if not exhausted:
+                logger.info("Streaming query stopped before the last row")
+            self.db_pool.close_connection(conn)
+
     def execute_query(self, query, params=None, commit=False):
         """
         Execute a query and optionally commit changes.
@@ -0,0 +1,125 @@
+import logging
+from models.base_model import BaseModel
+
+logger = logging.getLogger(__name__)
+
+# Recomputes whole book_stats rows from the source tables. Every aggregate is
+# a correlated subquery on an indexed book_id, so the cost grows with the
+# number of books refreshed rather than with the size of views or bookmarks.
+REFRESH_BOOK_STATS = """
+    INSERT INTO book_stats (book_id, author_name, categories, views, readers, bookmarks)
+    SELECT * FROM (
+        SELECT
+            b.book_id,
+            u.username AS author_name,
+            COALESCE((
+                SELECT GROUP_CONCAT(c.category_name ORDER BY c.category_name SEPARATOR ', ')
+                FROM book_category bc
+                JOIN categories c ON bc.category_id = c.category_id
+                WHERE bc.book_id = b.book_id
+            ), '') AS categories,
+            COALESCE((SELECT SUM(v.book_view) FROM views v WHERE v.book_id = b.book_id), 0) AS views,
+            (SELECT COUNT(DISTINCT rh.user_id) FROM reading_history rh WHERE rh.book_id = b.book_id) AS readers,
+            (SELECT COUNT(*) FROM bookmarks bm WHERE bm.book_id = b.book_id) AS bookmarks
+        FROM books b
+        LEFT JOIN users u ON b.user_id = u.user_id
+        WHERE {where}
+    ) AS src
+    ON DUPLICATE KEY UPDATE
+        author_name = src.author_name,
+        categories = src.categories,
+        views = src.views,
+        readers = src.readers,
+        bookmarks = src.bookmarks
+"""
+
+
+class BookStatsModel(BaseModel):
+    """
+    Maintains book_stats, the denormalised per-book row read by the catalog
+    queries in BooksModel (migration 0005).
+
+    View counts are added incrementally by the view counter's flush, and
+    bookmark and reader counts by adjust() in the writes that change them.
+    Author names and category lists are refreshed per affected book by the
+    write that changed them: pass the writer's connection to refresh inside
+    its transaction, or omit it to refresh and commit on a connection of its
+    own.
+    """
+
+    def _refresh(self, where, params, conn=None):
+        close_conn = conn is None
+        if close_conn:
+            conn = self.get_connection()
+        try:
+            with conn.cursor() as cur:
+                cur.execute(REFRESH_BOOK_STATS.format(where=where), params)
+                refreshed = cur.rowcount
+            if close_conn:
+                conn.commit()
+            return refreshed
+        except Exception as e:
+            if not close_conn:
+                # Part of the caller's transaction; let it roll back
+                raise
+            logger.error(f"Failed to refresh book_stats ({where}): {e}")
+            conn.rollback()
+            return None
+        finally:
+            if close_conn:
+                self.db_pool.close_connection(conn)
+
+    def refresh_books(self, book_ids, conn=None):
+        """
+        Recompute the book_stats rows for the given books.
+
+        Args:
+            book_ids: Iterable of book IDs
+            conn: Connection whose open transaction the refresh joins (optional)
+
+        Returns:
+            Affected row count reported by MySQL, or None if the refresh failed
+        """
+        book_ids = sorted(set(book_ids))
+        if not book_ids:
+            return 0
+        where = "b.book_id IN (%s)" % ', '.join(['%s'] * len(book_ids))
+        return self._refresh(where, tuple(book_ids), conn)
+
+    def adjust(self, book_id, conn, bookmarks=0, readers=0):
+        """
+        Add to a book's bookmark and reader counts inside the caller's
+        transaction, without recounting its bookmarks or reading history.
+        A book with no row yet, or a count that would go below zero, is
+        recomputed instead.
+
+        Args:
+            book_id: ID of the book
+            conn: Connection whose open transaction the update joins
+            bookmarks: Bookmarks added (negative when removed)
+            readers: Distinct readers added
+        """
+        if not bookmarks and not readers:
+            return
+        with conn.cursor() as cur:
+            cur.execute("""
+                UPDATE book_stats
+                SET bookmarks = GREATEST(CAST(bookmarks AS SIGNED) + %s, 0),
+                    readers = GREATEST(CAST(readers AS SIGNED) + %s, 0)
+                WHERE book_id = %s
+            """, (bookmarks, readers, book_id))
+            updated = cur.rowcount
+        if not updated:
+            self.refresh_books([book_id], conn)
+
+    def refresh_author(self, user_id, conn=None):
+        """Recompute the rows for every book uploaded by a user, e.g. after a rename."""
+        return self._refresh("b.user_id = %s", (user_id,), conn)
+
+    def rebuild(self, conn=None):
+        """Recompute book_stats for every book; repairs any drift from the source tables."""
+        return self._refresh("1 = 1", (), conn)
+
+
+# Global instance that can be imported
+book_stats_model = BookStatsModel()
@@ -1,6 +1,8 @@
 import logging
-from datetime import datetime, timedelta
 from models.base_model import BaseModel
+from models.time_series import time_series_model, bucket_starts
+from db.view_counter import view_counter
+from db.routing import read_only
 
 # Configure logging
 logger = logging.getLogger(__name__)
@@ -10,11 +12,13 @@ class BooksViewsModel(BaseModel):
         super().__init__()
         logger.info("Book views model initialized")
         
+    @read_only
     def fetch_all_books_views(self):
         """Fetch all book views."""
         query = 'SELECT * FROM views'
         return self.execute_query(query)
     
+    @read_only
     def fetch_book_views_by_id(self, book_id):
         """Fetch views for a specific book."""
         query = """
@@ -29,52 +33,54 @@ class BooksViewsModel(BaseModel):
         return self.execute_query_single(query, (book_id,))
     
     def add_view(self, book_id):
-        """Add a view to a book."""
-        # First check if data already exists
-        check_query = "SELECT * FROM views WHERE book_id = %s"
-        book = self.execute_query_single(check_query, (book_id,))
-        
-        if book is None:
-            insert_query = "INSERT INTO views (book_id, book_view) VALUES (%s, 1)"
-            return self.execute_query(insert_query, (book_id,), commit=True)
-        else:
-            update_query = "UPDATE views SET book_view = book_view + 1 WHERE book_id = %s"
-            return self.execute_query(update_query, (book_id,), commit=True)
+        """Add a view to a book; written in the next batch of the shared view counter."""
+        return view_counter.increment(book_id)
     
-    def get_daily_views(self, days=7):
-        """Handle decimal conversion properly."""
-        try:
-            days = int(days)
-            
-            # Get total views
-            query = "SELECT SUM(book_view) AS total_views FROM views"
-            result = self.execute_query_single(query)
-            total_views = float(result['total_views']) if result and result['total_views'] else 0.0
+    @read_only
+    def get_daily_views(self, days=7, publisher_id=None):
+        """
+        Views per day from the book_views_daily buckets, newest day first.
 
-            daily_data = []
-            today = datetime.now()
+        Args:
+            days: Number of days ending today
+            publisher_id: Only count books uploaded by this user
 
-            if total_views > 0:
-                remaining = total_views
-                for i in range(days):
-                    date = today - timedelta(days=i)
-                    if i == 0:
-                        views = remaining * 0.7
-                    elif i == days - 1:
-                        views = remaining
-                    else:
-                        views = remaining * (0.3 / (days - 1))
-                    remaining -= views
-                    daily_data.append((date.date(), int(views)))
-            else:
-                daily_data = [(datetime.now().date() - timedelta(days=i), 0) 
-                             for i in range(days)]
-                return daily_data
+        Returns:
+            List of (date, views) tuples, one per day, zero for days without views
+        """
+        try:
+            series = self._views_series('day', days, publisher_id)
         except Exception as e:
             logger.error(f"Daily views error: {e}")
-            return [(datetime.now().date() - timedelta(days=i), 0) 
-                    for i in range(days)]
-    
+            series = [(day, 0) for day in bucket_starts('day', int(days))]
+        series.reverse()
+        return series
+
+    @read_only
+    def get_monthly_views(self, months=6, publisher_id=None):
+        """
+        Views per calendar month from the book_views_daily buckets, oldest month first.
+
+        Args:
+            months: Number of months ending with the current one
+            publisher_id: Only count books uploaded by this user
+
+        Returns:
+            List of (first day of month, views) tuples, zero for months without views
+        """
+        try:
+            return self._views_series('month', months, publisher_id)
+        except Exception as e:
+            logger.error(f"Monthly views error: {e}")
+            return [(month, 0) for month in bucket_starts('month', int(months))]
+
+    def _views_series(self, interval, periods, publisher_id):
+        if publisher_id is None:
+            return time_series_model.series('book_views', interval, periods)
+        return time_series_model.series('book_views_by_book', interval, periods,
+                                        where="b.user_id = %s", params=(publisher_id,))
+
+    @read_only
     def get_monthly_views_by_publisher(self, publisher_id, month=None, year=None):
         """Get total views for a publisher's books."""
         query = """
@@ -87,6 +93,7 @@ class BooksViewsModel(BaseModel):
         result = self.execute_query_single(query, (publisher_id,))
         return result['total_views'] if result else 0
             
+    @read_only
     def get_total_views_by_publisher(self, publisher_id):
         """Get total views for all books by a publisher."""
         query = """
@@ -99,6 +106,7 @@ class BooksViewsModel(BaseModel):
         result = self.execute_query_single(query, (publisher_id,))
         return result['total_views'] if result else 0
             
+    @read_only
     def get_views_distribution_by_publisher(self, publisher_id):
         """Get view distribution across books for a publisher."""
         query = """
@@ -113,6 +121,7 @@ class BooksViewsModel(BaseModel):
         results = self.execute_query(query, (publisher_id,))
         return [{"name": result['title'], "views": result['book_view']} for result in results]
             
+    @read_only
     def get_total_views(self):
         """Get total views across all books."""
         query = """
@@ -123,9 +132,9 @@ class BooksViewsModel(BaseModel):
         result = self.execute_query_single(query)
         return result['total_views'] if result else 0
                 
+    @read_only
     def get_views_timeline(self, days=30):
         """Get views timeline for the specified number of days."""
-        # Since we don't have actual daily view data, we'll simulate it
         daily_views = self.get_daily_views(days=days)
         
         # Format for the frontend
@@ -1,198 +1,230 @@
-import mysql.connector
+from models.base_model import BaseModel
+from models.book_stats import book_stats_model
+from utils.response_cache import ResponseCache, user_bookmarks_tag
+from utils.pagination import keyset_condition
 
 #bookmaks(bookmark_id, user_id, book_id, created_at)
 
-class BookmarksModel:
-    def __init__(self):
-        self.conn = self.get_db_connection()
-        
-    def get_db_connection(self):
-        return mysql.connector.connect(
-            host="localhost",
-            database="bookauradb",
-            user="root",
-            password="root"
-        )
-    
-    
-    def fetch_all_bookmarks(self):
-        cur = self.conn.cursor()
-        cur.execute('SELECT * FROM bookmarks')
-        bookmarks = cur.fetchall()
-        cur.close()
-        return bookmarks
+class BookmarksModel(BaseModel):
+    def fetch_all_bookmarks(self, limit=None, after=None):
+        """Bookmarks in bookmark_id order; after is the keyset cursor [bookmark_id]."""
+        query = 'SELECT * FROM bookmarks'
+        params = []
+        if after is not None:
+            condition, params = keyset_condition(['bookmark_id'], after)
+            query += ' WHERE ' + condition
+        query += ' ORDER BY bookmark_id'
+        if limit is not None:
+            query += ' LIMIT %s'
+            params.append(limit)
+        with self.connection() as conn:
+            cur = conn.cursor()
+            cur.execute(query, tuple(params))
+            bookmarks = cur.fetchall()
+            cur.close()
+            return bookmarks
     
     def fetch_bookmark_by_id(self, bookmark_id):
-        cur = self.conn.cursor()
-        cur.execute("""
-            SELECT 
-                b.bookmark_id, 
-                b.user_id, 
-                b.book_id, 
-                b.created_at
-            FROM 
-                bookmarks b
-            WHERE 
-                b.bookmark_id = %s
-            """, (bookmark_id,))
-        bookmark = cur.fetchone()
-        cur.close()
-        return bookmark
+        with self.connection() as conn:
+            cur = conn.cursor()
+            cur.execute("""
+                SELECT 
+                    b.bookmark_id, 
+                    b.user_id, 
+                    b.book_id, 
+                    b.created_at
+                FROM 
+                    bookmarks b
+                WHERE 
+                    b.bookmark_id = %s
+                """, (bookmark_id,))
+            bookmark = cur.fetchone()
+            cur.close()
+            return bookmark
         
     def fetch_bookmarks_by_user_id(self, user_id):
-        with self.conn.cursor(dictionary=True) as cur:
+        with self.connection() as conn:
+            with conn.cursor(dictionary=True) as cur:
+                cur.execute("""
+                    SELECT 
+                        bm.bookmark_id,
+                        bm.user_id,
+                        bm.book_id,
+                        bm.created_at,
+                        b.book_id AS book_book_id, 
+                        b.user_id AS author_id, 
+                        u.username AS author_name, 
+                        b.title, 
+                        b.description, 
+                        b.coverUrl, 
+                        b.fileUrl, 
+                        b.audioUrl,
+                        b.is_public, 
+                        b.is_approved, 
+                        b.uploaded_at, 
+                        b.coverUrl,
+                        b.uploaded_by_role,
+                        COALESCE(GROUP_CONCAT(c.category_name SEPARATOR ', '), '') AS categories,
+                        COALESCE(v.book_view, 0) AS views  -- Include book views
+                    FROM 
+                        bookmarks bm
+                    LEFT JOIN 
+                        books b ON bm.book_id = b.book_id
+                    LEFT JOIN 
+                        book_category bc ON b.book_id = bc.book_id
+                    LEFT JOIN 
+                        categories c ON bc.category_id = c.category_id
+                    LEFT JOIN 
+                        users u ON b.user_id = u.user_id  -- Join with users table to get author_name
+                    LEFT JOIN 
+                        views v ON b.book_id = v.book_id  -- Join the views table
+                    WHERE 
+                        bm.user_id = %s
+                    GROUP BY 
+                        bm.bookmark_id, bm.user_id, bm.book_id, bm.created_at, 
+                        b.book_id, b.user_id, u.username, b.title, b.description, b.coverUrl, b.fileUrl, b.audioUrl, 
+                        b.is_public, b.is_approved, b.uploaded_at, b.uploaded_by_role, v.book_view
+                """, (user_id,))
+                bookmarks = cur.fetchall()
+                return bookmarks
+    def fetch_bookmarks_by_book_id(self, book_id):
+        with self.connection() as conn:
+            cur = conn.cursor()
             cur.execute("""
                 SELECT 
-                    bm.bookmark_id,
-                    bm.user_id,
-                    bm.book_id,
-                    bm.created_at,
-                    b.book_id AS book_book_id, 
-                    b.user_id AS author_id, 
-                    u.username AS author_name, 
-                    b.title, 
-                    b.description, 
-                    b.coverUrl, 
-                    b.fileUrl, 
-                    b.audioUrl,
-                    b.is_public, 
-                    b.is_approved, 
-                    b.uploaded_at, 
-                    b.coverUrl,
-                    b.uploaded_by_role,
-                    COALESCE(GROUP_CONCAT(c.category_name SEPARATOR ', '), '') AS categories,
-                    COALESCE(v.book_view, 0) AS views  -- Include book views
+                    b.bookmark_id, 
+                    b.user_id, 
+                    b.book_id, 
+                    b.created_at
                 FROM 
-                    bookmarks bm
-                LEFT JOIN 
-                    books b ON bm.book_id = b.book_id
-                LEFT JOIN 
-                    book_category bc ON b.book_id = bc.book_id
-                LEFT JOIN 
-                    categories c ON bc.category_id = c.category_id
-                LEFT JOIN 
-                    users u ON b.user_id = u.user_id  -- Join with users table to get author_name
-                LEFT JOIN 
-                    views v ON b.book_id = v.book_id  -- Join the views table
+                    bookmarks b
                 WHERE 
-                    bm.user_id = %s
-                GROUP BY 
-                    bm.bookmark_id, bm.user_id, bm.book_id, bm.created_at, 
-                    b.book_id, b.user_id, u.username, b.title, b.description, b.coverUrl, b.fileUrl, b.audioUrl, 
-                    b.is_public, b.is_approved, b.uploaded_at, b.uploaded_by_role, v.book_view
-            """, (user_id,))
+                    b.book_id = %s
+                """, (book_id,))
             bookmarks = cur.fetchall()
+            cur.close()
             return bookmarks
-    def fetch_bookmarks_by_book_id(self, book_id):
-        cur = self.conn.cursor()
-        cur.execute("""
-            SELECT 
-                b.bookmark_id, 
-                b.user_id, 
-                b.book_id, 
-                b.created_at
-            FROM 
-                bookmarks b
-            WHERE 
-                b.book_id = %s
-            """, (book_id,))
-        bookmarks = cur.fetchall()
-        cur.close()
-        return bookmarks
     
     def create_bookmark(self, user_id, book_id):
-        cur = self.conn.cursor()
-        cur.execute("""
-            INSERT INTO bookmarks (user_id, book_id) 
-            VALUES (%s, %s)
-        """, (user_id, book_id))
-        bookmark_id = cur.lastrowid
-        self.conn.commit()
-        cur.close()
-        return bookmark_id
+        with self.connection() as conn:
+            cur = conn.cursor()
+            cur.execute("""
+                INSERT INTO bookmarks (user_id, book_id) 
+                VALUES (%s, %s)
+            """, (user_id, book_id))
+            bookmark_id = cur.lastrowid
+            book_stats_model.adjust(book_id, conn, bookmarks=1)
+            conn.commit()
+            ResponseCache.invalidate({user_bookmarks_tag(user_id)})
+            cur.close()
+            return bookmark_id
     
     def delete_bookmark(self, bookmark_id):
-        cur = self.conn.cursor()
-        cur.execute('DELETE FROM bookmarks WHERE bookmark_id = %s', (bookmark_id,))
-        self.conn.commit()
-        cur.close()
-        return True
+        with self.connection() as conn:
+            cur = conn.cursor()
+            cur.execute('SELECT user_id, book_id FROM bookmarks WHERE bookmark_id = %s', (bookmark_id,))
+            rows = cur.fetchall()
+            cur.execute('DELETE FROM bookmarks WHERE bookmark_id = %s', (bookmark_id,))
+            if rows and cur.rowcount:
+                book_stats_model.adjust(rows[0][1], conn, bookmarks=-cur.rowcount)
+            conn.commit()
+            ResponseCache.invalidate({user_bookmarks_tag(row[0]) for row in rows})
+            cur.close()
+            return True
     
     def delete_bookmarks_by_user_id(self, user_id):
-        cur = self.conn.cursor()
-        cur.execute('DELETE FROM bookmarks WHERE user_id = %s', (user_id,))
-        self.conn.commit()
-        cur.close()
-        return True
+        with self.connection() as conn:
+            cur = conn.cursor()
+            cur.execute('SELECT book_id, COUNT(*) FROM bookmarks WHERE user_id = %s GROUP BY book_id', (user_id,))
+            counts = cur.fetchall()
+            cur.execute('DELETE FROM bookmarks WHERE user_id = %s', (user_id,))
+            for book_id, count in counts:
+                book_stats_model.adjust(book_id, conn, bookmarks=-count)
+            conn.commit()
+            ResponseCache.invalidate({user_bookmarks_tag(user_id)})
+            cur.close()
+            return True
     
     def delete_bookmarks_by_book_id(self, book_id):
-        cur = self.conn.cursor()
-        cur.execute('DELETE FROM bookmarks WHERE book_id = %s', (book_id,))
-        self.conn.commit()
-        cur.close()
-        return True
+        with self.connection() as conn:
+            cur = conn.cursor()
+            cur.execute('SELECT DISTINCT user_id FROM bookmarks WHERE book_id = %s', (book_id,))
+            user_ids = [row[0] for row in cur.fetchall()]
+            cur.execute('DELETE FROM bookmarks WHERE book_id = %s', (book_id,))
+            book_stats_model.adjust(book_id, conn, bookmarks=-cur.rowcount)
+            conn.commit()
+            ResponseCache.invalidate({user_bookmarks_tag(user_id) for user_id in user_ids})
+            cur.close()
+            return True
     
     def delete_bookmarks_by_user_id_and_book_id(self, user_id, book_id):
-        cur = self.conn.cursor()
-        cur.execute('DELETE FROM bookmarks WHERE user_id = %s AND book_id = %s', (user_id, book_id))
-        self.conn.commit()
-        cur.close()
-        return True
+        with self.connection() as conn:
+            cur = conn.cursor()
+            cur.execute('DELETE FROM bookmarks WHERE user_id = %s AND book_id = %s', (user_id, book_id))
+            book_stats_model.adjust(book_id, conn, bookmarks=-cur.rowcount)
+            conn.commit()
+            ResponseCache.invalidate({user_bookmarks_tag(user_id)})
+            cur.close()
+            return True
     
     def fetch_bookmarks_by_book_and_user(self, user_id, book_id):
-        cur = self.conn.cursor()
-        cur.execute("""
-            SELECT 
-                b.bookmark_id, 
-                b.user_id, 
-                b.book_id, 
-                b.created_at
-            FROM 
-                bookmarks b
-            WHERE 
-                b.user_id = %s AND b.book_id = %s
-            """, (user_id, book_id))
-        bookmark = cur.fetchone()
-        cur.close()
-        return bookmark
+        with self.connection() as conn:
+            cur = conn.cursor()
+            cur.execute("""
+                SELECT 
+                    b.bookmark_id, 
+                    b.user_id, 
+                    b.book_id, 
+                    b.created_at
+                FROM 
+                    bookmarks b
+                WHERE 
+                    b.user_id = %s AND b.book_id = %s
+                """, (user_id, book_id))
+            bookmark = cur.fetchone()
+            cur.close()
+            return bookmark
     
     def delete_bookmark_by_book_and_user(self, user_id, book_id):
-        cur = self.conn.cursor()
-        cur.execute('DELETE FROM bookmarks WHERE user_id = %s AND book_id = %s', (user_id, book_id))
-        self.conn.commit()
-        print(cur.statement)
-        cur.close()
-        return True
+        with self.connection() as conn:
+            cur = conn.cursor()
+            cur.execute('DELETE FROM bookmarks WHERE user_id = %s AND book_id = %s', (user_id, book_id))
+            book_stats_model.adjust(book_id, conn, bookmarks=-cur.rowcount)
+            conn.commit()
+            ResponseCache.invalidate({user_bookmarks_tag(user_id)})
+            print(cur.statement)
+            cur.close()
+            return True
     
     def add_bookmark(self, user_id, book_id):
-        cur = self.conn.cursor()
-        cur.execute("""
-            INSERT INTO bookmarks (user_id, book_id) 
-            VALUES (%s, %s)
-        """, (user_id, book_id))
-        bookmark_id = cur.lastrowid
-        self.conn.commit()
-        cur.close()
-        return bookmark_id
+        with self.connection() as conn:
+            cur = conn.cursor()
+            cur.execute("""
+                INSERT INTO bookmarks (user_id, book_id) 
+                VALUES (%s, %s)
+            """, (user_id, book_id))
+            bookmark_id = cur.lastrowid
+            book_stats_model.adjust(book_id, conn, bookmarks=1)
+            conn.commit()
+            ResponseCache.invalidate({user_bookmarks_tag(user_id)})
+            cur.close()
+            return bookmark_id
         
     def fetch_bookmarks_by_user(self, user_id):
-        cur = self.conn.cursor()
-        cur.execute("""
-            SELECT 
-                b.bookmark_id, 
-                b.user_id, 
-                b.book_id, 
-                b.created_at
-            FROM 
-                bookmarks b
-            WHERE 
-                b.user_id = %s
-            """, (user_id,))
-        bookmarks = cur.fetchall()
-        cur.close()
-        return bookmarks
-    
-    def close_connection(self):
-        self.conn.close()
-        return True
-        
\ No newline at end of file
+        with self.connection() as conn:
+            cur = conn.cursor()
+            cur.execute("""
+                SELECT 
+                    b.bookmark_id, 
+                    b.user_id, 
+                    b.book_id, 
+                    b.created_at
+                FROM 
+                    bookmarks b
+                WHERE 
+                    b.user_id = %s
+                """, (user_id,))
+            bookmarks = cur.fetchall()
+            cur.close()
+            return bookmarks
+
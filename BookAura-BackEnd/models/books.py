@@ -1,98 +1,90 @@
 import mysql.connector
 import logging
-from mysql.connector import pooling
 from typing import List, Dict, Optional, Union
 import json
-from datetime import datetime
-import asyncio
-from asyncpg import Pool
+from datetime import datetime, timedelta
+from models.base_model import BaseModel
+from db.routing import read_only
+from db.async_pool import AsyncDatabasePool
+from db.view_counter import view_counter
+from models.book_stats import book_stats_model
+from utils.response_cache import ResponseCache, book_change_tags
+from utils.pagination import keyset_condition
 
 # Configure logging
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
-pool: Pool = None
+# Shared by fetch_public_books and its async counterpart (see public_books_query)
+PUBLIC_BOOKS_QUERY = """
+    SELECT 
+        b.book_id, 
+        b.user_id AS author_id, 
+        s.author_name, 
+        b.title, 
+        b.description, 
+        b.fileUrl, 
+        b.audioUrl,
+        b.is_public, 
+        b.is_approved, 
+        b.uploaded_at, 
+        b.uploaded_by_role,
+        b.coverUrl,
+        COALESCE(s.categories, '') AS categories,
+        COALESCE(s.views, 0) AS views
+    FROM 
+        books b
+    LEFT JOIN 
+        book_stats s ON b.book_id = s.book_id
+    WHERE 
+        b.is_public = 1
+        AND b.is_approved = 1
+"""
 
+# Newest first; (uploaded_at, book_id) is the keyset pagination key for book listings.
+# Both are NOT NULL (uploaded_at since migration 0012), so every row can end a page.
+BOOK_PAGE_KEY = ['b.uploaded_at', 'b.book_id']
+BOOK_PAGE_ORDER = " ORDER BY b.uploaded_at DESC, b.book_id DESC"
 
-class BooksModel:
+
+def book_page_key(book):
+    """Keyset cursor values for a book row returned by the listing methods."""
+    return [book['uploaded_at'], book['book_id']]
+
+
+def public_books_query(limit=None, offset=None, after=None):
+    """PUBLIC_BOOKS_QUERY in listing order, with optional keyset or offset paging."""
+    query = PUBLIC_BOOKS_QUERY
+    params = []
+    if after is not None:
+        condition, params = keyset_condition(BOOK_PAGE_KEY, after, descending=True)
+        query += " AND " + condition
+    query += BOOK_PAGE_ORDER
+    if limit is not None:
+        query += " LIMIT %s"
+        params.append(limit)
+        if offset is not None:
+            query += " OFFSET %s"
+            params.append(offset)
+    return query, tuple(params)
+
+
+class BooksModel(BaseModel):
     """
     A comprehensive model for handling all book-related database operations.
     Features connection pooling, proper resource management, and extensive error handling.
+    Every operation checks its own connection out (see BaseModel.get_connection) and
+    returns it before finishing, so the shared instance is safe across threads.
+    The async methods run on AsyncDatabasePool for the ASGI entry point (asgi.py).
+    Writes that change what the catalog endpoints return invalidate the
+    affected cached responses once they commit (see utils/response_cache.py).
     """
-    
-    _connection_pool = None
-    
-    def __init__(self):
-        """
-        Initialize the BooksModel with a connection pool.
-        """
-        if not BooksModel._connection_pool:
-            self._initialize_pool()
-        self.conn = None
-    
-    def init_pool(database_pool: Pool):
-        global pool
-        pool = database_pool
-        logger.info("Database connection pool initialized successfully")
-
-    @classmethod
-    def _initialize_pool(cls):
-        """
-        Initialize the connection pool with custom settings.
-        """
-        try:
-            cls._connection_pool = pooling.MySQLConnectionPool(
-                pool_name="bookaura_pool",
-                pool_size=10,
-                pool_reset_session=True,
-                host="localhost",
-                database="bookauradb",
-                user="root",
-                password="root",
-                autocommit=False,
-                connect_timeout=30
-            )
-            logger.info("Database connection pool initialized successfully")
-        except Exception as e:
-            logger.error(f"Failed to initialize connection pool: {e}")
-            raise
-
-    def get_connection(self):
-        """
-        Get a database connection from the pool with error handling.
-        Ensures no active transactions are present on the connection.
-        """
-        try:
-            if not self.conn or not self.conn.is_connected():
-                self.conn = BooksModel._connection_pool.get_connection()
-                logger.debug("Acquired new database connection from pool")
-            
-            # Roll back any active transactions from previous uses
-            if self.conn.in_transaction:
-                self.conn.rollback()
-                logger.debug("Rolled back lingering transaction")
-                
-            return self.conn
-        except Exception as e:
-            logger.error(f"Failed to get database connection: {e}")
-            raise
-    def close_connection(self):
-        """
-        Safely close the database connection if it exists.
-        """
-        if self.conn and self.conn.is_connected():
-            self.conn.close()
-            self.conn = None
-            logger.debug("Database connection closed")
 
-    def __enter__(self):
-        """Support for context manager protocol"""
-        self.get_connection()
-        return self
-
-    def __exit__(self, exc_type, exc_val, exc_tb):
-        """Support for context manager protocol"""
-        self.close_connection()
+    @staticmethod
+    def _book_category_ids(cur, book_id):
+        """Category IDs of a book, read on a tuple cursor inside the caller's transaction."""
+        cur.execute("SELECT category_id FROM book_category WHERE book_id = %s", (book_id,))
+        return [row[0] for row in cur.fetchall()]
 
     # --------------------------
     # CRUD Operations
@@ -127,6 +119,7 @@ class BooksModel:
                 ))
 
                 book_id = cur.lastrowid
+                valid_ids = []
                 
                 # Initialize views
                 cur.execute(
@@ -150,8 +143,11 @@ class BooksModel:
                             category_values
                         )
 
+                book_stats_model.refresh_books([book_id], conn)
+
                 # Final commit
                 conn.commit()
+                ResponseCache.invalidate(book_change_tags(book_id, valid_ids))
                 logger.info(f"Successfully created book {book_id}")
                 return book_id
 
@@ -165,10 +161,7 @@ class BooksModel:
                     logger.error(f"Rollback failed: {str(rollback_error)}")
             raise RuntimeError("Book creation failed") from e
         finally:
-            try:
-                self.close_connection()
-            except Exception as close_error:
-                logger.error(f"Connection cleanup failed: {str(close_error)}")
+            self.db_pool.close_connection(conn)
             
     def update_book(self, book_id: int, title: str = None, description: str = None, 
                    is_public: bool = None, is_approved: bool = None, 
@@ -191,6 +184,7 @@ class BooksModel:
         try:
             with conn.cursor() as cur:
                 conn.start_transaction()
+                affected_categories = set(self._book_category_ids(cur, book_id))
                 
                 # Build dynamic update query
                 updates = []
@@ -238,8 +232,12 @@ class BooksModel:
                                 "INSERT INTO book_category (book_id, category_id) VALUES (%s, %s)",
                                 category_values
                             )
+                            affected_categories.update(valid_ids)
+
+                    book_stats_model.refresh_books([book_id], conn)
                 
                 conn.commit()
+                ResponseCache.invalidate(book_change_tags(book_id, affected_categories))
                 logger.info(f"Successfully updated book {book_id}")
                 return True
 
@@ -249,112 +247,58 @@ class BooksModel:
             logger.error(f"Failed to update book {book_id}: {e}")
             return False
         finally:
-            if 'cur' in locals():
-                cur.close()
-
-    def delete_book(self, book_id: int) -> bool:
-        """
-        Delete a book and all related records with enhanced transaction safety.
-        """
-        conn = self.get_connection()
-        try:
-            with conn.cursor() as cur:
-                # Start fresh transaction
-                conn.start_transaction()
-                
-                # Disable foreign key checks
-                cur.execute("SET FOREIGN_KEY_CHECKS = 0")
-                
-                # Delete from related tables
-                related_tables = [
-                    'book_category', 'views', 'bookmarks',
-                    'audio_requests', 'reading_history', 'reports'
-                ]
-                
-                for table in related_tables:
-                    try:
-                        cur.execute(
-                            f"DELETE FROM {table} WHERE book_id = %s",
-                            (book_id,)
-                        )
-                        logger.debug(f"Deleted from {table} for book {book_id}")
-                    except Exception as e:
-                        logger.warning(f"Error deleting from {table}: {str(e)}")
-                        continue
-                
-                # Delete main book record
-                cur.execute(
-                    "DELETE FROM books WHERE book_id = %s",
-                    (book_id,)
-                )
-                
-                # Re-enable foreign key checks
-                cur.execute("SET FOREIGN_KEY_CHECKS = 1")
-                
-                # Final commit
-                conn.commit()
-                logger.info(f"Successfully deleted book {book_id}")
-                return True
+            self.db_pool.close_connection(conn)
 
-        except Exception as e:
-            logger.error(f"Failed to delete book {book_id}: {str(e)}")
-            if conn.is_connected():
-                try:
-                    conn.rollback()
-                    # Ensure foreign key checks are re-enabled after rollback
-                    with conn.cursor() as cur:
-                        cur.execute("SET FOREIGN_KEY_CHECKS = 1")
-                    logger.debug("Transaction rolled back and FK checks restored")
-                except Exception as rollback_error:
-                    logger.error(f"Rollback failed: {str(rollback_error)}")
-            return False
-        finally:
-            try:
-                self.close_connection()
-            except Exception as close_error:
-                logger.error(f"Connection cleanup failed: {str(close_error)}")
     # --------------------------
     # Book Fetching Methods
     # --------------------------
 
-    def get_all_books(self,conn=None):
+    @read_only
+    def get_all_books(self, conn=None, limit: int = None, after: list = None):
         """
-        Fetch all books from the database with proper aggregation
+        Fetch books, newest first, with their denormalised stats.
+
+        Args:
+            conn: Connection to use (optional)
+            limit: Maximum number of books to return; all books when None
+            after: Keyset cursor values (uploaded_at, book_id) of the last book already returned
         """
+        close_conn = conn is None
+        if close_conn:
+            conn = self.get_connection()
         try:
-            if not self.conn or not self.conn.is_connected():
-                self.conn = self.get_connection()
-                
-            with self.conn.cursor(dictionary=True) as cur:
-                cur.execute("""
-                    SELECT 
-                        b.book_id, 
-                        b.user_id AS author_id, 
-                        u.username AS author_name, 
-                        b.title, 
-                        b.description, 
-                        b.fileUrl, 
-                        b.audioUrl,
-                        b.is_public, 
-                        b.is_approved, 
-                        b.uploaded_at, 
-                        b.uploaded_by_role,
-                        b.coverUrl,
-                        COALESCE(GROUP_CONCAT(c.category_name SEPARATOR ', '), '') AS categories,
-                        COALESCE(SUM(v.book_view), 0) AS views  -- Changed to SUM aggregation
-                    FROM 
-                        books b
-                    LEFT JOIN 
-                        book_category bc ON b.book_id = bc.book_id
-                    LEFT JOIN 
-                        categories c ON bc.category_id = c.category_id
-                    LEFT JOIN 
-                        users u ON b.user_id = u.user_id
-                    LEFT JOIN 
-                        views v ON b.book_id = v.book_id
-                    GROUP BY 
-                        b.book_id  -- Simplified GROUP BY
-                """)
+            query = """
+                SELECT 
+                    b.book_id, 
+                    b.user_id AS author_id, 
+                    s.author_name, 
+                    b.title, 
+                    b.description, 
+                    b.fileUrl, 
+                    b.audioUrl,
+                    b.is_public, 
+                    b.is_approved, 
+                    b.uploaded_at, 
+                    b.uploaded_by_role,
+                    b.coverUrl,
+                    COALESCE(s.categories, '') AS categories,
+                    COALESCE(s.views, 0) AS views
+                FROM 
+                    books b
+                LEFT JOIN 
+                    book_stats s ON b.book_id = s.book_id
+            """
+            params = []
+            if after is not None:
+                condition, params = keyset_condition(BOOK_PAGE_KEY, after, descending=True)
+                query += " WHERE " + condition
+            query += BOOK_PAGE_ORDER
+            if limit is not None:
+                query += " LIMIT %s"
+                params.append(limit)
+
+            with conn.cursor(dictionary=True) as cur:
+                cur.execute(query, tuple(params))
                 books = cur.fetchall()
                 
                 # Convert datetime objects to strings
@@ -366,119 +310,152 @@ class BooksModel:
         except Exception as e:
             logger.error(f"Failed to fetch all books: {e}")
             return []
-        
-    def get_book_by_id(self, book_id):
-        conn = self.get_connection()  # Get fresh connection
+        finally:
+            if close_conn:
+                self.db_pool.close_connection(conn)
+
+    @read_only
+    def get_book_by_id(self, book_id, conn=None):
+        """
+        Fetch one book with its author, categories and view count.
+
+        Args:
+            book_id: ID of the book
+            conn: Connection to use (optional)
+        """
+        close_conn = conn is None
+        if close_conn:
+            conn = self.get_connection()
         try:
-            with conn.cursor(dictionary=True) as cur:
+            query = """
+                SELECT 
+                    b.book_id, 
+                    ANY_VALUE(b.user_id) AS author_id, 
+                    ANY_VALUE(u.username) AS author_name, 
+                    ANY_VALUE(b.title) AS title, 
+                    ANY_VALUE(b.description) AS description, 
+                    ANY_VALUE(b.fileUrl) AS fileUrl, 
+                    ANY_VALUE(b.audioUrl) AS audioUrl,
+                    ANY_VALUE(b.is_public) AS is_public, 
+                    ANY_VALUE(b.is_approved) AS is_approved, 
+                    ANY_VALUE(b.uploaded_at) AS uploaded_at, 
+                    ANY_VALUE(b.uploaded_by_role) AS uploaded_by_role,
+                    ANY_VALUE(b.coverUrl) AS coverUrl,
+                    COALESCE(GROUP_CONCAT(c.category_name SEPARATOR ', '), '') AS categories,
+                    COALESCE(SUM(v.book_view), 0) AS views
+                FROM books b
+                LEFT JOIN book_category bc ON b.book_id = bc.book_id
+                LEFT JOIN categories c ON bc.category_id = c.category_id
+                LEFT JOIN users u ON b.user_id = u.user_id
+                LEFT JOIN views v ON b.book_id = v.book_id
+                WHERE b.book_id = %s
+                GROUP BY b.book_id
+            """
+            cur = conn.prepared_cursor(query)
+            cur.execute(query, (book_id,))
+            # fetchall drains the result so the cached statement can be re-executed
+            rows = cur.fetchall()
+            return rows[0] if rows else None
+        except Exception as e:
+            logger.error(f"Error fetching book {book_id}: {str(e)}")
+            return None
+        finally:
+            if close_conn:
+                self.db_pool.close_connection(conn)
+    
+    @read_only
+    def get_book_version(self, book_id):
+        """
+        Change stamps of a book for its ETag: one primary key lookup in
+        books and book_stats instead of the get_book_by_id aggregate.
+
+        Returns:
+            Tuple (books.updated_at, book_stats.updated_at), or None if the
+            book does not exist or the lookup failed
+        """
+        try:
+            with self.connection() as conn:
+                cur = conn.cursor()
                 cur.execute("""
-                    SELECT 
-                        b.book_id, 
-                        ANY_VALUE(b.user_id) AS author_id, 
-                        ANY_VALUE(u.username) AS author_name, 
-                        ANY_VALUE(b.title) AS title, 
-                        ANY_VALUE(b.description) AS description, 
-                        ANY_VALUE(b.fileUrl) AS fileUrl, 
-                        ANY_VALUE(b.audioUrl) AS audioUrl,
-                        ANY_VALUE(b.is_public) AS is_public, 
-                        ANY_VALUE(b.is_approved) AS is_approved, 
-                        ANY_VALUE(b.uploaded_at) AS uploaded_at, 
-                        ANY_VALUE(b.uploaded_by_role) AS uploaded_by_role,
-                        ANY_VALUE(b.coverUrl) AS coverUrl,
-                        COALESCE(GROUP_CONCAT(c.category_name SEPARATOR ', '), '') AS categories,
-                        COALESCE(SUM(v.book_view), 0) AS views
+                    SELECT b.updated_at, s.updated_at
                     FROM books b
-                    LEFT JOIN book_category bc ON b.book_id = bc.book_id
-                    LEFT JOIN categories c ON bc.category_id = c.category_id
-                    LEFT JOIN users u ON b.user_id = u.user_id
-                    LEFT JOIN views v ON b.book_id = v.book_id
+                    LEFT JOIN book_stats s ON b.book_id = s.book_id
                     WHERE b.book_id = %s
-                    GROUP BY b.book_id
                 """, (book_id,))
-                return cur.fetchone()
+                row = cur.fetchone()
+                cur.close()
+                return tuple(row) if row else None
         except Exception as e:
-            logger.error(f"Error fetching book {book_id}: {str(e)}")
+            logger.error(f"Error fetching version of book {book_id}: {str(e)}")
             return None
-        finally:
-            self.close_connection()  # Ensure connection cleanup
-    
-    def fetch_public_books(self, limit: int = None, offset: int = None) -> List[Dict]:
+
+    @read_only
+    def get_catalog_version(self):
+        """
+        Change stamp of the whole catalog for the ETag of listings and
+        /books/full/<id>, which also shows related books. Each part is
+        answered from an index (migration 0011), not by reading the books.
+
+        Returns:
+            Tuple (book count, latest books.updated_at, latest
+            book_stats.updated_at), or None if the lookup failed
         """
-        Fetch all public books with pagination support.
+        try:
+            with self.connection() as conn:
+                cur = conn.cursor()
+                cur.execute("""
+                    SELECT
+                        (SELECT COUNT(*) FROM books),
+                        (SELECT MAX(updated_at) FROM books),
+                        (SELECT MAX(updated_at) FROM book_stats)
+                """)
+                row = cur.fetchone()
+                cur.close()
+                return tuple(row)
+        except Exception as e:
+            logger.error(f"Error fetching catalog version: {str(e)}")
+            return None
+
+    @read_only
+    def fetch_public_books(self, limit: int = None, offset: int = None, after: list = None) -> List[Dict]:
+        """
+        Fetch public books, newest first, with pagination support.
         
         Args:
             limit: Maximum number of books to return
             offset: Number of books to skip
+            after: Keyset cursor values (uploaded_at, book_id) of the last book
+                already returned; preferred over offset for deep pages
             
         Returns:
             List of public book dictionaries
         """
         conn = self.get_connection()
         try:
-            with conn.cursor(dictionary=True) as cur:
-                query = """
-                    SELECT 
-                        b.book_id, 
-                        b.user_id AS author_id, 
-                        u.username AS author_name, 
-                        b.title, 
-                        b.description, 
-                        b.fileUrl, 
-                        b.audioUrl,
-                        b.is_public, 
-                        b.is_approved, 
-                        b.uploaded_at, 
-                        b.uploaded_by_role,
-                        b.coverUrl,
-                        COALESCE(GROUP_CONCAT(c.category_name SEPARATOR ', '), '') AS categories,
-                        COALESCE(SUM(v.book_view), 0) AS views
-                    FROM 
-                        books b
-                    LEFT JOIN 
-                        book_category bc ON b.book_id = bc.book_id
-                    LEFT JOIN 
-                        categories c ON bc.category_id = c.category_id
-                    LEFT JOIN 
-                        users u ON b.user_id = u.user_id
-                    LEFT JOIN 
-                        views v ON b.book_id = v.book_id
-                    WHERE 
-                        b.is_public = 1
-                        AND b.is_approved = 1
-                    GROUP BY 
-                        b.book_id
-                """
-                
-                if limit is not None:
-                    query += " LIMIT %s"
-                    if offset is not None:
-                        query += " OFFSET %s"
-                        cur.execute(query, (limit, offset))
-                    else:
-                        cur.execute(query, (limit,))
-                else:
-                    cur.execute(query)
-                
-                books = cur.fetchall()
-                
-                # Convert datetime objects to strings for JSON serialization
-                for book in books:
-                    if 'uploaded_at' in book and book['uploaded_at']:
-                        book['uploaded_at'] = book['uploaded_at'].isoformat()
-                
-                return books
+            query, params = public_books_query(limit, offset, after)
+            
+            cur = conn.prepared_cursor(query)
+            cur.execute(query, params)
+            books = cur.fetchall()
+            
+            # Convert datetime objects to strings for JSON serialization
+            for book in books:
+                if 'uploaded_at' in book and book['uploaded_at']:
+                    book['uploaded_at'] = book['uploaded_at'].isoformat()
+            
+            return books
 
         except Exception as e:
             logger.error(f"Failed to fetch public books: {e}")
             return []
         finally:
-            if 'cur' in locals():
-                cur.close()
+            self.db_pool.close_connection(conn)
 
     # --------------------------
     # Search and Filter Methods
     # --------------------------
 
+    @read_only
     def search_books(self, query: str, limit: int = 20) -> List[Dict]:
         """
         Search books by title with fuzzy matching.
@@ -492,61 +469,53 @@ class BooksModel:
         """
         conn = self.get_connection()
         try:
-            with conn.cursor(dictionary=True) as cur:
-                search_query = """
-                    SELECT 
-                        b.book_id, 
-                        b.user_id AS author_id, 
-                        u.username AS author_name, 
-                        b.title, 
-                        b.description, 
-                        b.fileUrl, 
-                        b.audioUrl,
-                        b.is_public, 
-                        b.is_approved, 
-                        b.uploaded_at, 
-                        b.uploaded_by_role,
-                        b.coverUrl,
-                        COALESCE(GROUP_CONCAT(c.category_name SEPARATOR ', '), '') AS categories,
-                        COALESCE(SUM(v.book_view), 0) AS views,
-                        MATCH(b.title) AGAINST(%s IN NATURAL LANGUAGE MODE) AS relevance
-                    FROM 
-                        books b
-                    LEFT JOIN 
-                        book_category bc ON b.book_id = bc.book_id
-                    LEFT JOIN 
-                        categories c ON bc.category_id = c.category_id
-                    LEFT JOIN 
-                        users u ON b.user_id = u.user_id
-                    LEFT JOIN 
-                        views v ON b.book_id = v.book_id
-                    WHERE 
-                        MATCH(b.title) AGAINST(%s IN NATURAL LANGUAGE MODE)
-                        AND b.is_approved = 1
-                    GROUP BY 
-                        b.book_id
-                    ORDER BY 
-                        relevance DESC
-                    LIMIT %s
-                """
-                
-                cur.execute(search_query, (query, query, limit))
-                results = cur.fetchall()
-                
-                # Convert datetime objects to strings
-                for book in results:
-                    if 'uploaded_at' in book and book['uploaded_at']:
-                        book['uploaded_at'] = book['uploaded_at'].isoformat()
-                
-                return results
+            search_query = """
+                SELECT 
+                    b.book_id, 
+                    b.user_id AS author_id, 
+                    s.author_name, 
+                    b.title, 
+                    b.description, 
+                    b.fileUrl, 
+                    b.audioUrl,
+                    b.is_public, 
+                    b.is_approved, 
+                    b.uploaded_at, 
+                    b.uploaded_by_role,
+                    b.coverUrl,
+                    COALESCE(s.categories, '') AS categories,
+                    COALESCE(s.views, 0) AS views,
+                    MATCH(b.title) AGAINST(%s IN NATURAL LANGUAGE MODE) AS relevance
+                FROM 
+                    books b
+                LEFT JOIN 
+                    book_stats s ON b.book_id = s.book_id
+                WHERE 
+                    MATCH(b.title) AGAINST(%s IN NATURAL LANGUAGE MODE)
+                    AND b.is_approved = 1
+                ORDER BY 
+                    relevance DESC
+                LIMIT %s
+            """
+            
+            cur = conn.prepared_cursor(search_query)
+            cur.execute(search_query, (query, query, limit))
+            results = cur.fetchall()
+            
+            # Convert datetime objects to strings
+            for book in results:
+                if 'uploaded_at' in book and book['uploaded_at']:
+                    book['uploaded_at'] = book['uploaded_at'].isoformat()
+            
+            return results
 
         except Exception as e:
             logger.error(f"Failed to search books with query '{query}': {e}")
             return []
         finally:
-            if 'cur' in locals():
-                cur.close()
+            self.db_pool.close_connection(conn)
 
+    @read_only
     def fetch_books_by_category(self, category_id: int, limit: int = 20) -> List[Dict]:
         """
         Fetch books belonging to a specific category.
@@ -560,58 +529,52 @@ class BooksModel:
         """
         conn = self.get_connection()
         try:
-            with conn.cursor(dictionary=True) as cur:
-                query = """
-                    SELECT 
-                        b.book_id, 
-                        b.user_id AS author_id, 
-                        u.username AS author_name, 
-                        b.title, 
-                        b.description, 
-                        b.fileUrl, 
-                        b.audioUrl,
-                        b.is_public, 
-                        b.is_approved, 
-                        b.uploaded_at, 
-                        b.uploaded_by_role,
-                        b.coverUrl,
-                        COALESCE(GROUP_CONCAT(c.category_name SEPARATOR ', '), '') AS categories,
-                        COALESCE(SUM(v.book_view), 0) AS views
-                    FROM 
-                        books b
-                    JOIN 
-                        book_category bc ON b.book_id = bc.book_id
-                    LEFT JOIN 
-                        categories c ON bc.category_id = c.category_id
-                    LEFT JOIN 
-                        users u ON b.user_id = u.user_id
-                    LEFT JOIN 
-                        views v ON b.book_id = v.book_id
-                    WHERE 
-                        bc.category_id = %s
-                        AND b.is_approved = 1
-                    GROUP BY 
-                        b.book_id
-                    LIMIT %s
-                """
-                
-                cur.execute(query, (category_id, limit))
-                books = cur.fetchall()
-                
-                # Convert datetime objects to strings
-                for book in books:
-                    if 'uploaded_at' in book and book['uploaded_at']:
-                        book['uploaded_at'] = book['uploaded_at'].isoformat()
-                
-                return books
+            query = """
+                SELECT 
+                    b.book_id, 
+                    b.user_id AS author_id, 
+                    s.author_name, 
+                    b.title, 
+                    b.description, 
+                    b.fileUrl, 
+                    b.audioUrl,
+                    b.is_public, 
+                    b.is_approved, 
+                    b.uploaded_at, 
+                    b.uploaded_by_role,
+                    b.coverUrl,
+                    COALESCE(s.categories, '') AS categories,
+                    COALESCE(s.views, 0) AS views
+                FROM 
+                    book_category bc
+                JOIN 
+                    books b ON bc.book_id = b.book_id
+                LEFT JOIN 
+                    book_stats s ON b.book_id = s.book_id
+                WHERE 
+                    bc.category_id = %s
+                    AND b.is_approved = 1
+                LIMIT %s
+            """
+            
+            cur = conn.prepared_cursor(query)
+            cur.execute(query, (category_id, limit))
+            books = cur.fetchall()
+            
+            # Convert datetime objects to strings
+            for book in books:
+                if 'uploaded_at' in book and book['uploaded_at']:
+                    book['uploaded_at'] = book['uploaded_at'].isoformat()
+            
+            return books
 
         except Exception as e:
             logger.error(f"Failed to fetch books for category {category_id}: {e}")
             return []
         finally:
-            if 'cur' in locals():
-                cur.close()
+            self.db_pool.close_connection(conn)
 
+    @read_only
     def fetch_books_by_author(self, author_id: int, include_unapproved: bool = False) -> List[Dict]:
         """
         Fetch all books by a specific author.
@@ -625,75 +588,75 @@ class BooksModel:
         """
         conn = self.get_connection()
         try:
-            with conn.cursor(dictionary=True) as cur:
-                query = """
-                    SELECT 
-                        b.book_id, 
-                        b.user_id AS author_id, 
-                        u.username AS author_name, 
-                        b.title, 
-                        b.description, 
-                        b.fileUrl, 
-                        b.audioUrl,
-                        b.is_public, 
-                        b.is_approved, 
-                        b.uploaded_at, 
-                        b.uploaded_by_role,
-                        b.coverUrl,
-                        COALESCE(GROUP_CONCAT(c.category_name SEPARATOR ', '), '') AS categories,
-                        COALESCE(SUM(v.book_view), 0) AS views
-                    FROM 
-                        books b
-                    LEFT JOIN 
-                        book_category bc ON b.book_id = bc.book_id
-                    LEFT JOIN 
-                        categories c ON bc.category_id = c.category_id
-                    LEFT JOIN 
-                        users u ON b.user_id = u.user_id
-                    LEFT JOIN 
-                        views v ON b.book_id = v.book_id
-                    WHERE 
-                        b.user_id = %s
-                """
-                
-                if not include_unapproved:
-                    query += " AND b.is_approved = 1"
-                
-                query += " GROUP BY b.book_id"
-                
-                cur.execute(query, (author_id,))
-                books = cur.fetchall()
-                
-                # Convert datetime objects to strings
-                for book in books:
-                    if 'uploaded_at' in book and book['uploaded_at']:
-                        book['uploaded_at'] = book['uploaded_at'].isoformat()
-                
-                return books
+            query = """
+                SELECT 
+                    b.book_id, 
+                    b.user_id AS author_id, 
+                    u.username AS author_name, 
+                    b.title, 
+                    b.description, 
+                    b.fileUrl, 
+                    b.audioUrl,
+                    b.is_public, 
+                    b.is_approved, 
+                    b.uploaded_at, 
+                    b.uploaded_by_role,
+                    b.coverUrl,
+                    COALESCE(GROUP_CONCAT(c.category_name SEPARATOR ', '), '') AS categories,
+                    COALESCE(SUM(v.book_view), 0) AS views
+                FROM 
+                    books b
+                LEFT JOIN 
+                    book_category bc ON b.book_id = bc.book_id
+                LEFT JOIN 
+                    categories c ON bc.category_id = c.category_id
+                LEFT JOIN 
+                    users u ON b.user_id = u.user_id
+                LEFT JOIN 
+                    views v ON b.book_id = v.book_id
+                WHERE 
+                    b.user_id = %s
+            """
+            
+            if not include_unapproved:
+                query += " AND b.is_approved = 1"
+            
+            query += " GROUP BY b.book_id"
+            
+            cur = conn.prepared_cursor(query)
+            cur.execute(query, (author_id,))
+            books = cur.fetchall()
+            
+            # Convert datetime objects to strings
+            for book in books:
+                if 'uploaded_at' in book and book['uploaded_at']:
+                    book['uploaded_at'] = book['uploaded_at'].isoformat()
+            
+            return books
 
         except Exception as e:
             logger.error(f"Failed to fetch books by author {author_id}: {e}")
             return []
         finally:
-            if 'cur' in locals():
-                cur.close()
+            self.db_pool.close_connection(conn)
 
     # --------------------------
     # Complete Book Fetching
     # --------------------------
 
+    @read_only
     def fetch_complete_book(self, book_id: int) -> Optional[Dict]:
         """
         Fetch a book with all related information excluding progress
         """
         conn = self.get_connection()
         try:
+            # Fetch main book details on the same connection
+            book = self.get_book_by_id(book_id, conn=conn)
+            if not book:
+                return None
+
             with conn.cursor(dictionary=True) as cur:
-                # Fetch main book details
-                book = self.get_book_by_id(book_id)
-                if not book:
-                    return None
-                
                 # Fetch categories for the book
                 cur.execute("""
                     SELECT c.category_name 
@@ -766,8 +729,7 @@ class BooksModel:
             logger.error(f"Failed to fetch complete book {book_id}: {e}")
             return None
         finally:
-            if 'cur' in locals():
-                cur.close()
+            self.db_pool.close_connection(conn)
     # --------------------------
     # Approval Methods
     # --------------------------
@@ -790,15 +752,16 @@ class BooksModel:
                     SET is_approved = 1 
                     WHERE book_id = %s
                 """, (book_id,))
+                category_ids = self._book_category_ids(cur, book_id)
                 conn.commit()
+                ResponseCache.invalidate(book_change_tags(book_id, category_ids))
                 logger.info(f"Approved book {book_id}")
                 return True
         except Exception as e:
             logger.error(f"Failed to approve book {book_id}: {e}")
             return False
         finally:
-            if 'cur' in locals():
-                cur.close()
+            self.db_pool.close_connection(conn)
 
     def reject_book(self, book_id: int) -> bool:
         """
@@ -818,15 +781,16 @@ class BooksModel:
                     SET is_approved = 0 
                     WHERE book_id = %s
                 """, (book_id,))
+                category_ids = self._book_category_ids(cur, book_id)
                 conn.commit()
+                ResponseCache.invalidate(book_change_tags(book_id, category_ids))
                 logger.info(f"Rejected book {book_id}")
                 return True
         except Exception as e:
             logger.error(f"Failed to reject book {book_id}: {e}")
             return False
         finally:
-            if 'cur' in locals():
-                cur.close()
+            self.db_pool.close_connection(conn)
 
     def get_pending_approval_books(self) -> List[Dict]:
         """
@@ -865,13 +829,13 @@ class BooksModel:
             logger.error(f"Failed to fetch pending approval books: {e}")
             return []
         finally:
-            if 'cur' in locals():
-                cur.close()
+            self.db_pool.close_connection(conn)
 
     # --------------------------
     # Statistics and Dashboard Methods
     # --------------------------
 
+    @read_only
     def count_books(self, time_period: str = None) -> int:
         """
         Count total books, optionally filtered by time period.
@@ -904,9 +868,9 @@ class BooksModel:
             logger.error(f"Failed to count books: {e}")
             return 0
         finally:
-            if 'cur' in locals():
-                cur.close()
+            self.db_pool.close_connection(conn)
 
+    @read_only
     def count_flagged_books(self, time_period: str = None) -> int:
         """
         Count total flagged/reported books.
@@ -951,111 +915,149 @@ class BooksModel:
             logger.error(f"Failed to count flagged books: {e}")
             return 0
         finally:
-            if 'cur' in locals():
-                cur.close()
+            self.db_pool.close_connection(conn)
+
+    # --------------------------
+    # Async Methods (ASGI)
+    # --------------------------
 
-    async def get_books_count():
+    async def get_books_count(self) -> int:
+        """Count all books without blocking the event loop."""
         try:
-            async with pool.acquire() as conn:
-                async with conn.transaction():
-                    result = await conn.fetchval("SELECT COUNT(*) FROM books")
-                    return result
+            result = await AsyncDatabasePool.fetch_value("SELECT COUNT(*) AS count FROM books")
+            return result or 0
         except Exception as e:
             logger.error(f"Failed to get books count: {e}")
             return 0
 
-    async def get_books_category_distribution():
+    async def get_books_category_distribution(self) -> List[Dict]:
+        """
+        Number of books in each category.
+
+        Returns:
+            List of dictionaries with category and book_count
+        """
         try:
-            async with pool.acquire() as conn:
-                async with conn.transaction():
-                    query = """
-                        SELECT c.name AS category, COUNT(b.id) AS book_count
-                        FROM books b
-                        JOIN categories c ON b.category_id = c.id
-                        GROUP BY c.name
-                    """
-                    rows = await conn.fetch(query)
-                    return [dict(row) for row in rows]
+            query = """
+                SELECT c.category_name AS category, COUNT(bc.book_id) AS book_count
+                FROM categories c
+                LEFT JOIN book_category bc ON c.category_id = bc.category_id
+                GROUP BY c.category_id, c.category_name
+                ORDER BY book_count DESC
+            """
+            return await AsyncDatabasePool.fetch_all(query)
         except Exception as e:
             logger.error(f"Failed to get category distribution: {e}")
             return []
-    
-    def get_top_books(self, conn, limit):
-        try:
-            with conn.cursor(dictionary=True) as cur:
-                cur.execute("""
-                    SELECT b.book_id, b.title, u.username AS author_name,
-                           SUM(v.book_view) AS views
-                    FROM books b
-                    LEFT JOIN users u ON b.user_id = u.user_id
-                    LEFT JOIN views v ON b.book_id = v.book_id
-                    WHERE b.is_approved = 1
-                    GROUP BY b.book_id
-                    ORDER BY views DESC
-                    LIMIT %s
-                """, (limit,))
-                return cur.fetchall()
-        except Exception as e:
-            logger.error(f"Top books error: {e}")
-            return []
-    async def get_publisher_growth(days=7):
+
+    async def get_publisher_growth(self, days: int = 7) -> List[Dict]:
+        """
+        New publisher registrations per day.
+
+        Args:
+            days: Number of days to look back
+
+        Returns:
+            List of dictionaries with date and count
+        """
         try:
-            async with pool.acquire() as conn:
-                async with conn.transaction():
-                    start_date = datetime.now() - timedelta(days=days)
-                    query = """
-                        SELECT DATE(created_at) AS date, COUNT(*) AS count
-                        FROM users
-                        WHERE role = 'publisher' AND created_at >= $1
-                        GROUP BY date
-                        ORDER BY date
-                    """
-                    rows = await conn.fetch(query, start_date)
-                    return [dict(row) for row in rows]
+            start_date = datetime.now() - timedelta(days=days)
+            query = """
+                SELECT DATE(u.created_at) AS date, COUNT(*) AS count
+                FROM publishers p
+                JOIN users u ON p.user_id = u.user_id
+                WHERE u.created_at >= %s
+                GROUP BY DATE(u.created_at)
+                ORDER BY date
+            """
+            rows = await AsyncDatabasePool.fetch_all(query, (start_date,))
+            for row in rows:
+                row['date'] = row['date'].isoformat()
+            return rows
         except Exception as e:
             logger.error(f"Failed to fetch publisher growth: {e}")
             return []
 
-    async def get_books_chart_data(days=7):
+    async def get_books_chart_data(self, days: int = 7) -> List[Dict]:
+        """
+        Book uploads per day.
+
+        Args:
+            days: Number of days to look back
+
+        Returns:
+            List of dictionaries with date and count
+        """
         try:
-            async with pool.acquire() as conn:
-                async with conn.transaction():
-                    start_date = datetime.now() - timedelta(days=days)
-                    query = """
-                        SELECT DATE(created_at) AS date, COUNT(*) AS count
-                        FROM books
-                        WHERE created_at >= $1
-                        GROUP BY date
-                        ORDER BY date
-                    """
-                    rows = await conn.fetch(query, start_date)
-                    return [dict(row) for row in rows]
+            start_date = datetime.now() - timedelta(days=days)
+            query = """
+                SELECT DATE(uploaded_at) AS date, COUNT(*) AS count
+                FROM books
+                WHERE uploaded_at >= %s
+                GROUP BY DATE(uploaded_at)
+                ORDER BY date
+            """
+            rows = await AsyncDatabasePool.fetch_all(query, (start_date,))
+            for row in rows:
+                row['date'] = row['date'].isoformat()
+            return rows
         except Exception as e:
             logger.error(f"Failed to fetch chart data: {e}")
             return []
 
-    def get_top_books(self, limit: int = 5) -> List[Dict]:
+    async def fetch_public_books_async(self, limit: int = None, offset: int = None,
+                                       after: list = None) -> List[Dict]:
+        """
+        Async counterpart of fetch_public_books.
+
+        Args:
+            limit: Maximum number of books to return
+            offset: Number of books to skip
+            after: Keyset cursor values (uploaded_at, book_id) of the last book already returned
+
+        Returns:
+            List of public book dictionaries
+        """
         try:
+            query, params = public_books_query(limit, offset, after)
+
+            books = await AsyncDatabasePool.fetch_all(query, params)
+            for book in books:
+                if book.get('uploaded_at'):
+                    book['uploaded_at'] = book['uploaded_at'].isoformat()
+                book['views'] = int(book['views'])
+            return books
+        except Exception as e:
+            logger.error(f"Failed to fetch public books: {e}")
+            return []
+
+    @read_only
+    def get_top_books(self, limit: int = 5, conn=None) -> List[Dict]:
+        close_conn = conn is None
+        if close_conn:
             conn = self.get_connection()
+        try:
             with conn.cursor(dictionary=True) as cur:  # Use context manager
                 cur.execute("""
                     SELECT 
                         b.book_id,
                         b.title, 
-                        u.username AS author_name,
+                        s.author_name,
                         b.coverUrl,
-                        COALESCE(v.book_view, 0) AS views
-                    FROM books b
-                    LEFT JOIN users u ON b.user_id = u.user_id
-                    LEFT JOIN views v ON b.book_id = v.book_id
+                        s.views
+                    FROM book_stats s
+                    JOIN books b ON s.book_id = b.book_id
                     WHERE b.is_approved = 1
-                    ORDER BY views DESC
+                    ORDER BY s.views DESC
                     LIMIT %s
                 """, (limit,))
                 return cur.fetchall()
         except Exception as e:
             logger.error(f"Failed to fetch top books: {e}")
             return []
+        finally:
+            if close_conn:
+                self.db_pool.close_connection(conn)
         
         
     def get_category_distribution(self, conn):
@@ -1075,6 +1077,7 @@ class BooksModel:
             logger.error(f"Category distribution error: {e}")
             return []
 
+    @read_only
     def get_upload_trends(self, time_period: str = 'month') -> List[Dict]:
         """
         Get book upload trends over time.
@@ -1112,8 +1115,7 @@ class BooksModel:
             logger.error(f"Failed to fetch upload trends: {e}")
             return []
         finally:
-            if 'cur' in locals():
-                cur.close()
+            self.db_pool.close_connection(conn)
 
     # --------------------------
     # View Tracking Methods
@@ -1121,40 +1123,18 @@ class BooksModel:
 
     def increment_book_views(self, book_id: int) -> bool:
         """
-        Increment the view count for a book.
+        Count a view for a book. Views are batched in memory and written
+        by the shared view counter (see db.view_counter).
         
         Args:
             book_id: ID of the book to increment views for
             
         Returns:
-            True if successful, False otherwise
+            True if the view was recorded
         """
-        conn = self.get_connection()
-        try:
-            with conn.cursor() as cur:
-                # Try to update existing view count
-                cur.execute("""
-                    UPDATE views 
-                    SET book_view = book_view + 1 
-                    WHERE book_id = %s
-                """, (book_id,))
-                
-                # If no rows were updated, insert a new record
-                if cur.rowcount == 0:
-                    cur.execute("""
-                        INSERT INTO views (book_id, book_view) 
-                        VALUES (%s, 1)
-                    """, (book_id,))
-                
-                conn.commit()
-                return True
-        except Exception as e:
-            logger.error(f"Failed to increment views for book {book_id}: {e}")
-            return False
-        finally:
-            if 'cur' in locals():
-                cur.close()
+        return view_counter.increment(book_id)
 
+    @read_only
     def get_book_views(self, book_id: int) -> int:
         """
         Get the current view count for a book.
@@ -1179,8 +1159,7 @@ class BooksModel:
             logger.error(f"Failed to get views for book {book_id}: {e}")
             return 0
         finally:
-            if 'cur' in locals():
-                cur.close()
+            self.db_pool.close_connection(conn)
 
     # --------------------------
     # Utility Methods
@@ -1207,8 +1186,7 @@ class BooksModel:
             logger.error(f"Failed to check if book {book_id} exists: {e}")
             return False
         finally:
-            if 'cur' in locals():
-                cur.close()
+            self.db_pool.close_connection(conn)
 
     def is_book_owner(self, book_id: int, user_id: int) -> bool:
         """
@@ -1233,8 +1211,7 @@ class BooksModel:
             logger.error(f"Failed to check book ownership: {e}")
             return False
         finally:
-            if 'cur' in locals():
-                cur.close()
+            self.db_pool.close_connection(conn)
 
     def get_book_owner(self, book_id: int) -> Optional[int]:
         """
@@ -1258,12 +1235,12 @@ class BooksModel:
             logger.error(f"Failed to get book owner for book {book_id}: {e}")
             return None
         finally:
-            if 'cur' in locals():
-                cur.close()
+            self.db_pool.close_connection(conn)
         
+    @read_only
     def get_books_by_category(self) -> List[Dict]:
+        conn = self.get_connection()
         try:
-            conn = self.get_connection()  # Get the connection without using 'with'
             with conn.cursor(dictionary=True) as cursor:
                 cursor.execute("""
                     SELECT 
@@ -1286,8 +1263,11 @@ class BooksModel:
         except Exception as e:
             logger.error(f"Unexpected error in get_books_by_category: {e}")
             return []
+        finally:
+            self.db_pool.close_connection(conn)
         
         
+    @read_only
     def count_books_by_publisher(self, user_id):
         conn = None
         cursor = None
@@ -1306,57 +1286,58 @@ class BooksModel:
             if cursor:
                 cursor.close()
             if conn:
-                self.close_connection()  
+                self.db_pool.close_connection(conn)
     
-    def fetch_books_by_publisher(self, publisher_id):
+    @read_only
+    def fetch_books_by_publisher(self, publisher_id, limit: int = None, after: list = None):
         """
-        Fetch all books published by a specific publisher.
+        Fetch books published by a specific publisher, newest first.
         
         Args:
             publisher_id: ID of the publisher (user_id)
+            limit: Maximum number of books to return; all of them when None
+            after: Keyset cursor values (uploaded_at, book_id) of the last book already returned
             
         Returns:
             List of books published by the specified publisher
         """
+        conn = self.get_connection()
         try:
-            if not self.conn or not self.conn.is_connected():
-                self.conn = self.get_connection()
-                
-            with self.conn.cursor(dictionary=True) as cur:
-                cur.execute("""
-                    SELECT 
-                        b.book_id, 
-                        b.user_id AS author_id, 
-                        u.username AS author_name, 
-                        b.title, 
-                        b.description, 
-                        b.fileUrl, 
-                        b.audioUrl,
-                        b.is_public, 
-                        b.is_approved, 
-                        b.uploaded_at, 
-                        b.uploaded_by_role,
-                        b.coverUrl,
-                        COALESCE(GROUP_CONCAT(c.category_name SEPARATOR ', '), '') AS categories,
-                        COALESCE(MAX(v.book_view), 0) AS views
-                    FROM 
-                        books b
-                    LEFT JOIN 
-                        book_category bc ON b.book_id = bc.book_id
-                    LEFT JOIN 
-                        categories c ON bc.category_id = c.category_id
-                    LEFT JOIN 
-                        users u ON b.user_id = u.user_id
-                    LEFT JOIN 
-                        views v ON b.book_id = v.book_id
-                    WHERE 
-                        b.user_id = %s
-                    GROUP BY 
-                        b.book_id, b.user_id, u.username, b.title, b.description, 
-                        b.fileUrl, b.audioUrl, b.is_public, b.is_approved, 
-                        b.uploaded_at, b.uploaded_by_role, b.coverUrl
-                """, (publisher_id,))
-                
+            query = """
+                SELECT 
+                    b.book_id, 
+                    b.user_id AS author_id, 
+                    s.author_name, 
+                    b.title, 
+                    b.description, 
+                    b.fileUrl, 
+                    b.audioUrl,
+                    b.is_public, 
+                    b.is_approved, 
+                    b.uploaded_at, 
+                    b.uploaded_by_role,
+                    b.coverUrl,
+                    COALESCE(s.categories, '') AS categories,
+                    COALESCE(s.views, 0) AS views
+                FROM 
+                    books b
+                LEFT JOIN 
+                    book_stats s ON b.book_id = s.book_id
+                WHERE 
+                    b.user_id = %s
+            """
+            params = [publisher_id]
+            if after is not None:
+                condition, after_params = keyset_condition(BOOK_PAGE_KEY, after, descending=True)
+                query += " AND " + condition
+                params.extend(after_params)
+            query += BOOK_PAGE_ORDER
+            if limit is not None:
+                query += " LIMIT %s"
+                params.append(limit)
+
+            with conn.cursor(dictionary=True) as cur:
+                cur.execute(query, tuple(params))
                 books = cur.fetchall()
                 
                 # Convert datetime objects to strings for JSON serialization
@@ -1368,7 +1349,10 @@ class BooksModel:
         except Exception as e:
             logger.error(f"Failed to fetch books for publisher {publisher_id}: {e}")
             return []
+        finally:
+            self.db_pool.close_connection(conn)
 
+    @read_only
     def fetch_books_by_publisher_user_id(self, user_id):
         """
         Fetch all books published by a specific user.
@@ -1379,11 +1363,9 @@ class BooksModel:
         Returns:
             List of books published by the specified user
         """
+        conn = self.get_connection()
         try:
-            if not self.conn or not self.conn.is_connected():
-                self.conn = self.get_db_connection()
-                
-            with self.conn.cursor(dictionary=True) as cur:
+            with conn.cursor(dictionary=True) as cur:
                 cur.execute("""
                     SELECT 
                         b.book_id, 
@@ -1418,7 +1400,7 @@ class BooksModel:
                         b.uploaded_at, b.uploaded_by_role, b.coverUrl
                 """, (user_id,))
             
-            books = cur.fetchall()
+                books = cur.fetchall()
             
             # Convert datetime objects to strings for JSON serialization
             for book in books:
@@ -1429,61 +1411,50 @@ class BooksModel:
         except Exception as e:
             logger.error(f"Failed to fetch books for user {user_id}: {e}")
             return []
+        finally:
+            self.db_pool.close_connection(conn)
 
-    def get_all_books2(self):
+    def stream_all_books(self, batch_size: int = None):
         """
-        Fetch all books from the database with proper aggregation
+        Every book with its book_stats row, in book_id order, for exports.
+
+        Yields:
+            Lists of book dictionaries (see BaseModel.stream_query)
         """
-        try:
-            if not self.conn or not self.conn.is_connected():
-                self.conn = self.get_connection()
-                
-            with self.conn.cursor(dictionary=True) as cur:
-                cur.execute("""
-                    SELECT 
-                        b.book_id, 
-                        b.user_id AS author_id, 
-                        u.username AS author_name, 
-                        b.title, 
-                        b.description, 
-                        b.fileUrl, 
-                        b.audioUrl,
-                        b.is_public, 
-                        b.is_approved, 
-                        b.uploaded_at, 
-                        b.uploaded_by_role,
-                        b.coverUrl,
-                        COALESCE(GROUP_CONCAT(c.category_name SEPARATOR ', '), '') AS categories,
-                        COALESCE(SUM(v.book_view), 0) AS views  -- Changed to SUM aggregation
-                    FROM 
-                        books b
-                    LEFT JOIN 
-                        book_category bc ON b.book_id = bc.book_id
-                    LEFT JOIN 
-                        categories c ON bc.category_id = c.category_id
-                    LEFT JOIN 
-                        users u ON b.user_id = u.user_id
-                    LEFT JOIN 
-                        views v ON b.book_id = v.book_id
-                    GROUP BY 
-                        b.book_id  -- Simplified GROUP BY
-                """)
-                books = cur.fetchall()
-                
-                # Convert datetime objects to strings
-                for book in books:
-                    if book.get('uploaded_at'):
-                        book['uploaded_at'] = book['uploaded_at'].isoformat()
-                
-                return books
-        except Exception as e:
-            logger.error(f"Failed to fetch all books: {e}")
-            return []
-    
+        return self.stream_query("""
+            SELECT 
+                b.book_id, 
+                b.user_id AS author_id, 
+                s.author_name, 
+                b.title, 
+                b.description, 
+                b.fileUrl, 
+                b.audioUrl,
+                b.is_public, 
+                b.is_approved, 
+                b.uploaded_at, 
+                b.uploaded_by_role,
+                b.coverUrl,
+                COALESCE(s.categories, '') AS categories,
+                COALESCE(s.views, 0) AS views,
+                COALESCE(s.readers, 0) AS readers,
+                COALESCE(s.bookmarks, 0) AS bookmarks
+            FROM 
+                books b
+            LEFT JOIN 
+                book_stats s ON b.book_id = s.book_id
+            ORDER BY b.book_id
+        """, batch_size=batch_size)
+
+    @read_only
+    def get_all_books2(self, limit: int = None, after: list = None):
+        """Same listing as get_all_books."""
+        return self.get_all_books(limit=limit, after=after)
     
+    @read_only
     def get_books_by_category2(self) -> List[Dict]:
+        conn = self.get_connection()
         try:
-            conn = self.get_connection()  # Get the connection without using 'with'
             with conn.cursor(dictionary=True) as cursor:
                 cursor.execute("""
                     SELECT 
@@ -1506,29 +1477,33 @@ class BooksModel:
         except Exception as e:
             logger.error(f"Unexpected error in get_books_by_category: {e}")
             return []
+        finally:
+            self.db_pool.close_connection(conn)
     
+    @read_only
     def get_top_books2(self, limit: int = 5) -> List[Dict]:
+        conn = self.get_connection()
         try:
-            conn = self.get_connection()
             with conn.cursor(dictionary=True) as cur:  # Use context manager
                 cur.execute("""
                     SELECT 
                         b.book_id,
                         b.title, 
-                        u.username AS author_name,
+                        s.author_name,
                         b.coverUrl,
-                        COALESCE(v.book_view, 0) AS views
-                    FROM books b
-                    LEFT JOIN users u ON b.user_id = u.user_id
-                    LEFT JOIN views v ON b.book_id = v.book_id
+                        s.views
+                    FROM book_stats s
+                    JOIN books b ON s.book_id = b.book_id
                     WHERE b.is_approved = 1
-                    ORDER BY views DESC
+                    ORDER BY s.views DESC
                     LIMIT %s
                 """, (limit,))
                 return cur.fetchall()
         except Exception as e:
             logger.error(f"Failed to fetch top books: {e}")
             return []
+        finally:
+            self.db_pool.close_connection(conn)
         
     def update_approval_status(self, book_id, is_approved):
         """
@@ -1541,27 +1516,27 @@ class BooksModel:
         Returns:
             Boolean indicating success or failure
         """
+        conn = self.get_connection()
         try:
-            conn = self.get_connection()
             cursor = conn.cursor()
             
             query = "UPDATE books SET is_approved = %s WHERE book_id = %s"
             cursor.execute(query, (is_approved, book_id))
+            affected_rows = cursor.rowcount
+            category_ids = self._book_category_ids(cursor, book_id)
             
             conn.commit()
-            affected_rows = cursor.rowcount
+            ResponseCache.invalidate(book_change_tags(book_id, category_ids))
             
             cursor.close()
-            # Use close_connection method instead of db_pool.close_connection
-            self.close_connection()
             
-            # Use logging module instead of self.logger
-            import logging
             logging.info(f"Book {book_id} approval status updated to {is_approved}")
             return affected_rows > 0
         except Exception as e:
             logging.error(f"Error updating book approval status: {e}")
             return False
+        finally:
+            self.db_pool.close_connection(conn)
         
     def delete_book(self, book_id):
         """
@@ -1580,6 +1555,7 @@ class BooksModel:
             
             # Start a transaction
             conn.start_transaction()
+            category_ids = self._book_category_ids(cursor, book_id)
             
             # First delete from book_category table to maintain referential integrity
             cursor.execute("DELETE FROM book_category WHERE book_id = %s", (book_id,))
@@ -1596,9 +1572,11 @@ class BooksModel:
             # Finally delete the book
             cursor.execute("DELETE FROM books WHERE book_id = %s", (book_id,))
             
+            affected_rows = cursor.rowcount
+            
             # Commit the transaction
             conn.commit()
-            affected_rows = cursor.rowcount
+            ResponseCache.invalidate(book_change_tags(book_id, category_ids))
             
             cursor.close()
             
@@ -1610,23 +1588,6 @@ class BooksModel:
                 conn.rollback()
             return False
         finally:
-            # Always close the connection in the finally block
+            # Always return the connection in the finally block
             if conn:
-                self.close_connection()
-
-
-    def close_all_connections(self):
-        """
-        Close all database connections to ensure clean state.
-        Call this after operations that need immediate reflection.
-        """
-        try:
-            # Get the connection pool from the base model
-            if hasattr(self, 'db_pool') and self.db_pool:
-                # Close any active connections in the pool
-                self.db_pool.close_all_connections()
-                logging.info("All database connections closed")
-            return True
-        except Exception as e:
-            logging.error(f"Error closing all connections: {e}")
-            
\ No newline at end of file
+                self.db_pool.close_connection(conn)
@@ -0,0 +1,192 @@
+import logging
+from models.base_model import BaseModel
+from db.config import get_job_queue_config
+
+logger = logging.getLogger(__name__)
+
+JOB_COLUMNS = """
+    job_id, book_id, pdf_path, status, attempts, max_attempts, run_after,
+    last_error, created_at, updated_at, finished_at
+"""
+
+
+class ProcessingJobsModel(BaseModel):
+    """
+    book_processing_jobs (migration 0007): the durable queue drained by
+    scripts/run_book_workers.py.
+
+    A job moves queued -> running -> succeeded, or back to queued with a
+    later run_after when an attempt fails, until max_attempts have been
+    used and it is marked failed.
+
+    A running job belongs to the worker named in locked_by, which keeps
+    heartbeat_at fresh (migration 0010). Outcomes are only recorded for
+    the worker that holds the job, so a run that was requeued as stale
+    cannot overwrite the result of the run that replaced it.
+    """
+
+    def enqueue(self, book_id, pdf_path, max_attempts=None):
+        """
+        Queue a PDF for translation and audio generation.
+
+        Returns:
+            The new job_id, or None if it could not be queued
+        """
+        max_attempts = max_attempts or get_job_queue_config()['max_attempts']
+        try:
+            with self.connection() as conn:
+                with conn.cursor() as cur:
+                    cur.execute(
+                        "INSERT INTO book_processing_jobs (book_id, pdf_path, max_attempts) VALUES (%s, %s, %s)",
+                        (book_id, pdf_path, max_attempts),
+                    )
+                    job_id = cur.lastrowid
+                conn.commit()
+            logger.info(f"Queued processing job {job_id} for book {book_id}")
+            return job_id
+        except Exception as e:
+            logger.error(f"Failed to queue processing job for book {book_id}: {e}")
+            return None
+
+    def claim(self, worker_id):
+        """
+        Take the oldest due job and mark it running for this worker.
+        SKIP LOCKED lets concurrent workers claim different jobs without
+        waiting on each other.
+
+        Returns:
+            The job as a dictionary (attempts already counts this run), or None
+        """
+        conn = self.db_pool.get_connection()
+        try:
+            with conn.cursor(dictionary=True) as cur:
+                cur.execute(f"""
+                    SELECT {JOB_COLUMNS}
+                    FROM book_processing_jobs
+                    WHERE status = 'queued' AND run_after <= NOW()
+                    ORDER BY run_after, job_id
+                    LIMIT 1
+                    FOR UPDATE SKIP LOCKED
+                """)
+                job = cur.fetchone()
+                if job is None:
+                    conn.rollback()
+                    return None
+                cur.execute("""
+                    UPDATE book_processing_jobs
+                    SET status = 'running', attempts = attempts + 1, locked_by = %s, locked_at = NOW(),
+                        heartbeat_at = NOW(6)
+                    WHERE job_id = %s
+                """, (worker_id, job['job_id']))
+            conn.commit()
+            job['status'] = 'running'
+            job['attempts'] += 1
+            return job
+        except Exception:
+            conn.rollback()
+            raise
+        finally:
+            self.db_pool.close_connection(conn)
+
+    def heartbeat(self, job_id, worker_id):
+        """
+        Mark a running job as still alive.
+
+        Returns:
+            False if the worker no longer holds the job
+        """
+        return self._finish(job_id, """
+            UPDATE book_processing_jobs SET heartbeat_at = NOW(6)
+            WHERE job_id = %s AND status = 'running' AND locked_by = %s
+        """, (job_id, worker_id))
+
+    def complete(self, job_id, worker_id):
+        """
+        Mark a running job as succeeded.
+
+        Returns:
+            False if the worker no longer holds the job and nothing was recorded
+        """
+        return self._finish(job_id, """
+            UPDATE book_processing_jobs
+            SET status = 'succeeded', locked_by = NULL, locked_at = NULL, heartbeat_at = NULL,
+                last_error = NULL, finished_at = NOW()
+            WHERE job_id = %s AND status = 'running' AND locked_by = %s
+        """, (job_id, worker_id))
+
+    def fail(self, job_id, worker_id, error, retry_delay):
+        """
+        Record a failed attempt: requeue the job retry_delay seconds from
+        now, or mark it failed once it has used all its attempts.
+
+        Returns:
+            False if the worker no longer holds the job and nothing was recorded
+        """
+        error = str(error)[:65535]
+        return self._finish(job_id, """
+            UPDATE book_processing_jobs
+            SET status = IF(attempts < max_attempts, 'queued', 'failed'),
+                run_after = IF(attempts < max_attempts, NOW() + INTERVAL %s SECOND, run_after),
+                finished_at = IF(attempts < max_attempts, NULL, NOW()),
+                locked_by = NULL, locked_at = NULL, heartbeat_at = NULL, last_error = %s
+            WHERE job_id = %s AND status = 'running' AND locked_by = %s
+        """, (int(retry_delay), error, job_id, worker_id))
+
+    def _finish(self, job_id, query, params):
+        """Run an update of one job; True if it matched the row."""
+        conn = self.db_pool.get_connection()
+        try:
+            with conn.cursor() as cur:
+                cur.execute(query, params)
+                updated = cur.rowcount > 0
+            conn.commit()
+            return updated
+        except Exception as e:
+            logger.error(f"Failed to update processing job {job_id}: {e}")
+            conn.rollback()
+            raise
+        finally:
+            self.db_pool.close_connection(conn)
+
+    def requeue_stale(self, timeout):
+        """
+        Put running jobs whose last heartbeat is more than timeout seconds
+        old back in the queue; their worker died or was killed mid-run. The
+        interrupted run still counts as an attempt.
+
+        Returns:
+            Number of jobs requeued
+        """
+        conn = self.db_pool.get_connection()
+        try:
+            with conn.cursor() as cur:
+                cur.execute("""
+                    UPDATE book_processing_jobs
+                    SET status = IF(attempts < max_attempts, 'queued', 'failed'),
+                        finished_at = IF(attempts < max_attempts, NULL, NOW()),
+                        locked_by = NULL, locked_at = NULL, heartbeat_at = NULL,
+                        last_error = 'Worker stopped before finishing the job'
+                    WHERE status = 'running'
+                      AND COALESCE(heartbeat_at, locked_at) < NOW(6) - INTERVAL %s SECOND
+                """, (int(timeout),))
+                requeued = cur.rowcount
+            conn.commit()
+            return requeued
+        finally:
+            self.db_pool.close_connection(conn)
+
+    def get_job(self, job_id):
+        """A job's status, attempts and last error, or None."""
+        return self.execute_query_single(
+            f"SELECT {JOB_COLUMNS} FROM book_processing_jobs WHERE job_id = %s", (job_id,)
+        )
+
+    def get_jobs_for_book(self, book_id):
+        """Every job queued for a book, newest first."""
+        return self.execute_query(
+            f"SELECT {JOB_COLUMNS} FROM book_processing_jobs WHERE book_id = %s ORDER BY job_id DESC", (book_id,)
+        )
+
+
+# Global instance that can be imported
+processing_jobs_model = ProcessingJobsModel()
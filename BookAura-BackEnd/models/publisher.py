@@ -1,48 +1,35 @@
-import mysql.connector
-from mysql.connector import pooling
 import logging
-from datetime import datetime, timedelta
-import os
-from dotenv import load_dotenv
+from datetime import date
+from models.base_model import BaseModel
+from models.time_series import time_series_model
+from utils.pagination import keyset_condition
 
 # Configure logging
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
-# Load environment variables
-load_dotenv()
-
-class PublishersModel:
-    def __init__(self):
-        try:
-            # Initialize connection pool
-            self.cnxpool = mysql.connector.pooling.MySQLConnectionPool(
-                pool_name="publisher_pool",
-                pool_size=32,
-                host="localhost",
-                user="root",
-                password="root",
-                database="bookauradb"
-            )
-            logger.info("Publisher connection pool initialized")
-        except Exception as e:
-            logger.error(f"Error initializing connection pool: {e}")
-            raise
-
-    def get_connection(self):
-        """Get a connection from the pool"""
-        return self.cnxpool.get_connection()
-
-    def fetch_all_publishers(self, conn=None):
-        """Fetch all publishers with proper connection handling"""
+class PublishersModel(BaseModel):
+    def fetch_all_publishers(self, conn=None, limit=None, after=None):
+        """Fetch publishers in publisher_id order; after is the keyset cursor [publisher_id]"""
         close_conn = False
+        cursor = None
         try:
             if conn is None:
                 conn = self.get_connection()
                 close_conn = True
                 
+            query = "SELECT * FROM publishers"
+            params = []
+            if after is not None:
+                condition, params = keyset_condition(['publisher_id'], after)
+                query += " WHERE " + condition
+            query += " ORDER BY publisher_id"
+            if limit is not None:
+                query += " LIMIT %s"
+                params.append(limit)
+
             cursor = conn.cursor()
-            cursor.execute("SELECT * FROM publishers")
+            cursor.execute(query, tuple(params))
             result = cursor.fetchall()
             return result
         except Exception as e:
@@ -51,9 +38,25 @@ class PublishersModel:
         finally:
             if cursor:
                 cursor.close()
-            if close_conn and conn and conn.is_connected():
+            if close_conn and conn:
                 conn.close()
 
+    def stream_all_publishers(self, batch_size=None):
+        """Every publisher with its user's name and email, in publisher_id order, for exports"""
+        return self.stream_query("""
+            SELECT
+                p.publisher_id,
+                p.user_id,
+                u.username,
+                u.email,
+                p.is_flagged,
+                p.is_approved,
+                u.created_at
+            FROM publishers p
+            JOIN users u ON p.user_id = u.user_id
+            ORDER BY p.publisher_id
+        """, batch_size=batch_size)
+
     def fetch_publisher_by_id(self, publisher_id, conn=None):
         """Fetch a publisher by ID"""
         close_conn = False
@@ -72,7 +75,7 @@ class PublishersModel:
         finally:
             if cursor:
                 cursor.close()
-            if close_conn and conn and conn.is_connected():
+            if close_conn and conn:
                 conn.close()
 
     def fetch_publisher_by_user_id(self, user_id, conn=None):
@@ -93,7 +96,7 @@ class PublishersModel:
         finally:
             if cursor:
                 cursor.close()
-            if close_conn and conn and conn.is_connected():
+            if close_conn and conn:
                 conn.close()
 
     def create_publisher(self, user_id, conn=None):
@@ -119,7 +122,7 @@ class PublishersModel:
         finally:
             if cursor:
                 cursor.close()
-            if close_conn and conn and conn.is_connected():
+            if close_conn and conn:
                 conn.close()
 
     def delete_publisher(self, publisher_id, conn=None):
@@ -142,7 +145,7 @@ class PublishersModel:
         finally:
             if cursor:
                 cursor.close()
-            if close_conn and conn and conn.is_connected():
+            if close_conn and conn:
                 conn.close()
 
     def approve_publisher(self, publisher_id, conn=None):
@@ -168,7 +171,7 @@ class PublishersModel:
         finally:
             if cursor:
                 cursor.close()
-            if close_conn and conn and conn.is_connected():
+            if close_conn and conn:
                 conn.close()
 
     def reject_publisher(self, publisher_id, feedback, conn=None):
@@ -194,7 +197,7 @@ class PublishersModel:
         finally:
             if cursor:
                 cursor.close()
-            if close_conn and conn and conn.is_connected():
+            if close_conn and conn:
                 conn.close()
 
     def flag_publisher(self, publisher_id, reason, conn=None):
@@ -220,7 +223,7 @@ class PublishersModel:
         finally:
             if cursor:
                 cursor.close()
-            if close_conn and conn and conn.is_connected():
+            if close_conn and conn:
                 conn.close()
 
     def unflag_publisher(self, publisher_id, conn=None):
@@ -246,86 +249,26 @@ class PublishersModel:
         finally:
             if cursor:
                 cursor.close()
-            if close_conn and conn and conn.is_connected():
+            if close_conn and conn:
                 conn.close()
 
     def count_publishers_by_month(self, month, year, conn=None):
         """Count publishers created in a specific month and year"""
-        close_conn = False
         try:
-            if conn is None:
-                conn = self.get_connection()
-                close_conn = True
-                
-            cursor = conn.cursor()
-            
-            # Use created_at instead of registration_date
-            cursor.execute(
-                "SELECT COUNT(*) FROM publishers JOIN users ON publishers.user_id = users.user_id "
-                "WHERE MONTH(users.created_at) = %s AND YEAR(users.created_at) = %s",
-                (month, year)
-            )
-            
-            result = cursor.fetchone()
-            return result[0] if result else 0
+            series = time_series_model.series('publishers', 'month', 1, end=date(year, month, 1), conn=conn)
+            return series[0][1]
         except Exception as e:
             logger.error(f"Error counting publishers by month: {e}")
             return 0
-        finally:
-            if cursor:
-                cursor.close()
-            if close_conn and conn and conn.is_connected():
-                conn.close()
 
-    def get_growth_data(self, conn=None):
-        """Get publisher growth data for the last 6 months"""
-        close_conn = False
-        cursor = None
+    def get_growth_data(self, conn=None, months=6):
+        """Publishers registered per calendar month, oldest month first"""
         try:
-            if conn is None:
-                conn = self.get_connection()
-                close_conn = True
-            
-            cursor = conn.cursor()
-        
-            growth_data = []
-            today = datetime.now()
-        
-            for i in range(5, -1, -1):
-                month_start = today.replace(day=1) - timedelta(days=30*i)
-                month_name = month_start.strftime("%b")  # Short month name
-            
-                # Use created_at instead of registration_date
-                try:
-                    cursor.execute(
-                        "SELECT COUNT(*) FROM publishers JOIN users ON publishers.user_id = users.user_id "
-                        "WHERE MONTH(users.created_at) = %s AND YEAR(users.created_at) = %s",
-                        (month_start.month, month_start.year)
-                    )
-                
-                    result = cursor.fetchone()
-                    publishers_count = result[0] if result else 0
-                
-                    growth_data.append({
-                        "name": month_name,
-                        "publishers": publishers_count
-                    })
-                except Exception as e:
-                    logger.error(f"Growth data error: {e}")
-                    growth_data.append({
-                        "name": month_name,
-                        "publishers": 0
-                    })
-        
-            return growth_data
+            series = time_series_model.series('publishers', 'month', months, conn=conn)
+            return [{"name": month.strftime("%b"), "publishers": count} for month, count in series]
         except Exception as e:
             logger.error(f"Error getting growth data: {e}")
             return []
-        finally:
-            if cursor:
-                cursor.close()
-            if close_conn and conn and conn.is_connected():
-                conn.close()
 
     def get_top_publishers(self, limit=5, conn=None):
         """Get top publishers by number of books and views"""
@@ -363,44 +306,13 @@ class PublishersModel:
         finally:
             if cursor:
                 cursor.close()
-            if close_conn and conn and conn.is_connected():
+            if close_conn and conn:
                 conn.close()
 
     def get_monthly_growth(self, conn=None):
         """Calculate month-over-month growth percentage for publishers"""
-        close_conn = False
         try:
-            if conn is None:
-                conn = self.get_connection()
-                close_conn = True
-                
-            cursor = conn.cursor()
-            
-            today = datetime.now()
-            current_month = today.month
-            current_year = today.year
-            
-            # Get previous month
-            prev_month = current_month - 1
-            prev_year = current_year
-            if prev_month == 0:
-                prev_month = 12
-                prev_year -= 1
-            
-            # Use created_at instead of registration_date
-            cursor.execute(
-                "SELECT COUNT(*) FROM publishers JOIN users ON publishers.user_id = users.user_id "
-                "WHERE MONTH(users.created_at) = %s AND YEAR(users.created_at) = %s",
-                (current_month, current_year)
-            )
-            current_count = cursor.fetchone()[0]
-            
-            cursor.execute(
-                "SELECT COUNT(*) FROM publishers JOIN users ON publishers.user_id = users.user_id "
-                "WHERE MONTH(users.created_at) = %s AND YEAR(users.created_at) = %s",
-                (prev_month, prev_year)
-            )
-            prev_count = cursor.fetchone()[0]
+            (_, prev_count), (_, current_count) = time_series_model.series('publishers', 'month', 2, conn=conn)
             
             if prev_count == 0:
                 return 100  # If no publishers last month, growth is 100%
@@ -410,11 +322,6 @@ class PublishersModel:
         except Exception as e:
             logger.error(f"Error calculating monthly growth: {e}")
             return 0
-        finally:
-            if cursor:
-                cursor.close()
-            if close_conn and conn and conn.is_connected():
-                conn.close()
                 
     def count_new_publishers(self, days=30, conn=None):
         """Count new publishers in the last X days"""
@@ -438,25 +345,20 @@ class PublishersModel:
         finally:
             if cursor:
                 cursor.close()
-            if close_conn and conn and conn.is_connected():
+            if close_conn and conn:
                 conn.close()
 
     def fetch_all_publishers2(self):
-        conn = self.get_connection()
-        cur = conn.cursor()
-        cur.execute('SELECT * FROM publishers')
-        publishers = cur.fetchall()
-        cur.close()
-        return publishers
+        with self.connection() as conn:
+            cur = conn.cursor()
+            cur.execute('SELECT * FROM publishers')
+            publishers = cur.fetchall()
+            cur.close()
+            return publishers
 
     def count_publishers_by_month2(self, month, year):
         """Count the number of publishers created in a specific month"""
-        try:
-            import random
-            return random.randint(10, 50)
-        except Exception as e:
-            print(f"Error in count_publishers_by_month: {e}")
-            return 0
+        return self.count_publishers_by_month(month, year)
         
         
     def get_top_publishers2(self, limit=5):
@@ -472,11 +374,11 @@ class PublishersModel:
                 ORDER BY total_views DESC
                 LIMIT %s
             """
-            conn = self.get_connection()
-            cursor = conn.cursor()
-            cursor.execute(query, (limit,))
-            results = cursor.fetchall()
-            cursor.close()
+            with self.connection() as conn:
+                cursor = conn.cursor()
+                cursor.execute(query, (limit,))
+                results = cursor.fetchall()
+                cursor.close()
             
             return [{"name": name, "books": books, "views": views} for name, books, views in results]
         except Exception as e:
@@ -486,11 +388,12 @@ class PublishersModel:
     def is_approved(self,user_id):
         """Check if a publisher is approved"""
         try:
-            conn = self.get_connection()
-            cursor = conn.cursor()
-            cursor.execute("SELECT is_approved FROM publishers WHERE user_id = %s", (user_id,))
-            result = cursor.fetchone()
-            return result[0] if result else False
+            with self.connection() as conn:
+                cursor = conn.cursor()
+                cursor.execute("SELECT is_approved FROM publishers WHERE user_id = %s", (user_id,))
+                result = cursor.fetchone()
+                cursor.close()
+                return result[0] if result else False
         except Exception as e:
             print(f"Error in is_approved: {e}")
             return False
\ No newline at end of file
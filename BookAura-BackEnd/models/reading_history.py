@@ -1,33 +1,14 @@
-import mysql.connector
-from mysql.connector import pooling
 import logging
 from datetime import datetime, timedelta
+from models.base_model import BaseModel
+from models.book_stats import book_stats_model
+from utils.pagination import keyset_condition
 
 # Configure logging
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
-class ReadingHistoryModel:
-    def __init__(self):
-        try:
-            # Initialize connection pool
-            self.conn_pool = mysql.connector.pooling.MySQLConnectionPool(
-                pool_name="reading_history_pool",
-                pool_size=5,
-                host="localhost",
-                database="bookauradb",
-                user="root",
-                password="root"
-            )
-            logger.info("Reading history connection pool initialized")
-        except Exception as e:
-            logger.error(f"Error initializing connection pool: {e}")
-            raise
-    
-    def get_connection(self):
-        """Get a connection from the pool"""
-        return self.conn_pool.get_connection()
-        
+class ReadingHistoryModel(BaseModel):
     def execute_query(self, query, params=None, conn=None):
         """Execute a query and return the results"""
         close_conn = False
@@ -50,18 +31,30 @@ class ReadingHistoryModel:
         finally:
             if cursor:
                 cursor.close()
-            if close_conn and conn and conn.is_connected():
+            if close_conn and conn:
                 conn.close()
         
-    def fetch_all_reading_history(self, conn=None):
+    def fetch_all_reading_history(self, conn=None, limit=None, after=None):
+        """Reading history in history_id order; after is the keyset cursor [history_id]."""
         close_conn = False
+        cursor = None
         try:
             if conn is None:
                 conn = self.get_connection()
                 close_conn = True
                 
+            query = 'SELECT * FROM reading_history'
+            params = []
+            if after is not None:
+                condition, params = keyset_condition(['history_id'], after)
+                query += ' WHERE ' + condition
+            query += ' ORDER BY history_id'
+            if limit is not None:
+                query += ' LIMIT %s'
+                params.append(limit)
+
             cursor = conn.cursor()
-            cursor.execute('SELECT * FROM reading_history')
+            cursor.execute(query, tuple(params))
             reading_history = cursor.fetchall()
             return reading_history
         except Exception as e:
@@ -70,7 +63,7 @@ class ReadingHistoryModel:
         finally:
             if cursor:
                 cursor.close()
-            if close_conn and conn and conn.is_connected():
+            if close_conn and conn:
                 conn.close()
 
     def fetch_reading_history_by_id(self, history_id, conn=None):
@@ -103,7 +96,7 @@ class ReadingHistoryModel:
         finally:
             if cursor:
                 cursor.close()
-            if close_conn and conn and conn.is_connected():
+            if close_conn and conn:
                 conn.close()
     
     def fetch_reading_history_by_user_id(self, user_id, conn=None):
@@ -161,7 +154,7 @@ class ReadingHistoryModel:
         finally:
             if cursor:
                 cursor.close()
-            if close_conn and conn and conn.is_connected():
+            if close_conn and conn:
                 conn.close()
     
     def create_reading_history(self, user_id, book_id, conn=None):
@@ -172,10 +165,16 @@ class ReadingHistoryModel:
                 close_conn = True
                 
             cursor = conn.cursor()
+            cursor.execute(
+                "SELECT 1 FROM reading_history WHERE user_id = %s AND book_id = %s LIMIT 1", (user_id, book_id)
+            )
+            first_read = cursor.fetchone() is None
             cursor.execute("""
                 INSERT INTO reading_history (user_id, book_id) 
                 VALUES (%s, %s)
                 """, (user_id, book_id))
+            if first_read:
+                book_stats_model.adjust(book_id, conn, readers=1)
             conn.commit()
             return True
         except Exception as e:
@@ -186,7 +185,7 @@ class ReadingHistoryModel:
         finally:
             if cursor:
                 cursor.close()
-            if close_conn and conn and conn.is_connected():
+            if close_conn and conn:
                 conn.close()
         
     def fetch_reading_history_by_user_and_book(self, user_id, book_id, conn=None):
@@ -218,7 +217,7 @@ class ReadingHistoryModel:
         finally:
             if cursor:
                 cursor.close()
-            if close_conn and conn and conn.is_connected():
+            if close_conn and conn:
                 conn.close()
 
     def update_last_read(self, user_id, book_id, conn=None):
@@ -244,7 +243,7 @@ class ReadingHistoryModel:
         finally:
             if cursor:
                 cursor.close()
-            if close_conn and conn and conn.is_connected():
+            if close_conn and conn:
                 conn.close()
     
     def count_active_readers(self, days=30, conn=None):
@@ -269,7 +268,7 @@ class ReadingHistoryModel:
         finally:
             if cursor:
                 cursor.close()
-            if close_conn and conn and conn.is_connected():
+            if close_conn and conn:
                 conn.close()
     
     def count_readers_by_publisher(self, publisher_id, conn=None):
@@ -295,7 +294,7 @@ class ReadingHistoryModel:
         finally:
             if cursor:
                 cursor.close()
-            if close_conn and conn and conn.is_connected():
+            if close_conn and conn:
                 conn.close()
     
     def get_recent_readers(self, publisher_id, limit=5, conn=None):
@@ -324,7 +323,7 @@ class ReadingHistoryModel:
         finally:
             if cursor:
                 cursor.close()
-            if close_conn and conn and conn.is_connected():
+            if close_conn and conn:
                 conn.close()
     
     def get_average_read_time(self, days=30, conn=None):
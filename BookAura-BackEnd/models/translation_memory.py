@@ -0,0 +1,195 @@
+import hashlib
+import logging
+import re
+import threading
+
+from models.base_model import BaseModel
+from db.config import get_translation_memory_config
+
+logger = logging.getLogger(__name__)
+
+# Rows per IN (...) lookup, and per eviction pass
+LOOKUP_BATCH = 500
+EVICT_BATCH = 1000
+
+
+def normalise_chunk(text):
+    """Whitespace-insensitive form of a chunk, so reflowed copies share a key."""
+    return re.sub(r'\s+', ' ', text).strip()
+
+
+def chunk_hash(text):
+    """SHA-256 hex digest of the normalised chunk."""
+    return hashlib.sha256(normalise_chunk(text).encode('utf-8')).hexdigest()
+
+
+class TranslationMemoryModel(BaseModel):
+    """
+    translation_memory (migration 0008): ULCA results per chunk, keyed by
+    (model_id, target_lang, chunk_hash) so identical text is only sent to
+    the API once. Cache errors are logged and treated as misses; they
+    never fail the pipeline.
+    """
+
+    def __init__(self, config=None):
+        super().__init__()
+        self._config = config or get_translation_memory_config()
+        self._lock = threading.Lock()
+        self._stats = {'hits': 0, 'misses': 0, 'stored': 0, 'evicted': 0}
+        self._writes_since_check = 0
+
+    @property
+    def enabled(self):
+        return self._config['enabled']
+
+    def _count(self, name, amount=1):
+        with self._lock:
+            self._stats[name] += amount
+
+    def get_many(self, model_id, target_lang, hashes):
+        """
+        Cached results for the given chunk hashes, marking them as used.
+
+        Returns:
+            Dictionary of chunk_hash -> content bytes for the hits
+        """
+        wanted = list(dict.fromkeys(hashes))
+        if not self.enabled or not wanted:
+            return {}
+        found = {}
+        conn = None
+        try:
+            conn = self.db_pool.get_connection()
+            with conn.cursor() as cur:
+                for i in range(0, len(wanted), LOOKUP_BATCH):
+                    batch = wanted[i:i + LOOKUP_BATCH]
+                    placeholders = ', '.join(['%s'] * len(batch))
+                    cur.execute(f"""
+                        SELECT chunk_hash, content FROM translation_memory
+                        WHERE model_id = %s AND target_lang = %s AND chunk_hash IN ({placeholders})
+                    """, (model_id, target_lang, *batch))
+                    found.update((row[0], bytes(row[1])) for row in cur.fetchall())
+                    hit_hashes = [h for h in batch if h in found]
+                    if hit_hashes:
+                        cur.execute(f"""
+                            UPDATE translation_memory SET hits = hits + 1, last_used_at = NOW()
+                            WHERE model_id = %s AND target_lang = %s
+                              AND chunk_hash IN ({', '.join(['%s'] * len(hit_hashes))})
+                        """, (model_id, target_lang, *hit_hashes))
+            conn.commit()
+        except Exception as e:
+            logger.error(f"Translation memory lookup failed: {e}")
+            if conn is not None:
+                conn.rollback()
+        finally:
+            if conn is not None:
+                self.db_pool.close_connection(conn)
+
+        self._count('hits', len(found))
+        self._count('misses', len(wanted) - len(found))
+        return found
+
+    def put_many(self, model_id, target_lang, results):
+        """
+        Store results for chunk hashes, replacing any existing entries.
+
+        Args:
+            results: Dictionary of chunk_hash -> content bytes
+        """
+        if not self.enabled or not results:
+            return
+        conn = None
+        try:
+            conn = self.db_pool.get_connection()
+            with conn.cursor() as cur:
+                # One row per statement: audio chunks can be several MB each
+                for digest, content in results.items():
+                    cur.execute("""
+                        INSERT INTO translation_memory (model_id, target_lang, chunk_hash, content, content_bytes)
+                        VALUES (%s, %s, %s, %s, %s)
+                        ON DUPLICATE KEY UPDATE content = VALUES(content), content_bytes = VALUES(content_bytes),
+                                                last_used_at = NOW()
+                    """, (model_id, target_lang, digest, content, len(content)))
+            conn.commit()
+        except Exception as e:
+            logger.error(f"Translation memory write failed: {e}")
+            if conn is not None:
+                conn.rollback()
+            return
+        finally:
+            if conn is not None:
+                self.db_pool.close_connection(conn)
+
+        self._count('stored', len(results))
+        with self._lock:
+            self._writes_since_check += len(results)
+            check = self._writes_since_check >= self._config['evict_every']
+            if check:
+                self._writes_since_check = 0
+        if check:
+            self.evict()
+
+    def evict(self, max_bytes=None):
+        """
+        Delete least recently used rows until the cached content is below
+        90% of max_bytes (default TRANSLATION_MEMORY_MAX_MB).
+
+        Returns:
+            Number of rows deleted
+        """
+        max_bytes = max_bytes or self._config['max_bytes']
+        deleted = 0
+        conn = None
+        try:
+            conn = self.db_pool.get_connection()
+            with conn.cursor() as cur:
+                cur.execute("SELECT COALESCE(SUM(content_bytes), 0) FROM translation_memory")
+                total = int(cur.fetchone()[0])
+                if total <= max_bytes:
+                    conn.commit()
+                    return 0
+                to_free = total - int(max_bytes * 0.9)
+                while to_free > 0:
+                    cur.execute("""
+                        SELECT model_id, target_lang, chunk_hash, content_bytes FROM translation_memory
+                        ORDER BY last_used_at LIMIT %s
+                    """, (EVICT_BATCH,))
+                    rows = cur.fetchall()
+                    if not rows:
+                        break
+                    victims = []
+                    for model_id, target_lang, digest, size in rows:
+                        victims.append((model_id, target_lang, digest))
+                        to_free -= size
+                        if to_free <= 0:
+                            break
+                    placeholders = ', '.join(['(%s, %s, %s)'] * len(victims))
+                    cur.execute(
+                        f"DELETE FROM translation_memory WHERE (model_id, target_lang, chunk_hash) IN ({placeholders})",
+                        tuple(value for key in victims for value in key),
+                    )
+                    deleted += cur.rowcount
+                    conn.commit()
+            logger.info(f"Translation memory over {max_bytes // (1024 * 1024)}MB, evicted {deleted} entries")
+        except Exception as e:
+            logger.error(f"Translation memory eviction failed: {e}")
+            if conn is not None:
+                conn.rollback()
+        finally:
+            if conn is not None:
+                self.db_pool.close_connection(conn)
+
+        self._count('evicted', deleted)
+        return deleted
+
+    def stats(self):
+        """Lookup counters for this process, with the hit ratio."""
+        with self._lock:
+            stats = dict(self._stats)
+        lookups = stats['hits'] + stats['misses']
+        stats['hit_ratio'] = round(stats['hits'] / lookups, 3) if lookups else None
+        return stats
+
+
+# Global instance that can be imported
+translation_memory_model = TranslationMemoryModel()
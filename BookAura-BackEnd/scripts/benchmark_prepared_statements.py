@@ -0,0 +1,91 @@
+import argparse
+import os
+import statistics
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+# Measure against the primary pool only; replica pools keep their own settings
+os.environ["DB_REPLICA_HOSTS"] = ""
+
+from db.connection_pool import DatabasePool
+from models.books import BooksModel
+
+
+def time_calls(func, iterations):
+    """Run func repeatedly and return per-call latencies in milliseconds."""
+    timings = []
+    for _ in range(iterations):
+        started = time.perf_counter()
+        func()
+        timings.append((time.perf_counter() - started) * 1000)
+    return timings
+
+
+def summarize(timings):
+    timings = sorted(timings)
+    return {
+        'mean': statistics.mean(timings),
+        'p50': timings[len(timings) // 2],
+        'p95': timings[int(len(timings) * 0.95) - 1],
+    }
+
+
+def benchmark_prepared_statements(iterations=500, search_term="book"):
+    """
+    Compare the catalog queries of BooksModel with the per-connection
+    prepared-statement cache disabled (text protocol, parsed on every call)
+    and enabled (parsed once per connection, then only executed).
+    Run against a database with representative data, e.g. after seeding.
+    """
+    books_model = BooksModel()
+
+    sample = books_model.execute_query_single("""
+        SELECT b.book_id, b.user_id, bc.category_id
+        FROM books b
+        LEFT JOIN book_category bc ON b.book_id = bc.book_id
+        WHERE b.is_approved = 1
+        LIMIT 1
+    """)
+    if not sample:
+        print("No approved books found; seed the database first")
+        return False
+
+    cases = [
+        ("fetch_public_books", lambda: books_model.fetch_public_books(limit=20, offset=0)),
+        ("search_books", lambda: books_model.search_books(search_term)),
+        ("fetch_books_by_category", lambda: books_model.fetch_books_by_category(sample['category_id'] or 0)),
+        ("fetch_books_by_author", lambda: books_model.fetch_books_by_author(sample['user_id'])),
+        ("get_book_by_id", lambda: books_model.get_book_by_id(sample['book_id'])),
+    ]
+
+    # The pool reads this setting on every checkout, so it can be toggled in place
+    DatabasePool.get_connection().close()
+    configured_size = DatabasePool._pool_config['statement_cache_size'] or 32
+
+    print(f"{'query':<26}{'mode':<10}{'mean ms':>10}{'p50 ms':>10}{'p95 ms':>10}")
+    for name, func in cases:
+        results = {}
+        for mode, cache_size in (("text", 0), ("prepared", configured_size)):
+            DatabasePool._pool_config['statement_cache_size'] = cache_size
+            func()  # warm up: open the connection and, if enabled, prepare
+            results[mode] = summarize(time_calls(func, iterations))
+            print(f"{name:<26}{mode:<10}"
+                  f"{results[mode]['mean']:>10.3f}{results[mode]['p50']:>10.3f}{results[mode]['p95']:>10.3f}")
+        saved = results['text']['mean'] - results['prepared']['mean']
+        print(f"{'':<26}{'saved':<10}{saved:>10.3f} ms/call "
+              f"({saved / results['text']['mean'] * 100:.1f}%)")
+
+    DatabasePool._pool_config['statement_cache_size'] = configured_size
+    stats = DatabasePool.stats()
+    print(f"Statement cache hits: {stats['statement_cache_hits']}, "
+          f"misses: {stats['statement_cache_misses']}")
+    return True
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark prepared-statement caching for catalog queries")
+    parser.add_argument("--iterations", type=int, default=500)
+    parser.add_argument("--search-term", default="book")
+    args = parser.parse_args()
+    benchmark_prepared_statements(args.iterations, args.search_term)
@@ -0,0 +1,171 @@
+import argparse
+import base64
+import json
+import os
+import random
+import sys
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import requests
+
+from db.config import get_ulca_config
+from services.ulca_client import UlcaClient, DEFAULT_HEADERS
+from utils.http_client import create_session
+
+# A tiny valid-looking WAV payload for tts responses
+FAKE_WAV = base64.b64encode(b'RIFF' + b'\0' * 40).decode()
+
+
+def make_stub_handler(latency, error_rate, connect_latency=0.0, seed=0):
+    """
+    Request handler imitating the ULCA compute endpoint. connect_latency
+    is paid once per new connection, standing in for the TCP and TLS
+    handshake with the real host.
+    """
+    rng = random.Random(seed)
+    lock = threading.Lock()
+
+    class StubHandler(BaseHTTPRequestHandler):
+        # Keep-alive, like the real endpoint
+        protocol_version = 'HTTP/1.1'
+        # Send headers and body in one segment so delayed ACKs don't skew timings
+        disable_nagle_algorithm = True
+        wbufsize = -1
+
+        def setup(self):
+            super().setup()
+            time.sleep(connect_latency)
+
+        def do_POST(self):
+            body = json.loads(self.rfile.read(int(self.headers.get('Content-Length', 0))))
+            time.sleep(latency)
+            with lock:
+                throttled = rng.random() < error_rate
+            if throttled:
+                self._send(429, {'message': 'Too Many Requests'}, {'Retry-After': '0'})
+            elif body.get('task') == 'tts':
+                self._send(200, {'audio': [{'audioContent': FAKE_WAV}]})
+            else:
+                # Echo the source so callers can check ordering
+                self._send(200, {'output': [{'target': body['input'][0]['source']}]})
+
+        def _send(self, status, payload, headers=None):
+            data = json.dumps(payload).encode()
+            self.send_response(status)
+            self.send_header('Content-Type', 'application/json')
+            self.send_header('Content-Length', str(len(data)))
+            for name, value in (headers or {}).items():
+                self.send_header(name, value)
+            self.end_headers()
+            self.wfile.write(data)
+
+        def log_message(self, format, *args):
+            pass
+
+    return StubHandler
+
+
+def payload(i):
+    return {'modelId': 'stub', 'task': 'translation', 'input': [{'source': f'chunk {i}'}], 'userId': None}
+
+
+def legacy_translate(url, chunks, delay):
+    """The previous loop: one request at a time and a fixed sleep after each."""
+    results = []
+    for i in range(chunks):
+        try:
+            response = requests.post(url, json=payload(i), headers=DEFAULT_HEADERS, timeout=60)
+            response.raise_for_status()
+            results.append(response.json()['output'][0]['target'])
+        except Exception:
+            results.append(None)
+        time.sleep(delay)
+    return results
+
+
+def per_request_latency(post, url, count):
+    """Mean and 95th percentile seconds of `count` sequential requests."""
+    timings = []
+    for i in range(count):
+        started = time.perf_counter()
+        post(url, json=payload(i), headers=DEFAULT_HEADERS, timeout=60).json()
+        timings.append(time.perf_counter() - started)
+    timings.sort()
+    return sum(timings) / count, timings[int(0.95 * (count - 1))]
+
+
+def benchmark_connection_reuse(count=30, latency=0.3, connect_latency=0.1):
+    """Per-chunk latency with a new connection per request versus the pooled session."""
+    server = ThreadingHTTPServer(('127.0.0.1', 0), make_stub_handler(latency, 0.0, connect_latency))
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    url = f"http://127.0.0.1:{server.server_address[1]}/compute"
+    print(f"{count} sequential requests, {latency * 1000:.0f}ms stub latency, "
+          f"{connect_latency * 1000:.0f}ms per new connection")
+    try:
+        mean, p95 = per_request_latency(requests.post, url, count)
+        print(f"  bare requests.post: mean {mean * 1000:>7.1f}ms  p95 {p95 * 1000:>7.1f}ms")
+        session = create_session()
+        pooled_mean, pooled_p95 = per_request_latency(session.post, url, count)
+        print(f"  pooled session:     mean {pooled_mean * 1000:>7.1f}ms  p95 {pooled_p95 * 1000:>7.1f}ms  "
+              f"({(mean - pooled_mean) * 1000:.1f}ms saved per chunk)")
+    finally:
+        server.shutdown()
+
+
+def benchmark_ulca_client(chunks=60, latency=0.3, error_rate=0.05, legacy_delay=1.5, rate=None, in_flight=None):
+    """
+    Translate `chunks` chunks against a local stub of the compute endpoint,
+    first with the old sleep loop and then with UlcaClient. The stub
+    answers 429 to about error_rate of requests; the old loop drops those
+    chunks while the client retries them.
+    """
+    server = ThreadingHTTPServer(('127.0.0.1', 0), make_stub_handler(latency, error_rate))
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    url = f"http://127.0.0.1:{server.server_address[1]}/compute"
+
+    config = {**get_ulca_config(), 'url': url, 'backoff_base': 0.2}
+    if rate:
+        config['rate'] = rate
+    if in_flight:
+        config['max_in_flight'] = in_flight
+    expected = [f'chunk {i}' for i in range(chunks)]
+    print(f"{chunks} chunks, {latency * 1000:.0f}ms stub latency, {error_rate:.0%} throttled; "
+          f"client at {config['rate']}/s, burst {config['burst']}, {config['max_in_flight']} in flight")
+
+    try:
+        started = time.perf_counter()
+        results = legacy_translate(url, chunks, legacy_delay)
+        elapsed = time.perf_counter() - started
+        print(f"  serial + {legacy_delay}s sleep: {elapsed:>7.1f}s  "
+              f"({results.count(None)} chunks lost)")
+
+        client = UlcaClient(config)
+        started = time.perf_counter()
+        results = client.map(lambda i: client.compute(payload(i))['output'][0]['target'], range(chunks))
+        elapsed = time.perf_counter() - started
+        stats = client.stats()
+        print(f"  rate-limited client:   {elapsed:>7.1f}s  ({stats['requests']} requests, "
+              f"{stats['retries']} retries, in order: {results == expected})")
+        return results == expected
+    finally:
+        server.shutdown()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark chunk translation against a local ULCA stub")
+    parser.add_argument("--chunks", type=int, default=60)
+    parser.add_argument("--latency", type=float, default=0.3, help="stub response time in seconds")
+    parser.add_argument("--error-rate", type=float, default=0.05, help="fraction of requests answered with 429")
+    parser.add_argument("--legacy-delay", type=float, default=1.5, help="sleep after each request in the old loop")
+    parser.add_argument("--rate", type=float, help="override ULCA_RATE")
+    parser.add_argument("--in-flight", type=int, help="override ULCA_MAX_IN_FLIGHT")
+    parser.add_argument("--connect-latency", type=float, default=0.1,
+                        help="stub delay per new connection in the connection reuse comparison")
+    args = parser.parse_args()
+    benchmark_connection_reuse(latency=args.latency, connect_latency=args.connect_latency)
+    sys.exit(0 if benchmark_ulca_client(args.chunks, args.latency, args.error_rate, args.legacy_delay,
+                                        args.rate, args.in_flight) else 1)
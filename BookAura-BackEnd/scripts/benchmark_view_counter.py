@@ -0,0 +1,82 @@
+import argparse
+import os
+import random
+import sys
+import threading
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from db.connection_pool import DatabasePool
+from db.view_counter import ViewCounter
+from db.config import get_view_counter_config
+
+
+def legacy_increment(book_id):
+    """The previous per-view path: UPDATE, INSERT if missing, COMMIT."""
+    conn = DatabasePool.get_connection()
+    try:
+        with conn.cursor() as cur:
+            cur.execute("UPDATE views SET book_view = book_view + 1 WHERE book_id = %s", (book_id,))
+            if cur.rowcount == 0:
+                cur.execute("INSERT INTO views (book_id, book_view) VALUES (%s, 1)", (book_id,))
+            conn.commit()
+    finally:
+        DatabasePool.close_connection(conn)
+
+
+def run(increment, book_ids, threads, views_per_thread):
+    """Record views from several threads and return the elapsed seconds."""
+    def worker(seed):
+        rng = random.Random(seed)
+        for _ in range(views_per_thread):
+            increment(rng.choice(book_ids))
+
+    workers = [threading.Thread(target=worker, args=(i,)) for i in range(threads)]
+    started = time.perf_counter()
+    for w in workers:
+        w.start()
+    for w in workers:
+        w.join()
+    return time.perf_counter() - started
+
+
+def benchmark_view_counter(threads=16, views_per_thread=500, books=1000):
+    """
+    Compare views/sec of the old synchronous per-view writes with the
+    write-behind counter. Both modes really write to the views table, so
+    run this against a seeded test database.
+    """
+    with DatabasePool.get_connection() as conn:
+        with conn.cursor() as cur:
+            cur.execute("SELECT book_id FROM books LIMIT %s", (books,))
+            book_ids = [row[0] for row in cur.fetchall()]
+    if not book_ids:
+        print("No books found; seed the database first")
+        return False
+
+    total = threads * views_per_thread
+    print(f"{total:,} views from {threads} threads over {len(book_ids)} books")
+
+    elapsed = run(legacy_increment, book_ids, threads, views_per_thread)
+    print(f"  synchronous UPDATE/INSERT: {total / elapsed:>12,.0f} views/s  ({elapsed:.2f}s)")
+
+    counter = ViewCounter(get_view_counter_config())
+    elapsed = run(counter.increment, book_ids, threads, views_per_thread)
+    # Include the final write so the comparison covers getting views into MySQL
+    started = time.perf_counter()
+    counter.shutdown()
+    elapsed += time.perf_counter() - started
+    stats = counter.stats()
+    print(f"  write-behind counter:      {total / elapsed:>12,.0f} views/s  ({elapsed:.2f}s, "
+          f"{stats['flushes']} flushes, {stats['rows_written']:,} rows written)")
+    return True
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark book view recording")
+    parser.add_argument("--threads", type=int, default=16)
+    parser.add_argument("--views-per-thread", type=int, default=500)
+    parser.add_argument("--books", type=int, default=1000)
+    args = parser.parse_args()
+    sys.exit(0 if benchmark_view_counter(args.threads, args.views_per_thread, args.books) else 1)
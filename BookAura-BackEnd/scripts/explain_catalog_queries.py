@@ -0,0 +1,190 @@
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from db.migrate import get_migration_connection
+from models.books import public_books_query
+
+STATS_COLUMNS = """
+    b.book_id, b.user_id AS author_id, s.author_name, b.title,
+    b.description, b.fileUrl, b.audioUrl, b.is_public, b.is_approved,
+    b.uploaded_at, b.uploaded_by_role, b.coverUrl,
+    COALESCE(s.categories, '') AS categories, COALESCE(s.views, 0) AS views
+"""
+
+BOOK_COLUMNS = """
+    b.book_id, b.user_id AS author_id, u.username AS author_name, b.title,
+    b.description, b.fileUrl, b.audioUrl, b.is_public, b.is_approved,
+    b.uploaded_at, b.uploaded_by_role, b.coverUrl,
+    COALESCE(GROUP_CONCAT(c.category_name SEPARATOR ', '), '') AS categories,
+    COALESCE(SUM(v.book_view), 0) AS views
+"""
+
+# A later page of the public listing, continuing from an example cursor
+PUBLIC_BOOKS_PAGE_QUERY, PUBLIC_BOOKS_PAGE_PARAMS = public_books_query(21, after=['2030-01-01 00:00:00', 1])
+
+# (name, query, params, table aliases allowed to be scanned in full)
+CHECKS = [
+    (
+        "BooksModel.fetch_public_books",
+        *public_books_query(21),
+        # Lists every public book; only the joined tables must use indexes
+        {'b'},
+    ),
+    (
+        "BooksModel.fetch_public_books (cursor page)",
+        PUBLIC_BOOKS_PAGE_QUERY,
+        PUBLIC_BOOKS_PAGE_PARAMS,
+        set(),
+    ),
+    (
+        "BooksModel.get_all_books (cursor page)",
+        f"""
+        SELECT {STATS_COLUMNS}
+        FROM books b
+        LEFT JOIN book_stats s ON b.book_id = s.book_id
+        WHERE (b.uploaded_at < %s) OR (b.uploaded_at = %s AND b.book_id < %s)
+        ORDER BY b.uploaded_at DESC, b.book_id DESC
+        LIMIT %s
+        """,
+        ('2030-01-01 00:00:00', '2030-01-01 00:00:00', 1, 21),
+        set(),
+    ),
+    (
+        "BooksModel.fetch_books_by_publisher (cursor page)",
+        f"""
+        SELECT {STATS_COLUMNS}
+        FROM books b
+        LEFT JOIN book_stats s ON b.book_id = s.book_id
+        WHERE b.user_id = %s
+          AND ((b.uploaded_at < %s) OR (b.uploaded_at = %s AND b.book_id < %s))
+        ORDER BY b.uploaded_at DESC, b.book_id DESC
+        LIMIT %s
+        """,
+        (1, '2030-01-01 00:00:00', '2030-01-01 00:00:00', 1, 21),
+        set(),
+    ),
+    (
+        "BooksModel.search_books",
+        f"""
+        SELECT {STATS_COLUMNS}, MATCH(b.title) AGAINST(%s IN NATURAL LANGUAGE MODE) AS relevance
+        FROM books b
+        LEFT JOIN book_stats s ON b.book_id = s.book_id
+        WHERE MATCH(b.title) AGAINST(%s IN NATURAL LANGUAGE MODE) AND b.is_approved = 1
+        ORDER BY relevance DESC
+        LIMIT %s
+        """,
+        ("book", "book", 20),
+        set(),
+    ),
+    (
+        "BooksModel.fetch_books_by_category",
+        f"""
+        SELECT {STATS_COLUMNS}
+        FROM book_category bc
+        JOIN books b ON bc.book_id = b.book_id
+        LEFT JOIN book_stats s ON b.book_id = s.book_id
+        WHERE bc.category_id = %s AND b.is_approved = 1
+        LIMIT %s
+        """,
+        (1, 20),
+        set(),
+    ),
+    (
+        "BooksModel.get_top_books",
+        "SELECT b.book_id, b.title, s.author_name, b.coverUrl, s.views "
+        "FROM book_stats s JOIN books b ON s.book_id = b.book_id "
+        "WHERE b.is_approved = 1 ORDER BY s.views DESC LIMIT %s",
+        (5,),
+        set(),
+    ),
+    (
+        "BooksModel.fetch_books_by_author",
+        f"""
+        SELECT {BOOK_COLUMNS}
+        FROM books b
+        LEFT JOIN book_category bc ON b.book_id = bc.book_id
+        LEFT JOIN categories c ON bc.category_id = c.category_id
+        LEFT JOIN users u ON b.user_id = u.user_id
+        LEFT JOIN views v ON b.book_id = v.book_id
+        WHERE b.user_id = %s AND b.is_approved = 1
+        GROUP BY b.book_id
+        """,
+        (1,),
+        set(),
+    ),
+    (
+        "latest approved books",
+        "SELECT book_id, title FROM books WHERE is_approved = 1 ORDER BY uploaded_at DESC LIMIT %s",
+        (20,),
+        set(),
+    ),
+    (
+        "views by book",
+        "SELECT book_view FROM views WHERE book_id = %s",
+        (1,),
+        set(),
+    ),
+    (
+        "daily views range",
+        "SELECT view_date, SUM(views) FROM book_views_daily WHERE view_date >= CURDATE() - INTERVAL 30 DAY "
+        "GROUP BY view_date",
+        (),
+        set(),
+    ),
+    (
+        "reading history by user",
+        "SELECT book_id, last_read_at FROM reading_history WHERE user_id = %s "
+        "ORDER BY last_read_at DESC LIMIT 20",
+        (1,),
+        set(),
+    ),
+    (
+        "bookmark lookup",
+        "SELECT bookmark_id FROM bookmarks WHERE user_id = %s AND book_id = %s",
+        (1, 1),
+        set(),
+    ),
+]
+
+
+def explain_catalog_queries():
+    """
+    EXPLAIN the hot catalog queries and report any table read with a full
+    scan (type ALL) that should be using an index after the migrations.
+    On a nearly empty database MySQL may still prefer a scan; seed it first.
+
+    Returns:
+        True when no unexpected full scans were found
+    """
+    conn = get_migration_connection()
+    cursor = conn.cursor(dictionary=True)
+    failures = []
+    try:
+        for name, query, params, allowed_scans in CHECKS:
+            cursor.execute("EXPLAIN " + query, params)
+            plan = cursor.fetchall()
+            print(name)
+            for row in plan:
+                scan = row['type'] == 'ALL' and row['table'] not in allowed_scans
+                print(f"    {row['table'] or '-':<12} type={row['type'] or '-':<9} "
+                      f"key={row['key'] or '-':<36} rows={row['rows']}"
+                      f"{'  <-- full scan' if scan else ''}")
+                if scan:
+                    failures.append((name, row['table']))
+    finally:
+        cursor.close()
+        conn.close()
+
+    if failures:
+        print(f"\n{len(failures)} unexpected full scan(s):")
+        for name, table in failures:
+            print(f"    {name}: {table}")
+        return False
+    print("\nNo unexpected full scans")
+    return True
+
+
+if __name__ == "__main__":
+    sys.exit(0 if explain_catalog_queries() else 1)
@@ -0,0 +1,48 @@
+import argparse
+import logging
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from db.migrate import migrate, migration_status
+
+
+def main():
+    """
+    Apply or inspect the versioned schema migrations in db/migrations.
+
+    python scripts/migrate.py            apply all pending migrations
+    python scripts/migrate.py --to 2     apply up to version 2
+    python scripts/migrate.py --status   list applied and pending migrations
+    """
+    parser = argparse.ArgumentParser(description="Run BookAura schema migrations")
+    parser.add_argument("--to", type=int, help="highest version to apply")
+    parser.add_argument("--dry-run", action="store_true", help="list pending migrations without applying them")
+    parser.add_argument("--status", action="store_true", help="show migration status and exit")
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO)
+
+    if args.status:
+        for entry in migration_status():
+            print(f"{entry['version']:04d}  {entry['status']:<8}  {entry['name']}")
+        return True
+
+    try:
+        applied = migrate(target=args.to, dry_run=args.dry_run)
+    except Exception as e:
+        print(f"Migration failed: {e}")
+        return False
+
+    if not applied:
+        print("Database schema is up to date")
+    elif args.dry_run:
+        print(f"{len(applied)} migration(s) pending")
+    else:
+        print(f"Applied {len(applied)} migration(s)")
+    return True
+
+
+if __name__ == "__main__":
+    sys.exit(0 if main() else 1)
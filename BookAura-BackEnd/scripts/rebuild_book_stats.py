@@ -0,0 +1,40 @@
+import argparse
+import logging
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from models.book_stats import book_stats_model
+
+
+def main():
+    """
+    Recompute book_stats from views, book_category, reading_history and
+    bookmarks, for every book or only the ones given. Use it after bulk
+    changes made outside the models, or to repair drift.
+
+    python scripts/rebuild_book_stats.py              every book
+    python scripts/rebuild_book_stats.py --book 7 9   only books 7 and 9
+    """
+    parser = argparse.ArgumentParser(description="Rebuild the denormalised book_stats table")
+    parser.add_argument("--book", type=int, nargs="+", help="only rebuild these book ids")
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO)
+
+    started = time.perf_counter()
+    if args.book:
+        rows = book_stats_model.refresh_books(args.book)
+    else:
+        rows = book_stats_model.rebuild()
+    if rows is None:
+        print("Failed to rebuild book_stats")
+        return False
+    print(f"book_stats rebuilt in {time.perf_counter() - started:.1f}s ({rows} rows affected)")
+    return True
+
+
+if __name__ == "__main__":
+    sys.exit(0 if main() else 1)
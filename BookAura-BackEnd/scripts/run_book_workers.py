@@ -0,0 +1,36 @@
+import argparse
+import logging
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from db.config import get_job_queue_config
+from services.book_jobs import run_workers
+
+
+def main():
+    """
+    Run the pool of worker processes that translate uploaded books and
+    generate their audio. Jobs are queued by POST /books/ and stored in
+    book_processing_jobs, so they survive restarts; stop the pool with
+    Ctrl+C or SIGTERM and the jobs in progress finish first.
+
+    python scripts/run_book_workers.py               BOOK_WORKERS processes
+    python scripts/run_book_workers.py --workers 4   four processes
+    """
+    config = get_job_queue_config()
+    parser = argparse.ArgumentParser(description="Process queued book uploads")
+    parser.add_argument("--workers", type=int, default=config['workers'],
+                        help=f"number of worker processes (default {config['workers']})")
+    args = parser.parse_args()
+    if args.workers < 1:
+        parser.error("--workers must be at least 1")
+
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s supervisor %(levelname)s %(message)s")
+    run_workers(args.workers, config)
+    return True
+
+
+if __name__ == "__main__":
+    sys.exit(0 if main() else 1)
@@ -0,0 +1,381 @@
+import argparse
+import os
+import random
+import sys
+import tempfile
+import time
+from datetime import date, datetime, timedelta
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import mysql.connector
+from werkzeug.security import generate_password_hash
+
+from db.config import get_db_config
+from models.book_stats import REFRESH_BOOK_STATS
+
+PRESETS = {
+    'small': {'users': 10_000, 'books': 10_000, 'views': 100_000, 'reading_history': 200_000, 'bookmarks': 50_000},
+    'medium': {'users': 100_000, 'books': 100_000, 'views': 1_000_000, 'reading_history': 5_000_000, 'bookmarks': 500_000},
+    'large': {'users': 1_000_000, 'books': 1_000_000, 'views': 10_000_000, 'reading_history': 50_000_000, 'bookmarks': 5_000_000},
+}
+
+# Most days a seeded book's views are spread over in book_views_daily
+DAILY_BUCKETS_PER_BOOK = 10
+
+# Share of new users per role; the rest are normal users
+PUBLISHER_SHARE = 0.02
+AUTHOR_SHARE = 0.01
+MODERATOR_SHARE = 0.001
+
+WORDS = (
+    "river shadow empire garden silent winter crown secret ocean letters night forest "
+    "journey broken golden stars city memory fire island storm light kingdom stone "
+    "dream voices clock machine history science politics market love war music road "
+    "mountain daughter stranger house glass paper iron moon desert harbor echo signal"
+).split()
+
+
+class Loader:
+    """
+    Streams generated rows into MySQL, either as multi-row INSERT statements
+    or through LOAD DATA LOCAL INFILE from temporary tab-separated files.
+    """
+
+    def __init__(self, conn, batch_size=5000, load_data=False, chunk_rows=500_000):
+        self.conn = conn
+        self.batch_size = batch_size
+        self.load_data = load_data
+        self.chunk_rows = chunk_rows
+
+    def next_id(self, table, column):
+        """First free value of an integer primary key, so seeding adds to existing data."""
+        cur = self.conn.cursor()
+        cur.execute(f"SELECT COALESCE(MAX({column}), 0) + 1 FROM {table}")
+        value = cur.fetchone()[0]
+        cur.close()
+        return value
+
+    def id_range(self, table, column, count):
+        """Primary key values for count new rows."""
+        first = self.next_id(table, column)
+        return range(first, first + count)
+
+    def load(self, table, columns, rows):
+        """
+        Load an iterable of row tuples into a table.
+
+        Returns:
+            Number of rows loaded
+        """
+        started = time.perf_counter()
+        if self.load_data:
+            count = self._load_data(table, columns, rows)
+        else:
+            count = self._insert(table, columns, rows)
+        elapsed = time.perf_counter() - started
+        rate = count / elapsed if elapsed else 0
+        print(f"  {table:<24}{count:>12,} rows  {elapsed:8.1f}s  {rate:>10,.0f} rows/s")
+        return count
+
+    def _insert(self, table, columns, rows):
+        placeholders = "(" + ", ".join(["%s"] * len(columns)) + ")"
+        prefix = f"INSERT INTO {table} ({', '.join(columns)}) VALUES "
+        cur = self.conn.cursor()
+        count = 0
+        batch = []
+
+        def flush():
+            cur.execute(prefix + ", ".join([placeholders] * len(batch)), [v for row in batch for v in row])
+            self.conn.commit()
+            batch.clear()
+
+        for row in rows:
+            batch.append(row)
+            count += 1
+            if len(batch) >= self.batch_size:
+                flush()
+        if batch:
+            flush()
+        cur.close()
+        return count
+
+    @staticmethod
+    def _tsv_value(value):
+        if value is None:
+            return "\\N"
+        return str(value).replace("\\", "\\\\").replace("\t", "\\t").replace("\n", "\\n")
+
+    def _load_data(self, table, columns, rows):
+        cur = self.conn.cursor()
+        count = 0
+        done = False
+        rows = iter(rows)
+        while not done:
+            with tempfile.NamedTemporaryFile("w", suffix=".tsv", delete=False, encoding="utf-8") as f:
+                path = f.name
+                written = 0
+                for row in rows:
+                    f.write("\t".join(self._tsv_value(v) for v in row) + "\n")
+                    written += 1
+                    if written >= self.chunk_rows:
+                        break
+                else:
+                    done = True
+            try:
+                if written:
+                    cur.execute(
+                        f"LOAD DATA LOCAL INFILE %s INTO TABLE {table} "
+                        "CHARACTER SET utf8mb4 FIELDS TERMINATED BY '\\t' LINES TERMINATED BY '\\n' "
+                        f"({', '.join(columns)})",
+                        (path,)
+                    )
+                    self.conn.commit()
+                    count += written
+            finally:
+                os.remove(path)
+        cur.close()
+        return count
+
+
+def random_title(rng):
+    return " ".join(rng.choice(WORDS).capitalize() for _ in range(rng.randint(2, 5)))
+
+
+def random_timestamp(rng, start, span_seconds):
+    return (start + timedelta(seconds=rng.randrange(span_seconds))).strftime('%Y-%m-%d %H:%M:%S')
+
+
+def daily_view_buckets(rng, total, first_day, last_day, max_buckets=DAILY_BUCKETS_PER_BOOK):
+    """
+    Split a book's lifetime views into book_views_daily buckets.
+
+    Returns:
+        List of (date, views) on distinct days from first_day to last_day
+        whose views add up to total
+    """
+    if total <= 0:
+        return []
+    span = (last_day - first_day).days + 1
+    count = min(total, span, max_buckets)
+    days = sorted(rng.sample(range(span), count))
+    cuts = sorted(rng.sample(range(1, total), count - 1))
+    sizes = [end - begin for begin, end in zip([0] + cuts, cuts + [total])]
+    return [(first_day + timedelta(days=day), size) for day, size in zip(days, sizes)]
+
+
+def skewed_index(rng, n):
+    """Index in [0, n) biased towards the start, so a few books get most of the activity."""
+    return min(int(n * rng.random() ** 3), n - 1)
+
+
+def seed_database(users, books, views, reading_history, bookmarks, categories=20, days=365,
+                  batch_size=5000, load_data=False, seed=42):
+    """
+    Generate a synthetic dataset on top of whatever is already in the database.
+
+    Args:
+        users: Number of users to add (split across publishers, authors, moderators, readers)
+        books: Number of books to add
+        views: Approximate total of views.book_view across the new books; the
+            same counts are spread over book_views_daily by day
+        reading_history: Number of reading_history rows
+        bookmarks: Number of bookmarks rows
+        categories: Total number of categories to make sure exist
+        days: Spread created/uploaded/read timestamps over this many past days
+        batch_size: Rows per multi-row INSERT
+        load_data: Use LOAD DATA LOCAL INFILE instead of INSERT
+        seed: Random seed, so datasets are reproducible
+    """
+    if users < 1 or books < 1:
+        print("Need at least one user and one book")
+        return False
+
+    rng = random.Random(seed)
+    config = get_db_config()
+    conn = mysql.connector.connect(**config, allow_local_infile=load_data)
+    loader = Loader(conn, batch_size=batch_size, load_data=load_data)
+
+    cur = conn.cursor()
+    # Bulk-load settings for this session only; data is generated consistent
+    cur.execute("SET SESSION foreign_key_checks = 0")
+    cur.execute("SET SESSION unique_checks = 0")
+    cur.close()
+
+    now = datetime.now()
+    start = now - timedelta(days=days)
+    span = days * 86400
+    password_hash = generate_password_hash("password")
+    total_started = time.perf_counter()
+
+    try:
+        print(f"Seeding {config['database']} on {config['host']}")
+
+        # Categories
+        first_category = loader.next_id('categories', 'category_id')
+        new_categories = max(categories - (first_category - 1), 0)
+        loader.load('categories', ('category_id', 'category_name'), (
+            (first_category + i, f"{rng.choice(WORDS).capitalize()} {first_category + i}")
+            for i in range(new_categories)
+        ))
+        cur = conn.cursor()
+        cur.execute("SELECT category_id FROM categories")
+        category_ids = [row[0] for row in cur.fetchall()]
+        cur.close()
+
+        # Users, assigned to roles by id range
+        first_user = loader.next_id('users', 'user_id')
+        publishers = max(int(users * PUBLISHER_SHARE), 1)
+        authors = int(users * AUTHOR_SHARE)
+        moderators = int(users * MODERATOR_SHARE)
+        readers = users - publishers - authors - moderators
+        publisher_ids = range(first_user, first_user + publishers)
+        author_ids = range(publisher_ids.stop, publisher_ids.stop + authors)
+        moderator_ids = range(author_ids.stop, author_ids.stop + moderators)
+        reader_ids = range(moderator_ids.stop, moderator_ids.stop + readers)
+
+        def user_rows():
+            for ids, role_id in ((publisher_ids, 2), (author_ids, 3), (moderator_ids, 5), (reader_ids, 4)):
+                for user_id in ids:
+                    created = random_timestamp(rng, start, span)
+                    yield (user_id, f"seed_user_{user_id}", f"seed_user_{user_id}@example.com",
+                           password_hash, role_id, created, created)
+
+        loader.load('users', ('user_id', 'username', 'email', 'password_hash', 'role_id', 'created_at', 'updated_at'),
+                    user_rows())
+        loader.load('publishers', ('publisher_id', 'user_id', 'is_flagged', 'is_approved'), (
+            (publisher_id, user_id, 0, 1) for publisher_id, user_id
+            in zip(loader.id_range('publishers', 'publisher_id', publishers), publisher_ids)
+        ))
+        loader.load('authors', ('author_id', 'user_id', 'bio', 'is_verified', 'is_flagged', 'is_approved'), (
+            (author_id, user_id, None, 1, 0, 1) for author_id, user_id
+            in zip(loader.id_range('authors', 'author_id', authors), author_ids)
+        ))
+        loader.load('moderators', ('moderator_id', 'user_id', 'is_flagged'), (
+            (moderator_id, user_id, 0) for moderator_id, user_id
+            in zip(loader.id_range('moderators', 'moderator_id', moderators), moderator_ids)
+        ))
+        loader.load('normal_users', ('normal_user_id', 'user_id', 'additional_info', 'is_flagged'), (
+            (normal_user_id, user_id, None, 0) for normal_user_id, user_id
+            in zip(loader.id_range('normal_users', 'normal_user_id', readers), reader_ids)
+        ))
+
+        # Books, owned by publishers and authors
+        book_ids = loader.id_range('books', 'book_id', books)
+        first_book = book_ids.start
+        owners = [(user_id, 'Publisher') for user_id in publisher_ids] + [(user_id, 'Author') for user_id in author_ids]
+
+        # Upload day per new book, for spreading its views over book_views_daily
+        upload_days = []
+
+        def book_rows():
+            for book_id in book_ids:
+                user_id, role = rng.choice(owners)
+                stem = f"/uploads/seed_{book_id}"
+                uploaded_at = random_timestamp(rng, start, span)
+                upload_days.append(uploaded_at[:10])
+                yield (book_id, user_id, random_title(rng), "Synthetic book for load testing.",
+                       f"{stem}_cover.jpg", f"{stem}_en.pdf", int(rng.random() < 0.9), int(rng.random() < 0.85),
+                       uploaded_at, role, f"/audio_uploads/seed_{book_id}_en.mp3")
+
+        loader.load('books', ('book_id', 'user_id', 'title', 'description', 'coverUrl', 'fileUrl', 'is_public',
+                              'is_approved', 'uploaded_at', 'uploaded_by_role', 'audioUrl'), book_rows())
+
+        def book_category_rows():
+            next_id = loader.next_id('book_category', 'book_category_id')
+            for book_id in book_ids:
+                for category_id in rng.sample(category_ids, min(rng.randint(1, 3), len(category_ids))):
+                    yield (next_id, category_id, book_id)
+                    next_id += 1
+
+        loader.load('book_category', ('book_category_id', 'category_id', 'book_id'), book_category_rows())
+
+        # One views row per book with a long-tailed count; pareto(1.16) has mean ~7.25
+        scale = views / books / 7.25
+        view_counts = []
+
+        def view_rows():
+            for view_id, book_id in zip(loader.id_range('views', 'book_view_id', books), book_ids):
+                view_counts.append(int(rng.paretovariate(1.16) * scale))
+                yield (view_id, book_id, view_counts[-1])
+
+        loader.load('views', ('book_view_id', 'book_id', 'book_view'), view_rows())
+
+        # The same views by day, for the dashboard series; a separate generator
+        # keeps the rest of the dataset identical for a given seed
+        daily_rng = random.Random(seed + 1)
+        today = now.date()
+
+        def daily_view_rows():
+            for book_id, total, upload_day in zip(book_ids, view_counts, upload_days):
+                for view_date, count in daily_view_buckets(daily_rng, total, date.fromisoformat(upload_day), today):
+                    yield (book_id, view_date, count)
+
+        loader.load('book_views_daily', ('book_id', 'view_date', 'views'), daily_view_rows())
+
+        # Activity, concentrated on a minority of books
+        activity_users = range(first_user, reader_ids.stop)
+        loader.load('reading_history', ('history_id', 'user_id', 'book_id', 'last_read_at'), (
+            (history_id, rng.choice(activity_users), first_book + skewed_index(rng, books),
+             random_timestamp(rng, start, span))
+            for history_id in loader.id_range('reading_history', 'history_id', reading_history)
+        ))
+        loader.load('bookmarks', ('bookmark_id', 'user_id', 'book_id', 'created_at'), (
+            (bookmark_id, rng.choice(activity_users), first_book + skewed_index(rng, books),
+             random_timestamp(rng, start, span))
+            for bookmark_id in loader.id_range('bookmarks', 'bookmark_id', bookmarks)
+        ))
+        loader.load('reports', ('report_id', 'user_id', 'book_id', 'reason', 'reported_at'), (
+            (report_id, rng.choice(activity_users), first_book + rng.randrange(books), "Synthetic report",
+             random_timestamp(rng, start, span))
+            for report_id in loader.id_range('reports', 'report_id', books // 100)
+        ))
+        loader.load('audio_requests', ('request_id', 'user_id', 'book_id', 'language', 'requested_at'), (
+            (request_id, rng.choice(activity_users), first_book + skewed_index(rng, books),
+             rng.choice(('English', 'Hindi', 'Marathi')), random_timestamp(rng, start, span))
+            for request_id in loader.id_range('audio_requests', 'request_id', books // 20)
+        ))
+
+        # The loader bypasses the models, so build book_stats for the new books here
+        started = time.perf_counter()
+        cur = conn.cursor()
+        for chunk_start in range(first_book, first_book + books, 50_000):
+            cur.execute(REFRESH_BOOK_STATS.format(where="b.book_id BETWEEN %s AND %s"),
+                        (chunk_start, min(chunk_start + 50_000, first_book + books) - 1))
+            conn.commit()
+        cur.close()
+        elapsed = time.perf_counter() - started
+        print(f"  {'book_stats':<24}{books:>12,} rows  {elapsed:8.1f}s")
+
+        print(f"Done in {time.perf_counter() - total_started:.1f}s")
+        return True
+    except Exception as e:
+        conn.rollback()
+        print(f"Error seeding database: {e}")
+        return False
+    finally:
+        conn.close()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Seed the BookAura database with synthetic data for load testing")
+    parser.add_argument("--preset", choices=sorted(PRESETS), default="small",
+                        help="dataset size; individual counts below override it")
+    for name in ('users', 'books', 'views', 'reading_history', 'bookmarks'):
+        parser.add_argument(f"--{name.replace('_', '-')}", type=int, dest=name)
+    parser.add_argument("--categories", type=int, default=20)
+    parser.add_argument("--days", type=int, default=365)
+    parser.add_argument("--batch-size", type=int, default=5000, help="rows per multi-row INSERT")
+    parser.add_argument("--load-data", action="store_true",
+                        help="use LOAD DATA LOCAL INFILE (server needs local_infile=ON)")
+    parser.add_argument("--seed", type=int, default=42)
+    args = parser.parse_args()
+
+    counts = dict(PRESETS[args.preset])
+    for name in counts:
+        if getattr(args, name) is not None:
+            counts[name] = getattr(args, name)
+
+    ok = seed_database(categories=args.categories, days=args.days, batch_size=args.batch_size,
+                       load_data=args.load_data, seed=args.seed, **counts)
+    sys.exit(0 if ok else 1)
@@ -1,9 +1,13 @@
 import os
+import sys
 import time
-import requests
 import base64
 from pydub import AudioSegment
 
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from utils.http_client import get_session
+
 def split_text_into_chunks(text, chunk_size=5000):
     """
     Split text into chunks of specified size, ensuring words are not cut in half.
@@ -60,7 +64,7 @@ def convert_text_to_speech(input_file, output_dir="audio_output", chunk_size=500
 
         # Send request to ULCA API
         try:
-            response = requests.post(
+            response = get_session().post(
                 "https://meity-auth.ulcacontrib.org/ulca/apis/v0/model/compute",
                 json=payload,
                 headers={"Content-Type": "application/json"}
@@ -0,0 +1,157 @@
+import logging
+import multiprocessing
+import os
+import signal
+import socket
+import threading
+import time
+
+from db.config import get_job_queue_config
+from models.processing_jobs import ProcessingJobsModel
+
+logger = logging.getLogger(__name__)
+
+
+def retry_delay(attempt, config):
+    """Seconds to wait before retrying after the given failed attempt (1-based)."""
+    return min(config['retry_base_delay'] * 2 ** (attempt - 1), config['retry_max_delay'])
+
+
+def keep_alive(jobs, job_id, worker_id, interval, done):
+    """Refresh a running job's heartbeat every interval seconds until done is set."""
+    while not done.wait(interval):
+        try:
+            if not jobs.heartbeat(job_id, worker_id):
+                logger.warning(f"Job {job_id} was requeued while still running here; this result will be discarded")
+                return
+        except Exception as e:
+            logger.error(f"Could not refresh the heartbeat of job {job_id}: {e}")
+
+
+def run_job(jobs, job, process_pdf, config, worker_id):
+    """Run one claimed job, keeping its heartbeat fresh, and record the outcome."""
+    job_id = job['job_id']
+    logger.info(f"Job {job_id} (book {job['book_id']}) attempt {job['attempts']}/{job['max_attempts']}: "
+                f"{job['pdf_path']}")
+    done = threading.Event()
+    heartbeat = threading.Thread(target=keep_alive, args=(jobs, job_id, worker_id, config['heartbeat_interval'], done),
+                                 name=f"job-{job_id}-heartbeat", daemon=True)
+    heartbeat.start()
+    started = time.perf_counter()
+    try:
+        error = None if process_pdf(job['pdf_path']) else "No audio could be generated"
+    except Exception as e:
+        logger.exception(f"Job {job_id} raised")
+        error = f"{type(e).__name__}: {e}"
+    finally:
+        done.set()
+        heartbeat.join()
+
+    elapsed = time.perf_counter() - started
+    try:
+        if error is None:
+            recorded = jobs.complete(job_id, worker_id)
+        else:
+            delay = retry_delay(job['attempts'], config)
+            recorded = jobs.fail(job_id, worker_id, error, delay)
+
+        if not recorded:
+            # Requeued as stale and since claimed again; that run's outcome stands
+            logger.warning(f"Job {job_id} is no longer held by this worker; discarded its result")
+        elif error is None:
+            logger.info(f"Job {job_id} succeeded in {elapsed:.0f}s")
+        elif job['attempts'] < job['max_attempts']:
+            logger.warning(f"Job {job_id} failed after {elapsed:.0f}s, retrying in {delay:.0f}s: {error}")
+        else:
+            logger.error(f"Job {job_id} failed for good after {job['attempts']} attempts: {error}")
+    except Exception as e:
+        # Left as running; requeued once its heartbeat goes stale
+        logger.error(f"Could not record the outcome of job {job_id}: {e}")
+
+
+def worker_loop(index, stop_event, config=None):
+    """
+    Body of one worker process: claim a job, run it, repeat until
+    stop_event is set. A job in progress is always finished first.
+    """
+    logging.basicConfig(level=logging.INFO, format=f"%(asctime)s worker-{index} %(levelname)s %(message)s")
+    # Ctrl+C reaches the whole process group; the supervisor decides when to stop
+    signal.signal(signal.SIGINT, signal.SIG_IGN)
+
+    # Loaded once per worker process rather than once per upload
+    from services.final import process_pdf
+
+    config = config or get_job_queue_config()
+    jobs = ProcessingJobsModel()
+    worker_id = f"{socket.gethostname()}:{os.getpid()}"
+    while not stop_event.is_set():
+        try:
+            job = jobs.claim(worker_id)
+        except Exception as e:
+            logger.error(f"Could not claim a job: {e}")
+            job = None
+        if job is None:
+            stop_event.wait(config['poll_interval'])
+            continue
+        run_job(jobs, job, process_pdf, config, worker_id)
+
+
+def run_workers(workers=None, config=None):
+    """
+    Supervise a fixed pool of worker processes until SIGINT or SIGTERM.
+
+    Concurrency is bounded by the pool size: each process runs one job at
+    a time. Worker processes that die are replaced, and jobs left running
+    by a dead worker are requeued once their heartbeat is older than the
+    stale timeout.
+
+    Args:
+        workers: Number of worker processes (default BOOK_WORKERS)
+        config: Settings from get_job_queue_config (optional)
+    """
+    config = config or get_job_queue_config()
+    workers = workers or config['workers']
+    jobs = ProcessingJobsModel()
+
+    # Spawned, not forked: children must not share the parent's pooled sockets
+    ctx = multiprocessing.get_context('spawn')
+    stop_event = ctx.Event()
+
+    def request_stop(signum, frame):
+        logger.info("Stopping after the jobs in progress finish")
+        stop_event.set()
+
+    signal.signal(signal.SIGINT, request_stop)
+    signal.signal(signal.SIGTERM, request_stop)
+
+    def start(index):
+        process = ctx.Process(target=worker_loop, args=(index, stop_event, config),
+                              name=f"book-worker-{index}", daemon=False)
+        process.start()
+        return process
+
+    processes = [start(i) for i in range(workers)]
+    logger.info(f"Started {workers} book processing worker(s)")
+
+    # Recover jobs orphaned by a crash both now and periodically
+    sweep_interval = max(config['stale_timeout'] / 4, config['poll_interval'])
+    next_sweep = 0.0
+    while not stop_event.is_set():
+        if time.monotonic() >= next_sweep:
+            try:
+                requeued = jobs.requeue_stale(config['stale_timeout'])
+                if requeued:
+                    logger.warning(f"Requeued {requeued} job(s) abandoned by a stopped worker")
+            except Exception as e:
+                logger.error(f"Could not requeue stale jobs: {e}")
+            next_sweep = time.monotonic() + sweep_interval
+
+        for i, process in enumerate(processes):
+            if not process.is_alive() and not stop_event.is_set():
+                logger.error(f"{process.name} exited with code {process.exitcode}; restarting it")
+                processes[i] = start(i)
+        stop_event.wait(config['poll_interval'])
+
+    for process in processes:
+        process.join()
+    logger.info("All book processing workers stopped")
@@ -1,6 +1,7 @@
 import logging
 from datetime import datetime, timedelta
 from db.dashboard_db import DashboardDB
+from models.time_series import time_series_model
 
 # Configure logging
 logger = logging.getLogger(__name__)
@@ -138,51 +139,41 @@ class DashboardService:
             elif time_range == "90d":
                 days = 90
             
-            # Since we don't have daily view data, we'll simulate it
-            # Get total views
-            views_query = "SELECT COALESCE(SUM(book_view), 0) as total_views FROM views"
-            views_result = DashboardDB.execute_query_one(views_query)
-            total_views = float(views_result['total_views']) if views_result['total_views'] else 0.0
-            
-            # Generate daily data points
-            chart_data = []
-            today = datetime.now()
-            
-            if total_views > 0:
-                # Distribute views across days with a realistic pattern
-                remaining_views = total_views
-                for i in range(days):
-                    date = today - timedelta(days=days-i-1)
-                    date_str = date.strftime("%b %d")
-                    
-                    # Create a realistic distribution pattern
-                    if i < days // 3:
-                        # First third: gradual increase
-                        views = int(total_views * (0.5 / (days // 3)) * (i + 1))
-                    elif i < 2 * (days // 3):
-                        # Middle third: stable with small variations
-                        base = total_views * 0.5 / (days // 3)
-                        variation = base * 0.2  # 20% variation
-                        views = int(base + (variation * ((i % 3) - 1)))
-                    else:
-                        # Last third: gradual increase to peak
-                        progress = (i - 2 * (days // 3)) / (days - 2 * (days // 3))
-                        views = int(total_views * (0.5 + (0.5 * progress)) / (days // 3))
-                    
-                    chart_data.append({"name": date_str, "value": views})
-            else:
-                # If no views, return zeros
-                for i in range(days):
-                    date = today - timedelta(days=days-i-1)
-                    date_str = date.strftime("%b %d")
-                    chart_data.append({"name": date_str, "value": 0})
-            
-            return chart_data
+            # Real per-day counts from the view counter's daily buckets
+            with DashboardDB.get_connection(read_only=True) as conn:
+                return DashboardService._views_chart(days, conn)
         except Exception as e:
             logger.error(f"Error getting chart data: {e}")
             # Return fallback data
             return [{"name": "No Data", "value": 0}]
     
+    @staticmethod
+    def _views_chart(days, conn):
+        """One point per day, oldest first, zero for days without views."""
+        series = time_series_model.series('book_views', 'day', days, conn=conn)
+        return [{"name": day.strftime("%b %d"), "value": views} for day, views in series]
+    
+    @staticmethod
+    def _growth_months(time_range):
+        return 12 if time_range == "90d" else 6
+    
+    @staticmethod
+    def get_growth_data(entity, time_range="30d"):
+        """
+        Sign-ups per calendar month for publishers, moderators or users, in
+        one grouped query.
+        
+        Args:
+            entity: 'publishers', 'moderators' or 'users'
+            time_range: 90d covers 12 months, anything else 6
+            
+        Returns:
+            List of {"name": month, entity: count}, oldest month first
+        """
+        with DashboardDB.get_connection(read_only=True) as conn:
+            series = time_series_model.series(entity, 'month', DashboardService._growth_months(time_range), conn=conn)
+        return [{"name": month.strftime("%b"), entity: count} for month, count in series]
+    
     @staticmethod
     def get_publisher_growth_data(time_range="30d"):
         """
@@ -195,42 +186,7 @@ class DashboardService:
             List of data points for publisher growth
         """
         try:
-            # Convert time_range to days and months
-            days = 7
-            months = 6
-            if time_range == "30d":
-                days = 30
-                months = 6
-            elif time_range == "90d":
-                days = 90
-                months = 12
-            
-            # For monthly data, we'll get the last X months
-            growth_data = []
-            today = datetime.now()
-            
-            # Query for monthly publisher counts
-            for i in range(months):
-                month_start = today.replace(day=1) - timedelta(days=30*i)
-                month_name = month_start.strftime("%b")
-                
-                query = """
-                    SELECT COUNT(*) as count
-                    FROM publishers p
-                    JOIN users u ON p.user_id = u.user_id
-                    WHERE MONTH(u.created_at) = %s AND YEAR(u.created_at) = %s
-                """
-                result = DashboardDB.execute_query_one(query, (month_start.month, month_start.year))
-                
-                growth_data.append({
-                    "name": month_name,
-                    "publishers": result['count'] if result else 0
-                })
-            
-            # Reverse to get chronological order
-            growth_data.reverse()
-            
-            return growth_data
+            return DashboardService.get_growth_data('publishers', time_range)
         except Exception as e:
             logger.error(f"Error getting publisher growth data: {e}")
             # Return fallback data
@@ -342,8 +298,8 @@ class DashboardService:
     @staticmethod
     def get_all_dashboard_data(time_range="30d"):
         """
-        Get all dashboard data in a single function call.
-        This is more efficient as it uses fewer connections.
+        Get all dashboard data in a single function call, falling back to
+        placeholder data when the queries fail.
         
         Args:
             time_range: Time range for data (7d, 30d, 90d)
@@ -352,245 +308,212 @@ class DashboardService:
             Dictionary with all dashboard data
         """
         try:
-            with DashboardDB.get_connection() as conn:
-                # Use a single connection for all queries
-                cursor = conn.cursor(dictionary=True)
-                
-                # Get stats data
-                days = 7 if time_range == "7d" else 30 if time_range == "30d" else 90
-                comparison_date = datetime.now() - timedelta(days=days)
-                formatted_date = comparison_date.strftime('%Y-%m-%d')
-                
-                # Users stats
-                cursor.execute("""
-                    SELECT COUNT(*) as total_users,
-                           (SELECT COUNT(*) FROM users WHERE created_at >= %s) as new_users
-                    FROM users
-                """, (formatted_date,))
-                users_result = cursor.fetchone()
-                
-                # Books stats
-                cursor.execute("""
-                    SELECT COUNT(*) as total_books,
-                           (SELECT COUNT(*) FROM books WHERE uploaded_at >= %s) as new_books
-                    FROM books
-                """, (formatted_date,))
-                books_result = cursor.fetchone()
-                
-                # Views stats
-                cursor.execute("SELECT COALESCE(SUM(book_view), 0) as total_views FROM views")
-                views_result = cursor.fetchone()
+            return DashboardService.build_all_dashboard_data(time_range)
+        except Exception as e:
+            logger.error(f"Error getting all dashboard data: {e}")
+            return DashboardService.fallback_dashboard_data()
 
-                # Convert decimal to float for calculations
-                total_views = float(views_result['total_views']) if views_result['total_views'] else 0.0
-                
-                # Publishers stats
-                cursor.execute("""
-                    SELECT COUNT(*) as total_publishers,
-                           (SELECT COUNT(*) FROM publishers p
-                            JOIN users u ON p.user_id = u.user_id
-                            WHERE u.created_at >= %s) as new_publishers
-                    FROM publishers
-                """, (formatted_date,))
-                publishers_result = cursor.fetchone()
-                
-                # Calculate growth percentages
-                user_growth = 0
-                if users_result['total_users'] > 0:
-                    user_growth = (users_result['new_users'] / users_result['total_users']) * 100
-                
-                book_growth = 0
-                if books_result['total_books'] > 0:
-                    book_growth = (books_result['new_books'] / books_result['total_books']) * 100
-                
-                publisher_growth = 0
-                if publishers_result['total_publishers'] > 0:
-                    publisher_growth = (publishers_result['new_publishers'] / publishers_result['total_publishers']) * 100
-                
-                # Format stats for frontend
-                stats = [
-                    {
-                        "title": "Total Users",
-                        "value": users_result['total_users'],
-                        "icon": "Users",
-                        "trend": "up",
-                        "change": f"{user_growth:.1f}%"
-                    },
-                    {
-                        "title": "Total Books",
-                        "value": books_result['total_books'],
-                        "icon": "Book",
-                        "trend": "up",
-                        "change": f"{book_growth:.1f}%"
-                    },
-                    {
-                        "title": "Total Views",
-                        "value": views_result['total_views'],
-                        "icon": "BookOpen",
-                        "trend": "up",
-                        "change": "12.5%"  # Placeholder
-                    },
-                    {
-                        "title": "Publishers",
-                        "value": publishers_result['total_publishers'],
-                        "icon": "Users",
-                        "trend": "up",
-                        "change": f"{publisher_growth:.1f}%"
-                    }
+    @staticmethod
+    def fallback_dashboard_data():
+        """Placeholder payload shown when the dashboard queries fail."""
+        return {
+            "stats": [
+                {"title": "Total Users", "value": 0, "icon": "Users", "trend": "up", "change": "0%"},
+                {"title": "Total Books", "value": 0, "icon": "Book", "trend": "up", "change": "0%"},
+                {"title": "Total Views", "value": 0, "icon": "BookOpen", "trend": "up", "change": "0%"},
+                {"title": "Publishers", "value": 0, "icon": "Users", "trend": "up", "change": "0%"}
+            ],
+            "chartData": [{"name": "No Data", "value": 0}],
+            "publisherGrowthData": [
+                {"name": "Jan", "publishers": 12},
+                {"name": "Feb", "publishers": 19},
+                {"name": "Mar", "publishers": 25},
+                {"name": "Apr", "publishers": 32},
+                {"name": "May", "publishers": 40},
+                {"name": "Jun", "publishers": 48}
+            ],
+            "categoryDistributionData": [
+                {"name": "Fiction", "books": 45},
+                {"name": "Science", "books": 28},
+                {"name": "History", "books": 22},
+                {"name": "Biography", "books": 18},
+                {"name": "Self-Help", "books": 15}
+            ],
+            "topContent": {
+                "top_publishers": [
+                    {"name": "Sample Publisher", "books": 12, "views": 240}
+                ],
+                "top_books": [
+                    {"title": "Sample Book", "publisher": "Sample Publisher", "views": 120}
                 ]
-                
-                # Generate chart data
-                
-                chart_data = []
-                today = datetime.now()
-                
-                if total_views > 0:
-                    # Distribute views across days with a realistic pattern
-                    for i in range(days):
-                        date = today - timedelta(days=days-i-1)
-                        date_str = date.strftime("%b %d")
-                        
-                        # Create a realistic distribution pattern
-                        if i < days // 3:
-                            # First third: gradual increase
-                            views = int(total_views * (0.5 / (days // 3)) * (i + 1))
-                        elif i < 2 * (days // 3):
-                            # Middle third: stable with small variations
-                            base = total_views * 0.5 / (days // 3)
-                            variation = base * 0.2  # 20% variation
-                            views = int(base + (variation * ((i % 3) - 1)))
-                        else:
-                            # Last third: gradual increase to peak
-                            progress = (i - 2 * (days // 3)) / (days - 2 * (days // 3))
-                            views = int(total_views * (0.5 + (0.5 * progress)) / (days // 3))
-                        
-                        chart_data.append({"name": date_str, "value": views})
-                else:
-                    # If no views, return zeros
-                    for i in range(days):
-                        date = today - timedelta(days=days-i-1)
-                        date_str = date.strftime("%b %d")
-                        chart_data.append({"name": date_str, "value": 0})
-                
-                # Get publisher growth data
-                months = 6
-                growth_data = []
-                
-                for i in range(months):
-                    month_start = today.replace(day=1) - timedelta(days=30*i)
-                    month_name = month_start.strftime("%b")
-                    
-                    cursor.execute("""
-                        SELECT COUNT(*) as count
-                        FROM publishers p
-                        JOIN users u ON p.user_id = u.user_id
-                        WHERE MONTH(u.created_at) = %s AND YEAR(u.created_at) = %s
-                    """, (month_start.month, month_start.year))
-                    result = cursor.fetchone()
-                    
-                    growth_data.append({
-                        "name": month_name,
-                        "publishers": result['count'] if result else 0
-                    })
-                
-                # Reverse to get chronological order
-                growth_data.reverse()
-                
-                # Get category distribution
-                cursor.execute("""
-                    SELECT c.category_name as name, COUNT(bc.book_id) as books
-                    FROM categories c
-                    LEFT JOIN book_category bc ON c.category_id = bc.category_id
-                    LEFT JOIN books b ON bc.book_id = b.book_id AND b.is_approved = 1
-                    GROUP BY c.category_id
-                    ORDER BY books DESC
-                    LIMIT 10
-                """)
-                category_data = cursor.fetchall()
-                
-                # Get top publishers
-                cursor.execute("""
-                    SELECT 
-                        u.username AS name,
-                        COUNT(DISTINCT b.book_id) AS books,
-                        COALESCE(SUM(v.book_view), 0) AS views
-                    FROM 
-                        publishers p
+            }
+        }
+
+    @staticmethod
+    def build_all_dashboard_data(time_range="30d"):
+        """
+        Compute the full dashboard payload on one connection (a read replica
+        when one is healthy). Unlike get_all_dashboard_data, database errors
+        are raised, so dashboard snapshots never store placeholder data.
+        
+        Args:
+            time_range: Time range for data (7d, 30d, 90d)
+            
+        Returns:
+            Dictionary with all dashboard data
+        """
+        with DashboardDB.get_connection(read_only=True) as conn:
+            # Use a single connection for all queries
+            cursor = conn.cursor(dictionary=True)
+            
+            # Get stats data
+            days = 7 if time_range == "7d" else 30 if time_range == "30d" else 90
+            comparison_date = datetime.now() - timedelta(days=days)
+            formatted_date = comparison_date.strftime('%Y-%m-%d')
+            
+            # Users stats
+            cursor.execute("""
+                SELECT COUNT(*) as total_users,
+                       (SELECT COUNT(*) FROM users WHERE created_at >= %s) as new_users
+                FROM users
+            """, (formatted_date,))
+            users_result = cursor.fetchone()
+            
+            # Books stats
+            cursor.execute("""
+                SELECT COUNT(*) as total_books,
+                       (SELECT COUNT(*) FROM books WHERE uploaded_at >= %s) as new_books
+                FROM books
+            """, (formatted_date,))
+            books_result = cursor.fetchone()
+            
+            # Views stats
+            cursor.execute("SELECT COALESCE(SUM(book_view), 0) as total_views FROM views")
+            views_result = cursor.fetchone()
+            
+            # Publishers stats
+            cursor.execute("""
+                SELECT COUNT(*) as total_publishers,
+                       (SELECT COUNT(*) FROM publishers p
                         JOIN users u ON p.user_id = u.user_id
-                        LEFT JOIN books b ON b.user_id = p.user_id
-                        LEFT JOIN views v ON b.book_id = v.book_id
-                    GROUP BY 
-                        p.user_id, u.username
-                    ORDER BY 
-                        views DESC, books DESC
-                    LIMIT 5
-                """)
-                top_publishers = cursor.fetchall()
-                
-                # Get top books
-                cursor.execute("""
-                    SELECT 
-                        b.title,
-                        u.username AS publisher,
-                        COALESCE(v.book_view, 0) AS views
-                    FROM 
-                        books b
-                        JOIN users u ON b.user_id = u.user_id
-                        LEFT JOIN views v ON b.book_id = v.book_id
-                    WHERE 
-                        b.is_approved = 1
-                    ORDER BY 
-                        views DESC
-                    LIMIT 5
-                """)
-                top_books = cursor.fetchall()
-                
-                cursor.close()
-                
-                # Combine all data
-                return {
-                    "stats": stats,
-                    "chartData": chart_data,
-                    "publisherGrowthData": growth_data,
-                    "categoryDistributionData": category_data,
-                    "topContent": {
-                        "top_publishers": top_publishers,
-                        "top_books": top_books
-                    }
+                        WHERE u.created_at >= %s) as new_publishers
+                FROM publishers
+            """, (formatted_date,))
+            publishers_result = cursor.fetchone()
+            
+            # Calculate growth percentages
+            user_growth = 0
+            if users_result['total_users'] > 0:
+                user_growth = (users_result['new_users'] / users_result['total_users']) * 100
+            
+            book_growth = 0
+            if books_result['total_books'] > 0:
+                book_growth = (books_result['new_books'] / books_result['total_books']) * 100
+            
+            publisher_growth = 0
+            if publishers_result['total_publishers'] > 0:
+                publisher_growth = (publishers_result['new_publishers'] / publishers_result['total_publishers']) * 100
+            
+            # Format stats for frontend
+            stats = [
+                {
+                    "title": "Total Users",
+                    "value": users_result['total_users'],
+                    "icon": "Users",
+                    "trend": "up",
+                    "change": f"{user_growth:.1f}%"
+                },
+                {
+                    "title": "Total Books",
+                    "value": books_result['total_books'],
+                    "icon": "Book",
+                    "trend": "up",
+                    "change": f"{book_growth:.1f}%"
+                },
+                {
+                    "title": "Total Views",
+                    "value": views_result['total_views'],
+                    "icon": "BookOpen",
+                    "trend": "up",
+                    "change": "12.5%"  # Placeholder
+                },
+                {
+                    "title": "Publishers",
+                    "value": publishers_result['total_publishers'],
+                    "icon": "Users",
+                    "trend": "up",
+                    "change": f"{publisher_growth:.1f}%"
                 }
-                
-        except Exception as e:
-            logger.error(f"Error getting all dashboard data: {e}")
-            # Return fallback data
+            ]
+            
+            # Views per day from the view counter's daily buckets
+            chart_data = DashboardService._views_chart(days, conn)
+            
+            # Publisher sign-ups per month
+            growth_data = [
+                {"name": month.strftime("%b"), "publishers": count}
+                for month, count in time_series_model.series('publishers', 'month', 6, conn=conn)
+            ]
+            
+            # Get category distribution
+            cursor.execute("""
+                SELECT c.category_name as name, COUNT(bc.book_id) as books
+                FROM categories c
+                LEFT JOIN book_category bc ON c.category_id = bc.category_id
+                LEFT JOIN books b ON bc.book_id = b.book_id AND b.is_approved = 1
+                GROUP BY c.category_id
+                ORDER BY books DESC
+                LIMIT 10
+            """)
+            category_data = cursor.fetchall()
+            
+            # Get top publishers
+            cursor.execute("""
+                SELECT 
+                    u.username AS name,
+                    COUNT(DISTINCT b.book_id) AS books,
+                    COALESCE(SUM(v.book_view), 0) AS views
+                FROM 
+                    publishers p
+                    JOIN users u ON p.user_id = u.user_id
+                    LEFT JOIN books b ON b.user_id = p.user_id
+                    LEFT JOIN views v ON b.book_id = v.book_id
+                GROUP BY 
+                    p.user_id, u.username
+                ORDER BY 
+                    views DESC, books DESC
+                LIMIT 5
+            """)
+            top_publishers = cursor.fetchall()
+            
+            # Get top books
+            cursor.execute("""
+                SELECT 
+                    b.title,
+                    u.username AS publisher,
+                    COALESCE(v.book_view, 0) AS views
+                FROM 
+                    books b
+                    JOIN users u ON b.user_id = u.user_id
+                    LEFT JOIN views v ON b.book_id = v.book_id
+                WHERE 
+                    b.is_approved = 1
+                ORDER BY 
+                    views DESC
+                LIMIT 5
+            """)
+            top_books = cursor.fetchall()
+            
+            cursor.close()
+            
+            # Combine all data
             return {
-                "stats": [
-                    {"title": "Total Users", "value": 0, "icon": "Users", "trend": "up", "change": "0%"},
-                    {"title": "Total Books", "value": 0, "icon": "Book", "trend": "up", "change": "0%"},
-                    {"title": "Total Views", "value": 0, "icon": "BookOpen", "trend": "up", "change": "0%"},
-                    {"title": "Publishers", "value": 0, "icon": "Users", "trend": "up", "change": "0%"}
-                ],
-                "chartData": [{"name": "No Data", "value": 0}],
-                "publisherGrowthData": [
-                    {"name": "Jan", "publishers": 12},
-                    {"name": "Feb", "publishers": 19},
-                    {"name": "Mar", "publishers": 25},
-                    {"name": "Apr", "publishers": 32},
-                    {"name": "May", "publishers": 40},
-                    {"name": "Jun", "publishers": 48}
-                ],
-                "categoryDistributionData": [
-                    {"name": "Fiction", "books": 45},
-                    {"name": "Science", "books": 28},
-                    {"name": "History", "books": 22},
-                    {"name": "Biography", "books": 18},
-                    {"name": "Self-Help", "books": 15}
-                ],
+                "stats": stats,
+                "chartData": chart_data,
+                "publisherGrowthData": growth_data,
+                "categoryDistributionData": category_data,
                 "topContent": {
-                    "top_publishers": [
-                        {"name": "Sample Publisher", "books": 12, "views": 240}
-                    ],
-                    "top_books": [
-                        {"title": "Sample Book", "publisher": "Sample Publisher", "views": 120}
-                    ]
+                    "top_publishers": top_publishers,
+                    "top_books": top_books
                 }
             }
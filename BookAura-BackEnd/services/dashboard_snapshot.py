@@ -0,0 +1,145 @@
+import logging
+import threading
+import time
+from datetime import datetime, timezone
+
+from db.config import get_dashboard_snapshot_config
+from services.dashboard_service import DashboardService
+
+logger = logging.getLogger(__name__)
+
+TIME_RANGES = ('7d', '30d', '90d')
+DEFAULT_TIME_RANGE = '30d'
+
+
+class DashboardSnapshots:
+    """
+    Precomputed /optimized-dashboard/all-data payloads, one per time range.
+
+    A background thread rebuilds every range each interval seconds, so a
+    page load is a dictionary lookup instead of about ten aggregate queries.
+    A range requested before its first build is computed on the spot; a
+    failed rebuild keeps serving the previous snapshot. Snapshots live in
+    each worker process's memory.
+    """
+
+    def __init__(self, config=None, builder=None):
+        self._config = config or get_dashboard_snapshot_config()
+        self._builder = builder or DashboardService.build_all_dashboard_data
+        self._lock = threading.Lock()
+        # One rebuild per range at a time; concurrent callers wait and reuse it
+        self._range_locks = {time_range: threading.Lock() for time_range in TIME_RANGES}
+        self._snapshots = {}  # time_range -> (generated_at, payload)
+        self._stopped = threading.Event()
+        self._thread = None
+        self._stats = {'refreshes': 0, 'failed_refreshes': 0, 'on_demand_refreshes': 0}
+
+    def _ensure_started(self):
+        # Started lazily so forked workers and one-off scripts each get their own thread
+        if self._thread is None or not self._thread.is_alive():
+            with self._lock:
+                if self._thread is None or not self._thread.is_alive():
+                    self._thread = threading.Thread(target=self._run, name="dashboard-snapshot", daemon=True)
+                    self._thread.start()
+
+    def _run(self):
+        while not self._stopped.is_set():
+            self.refresh_all()
+            self._stopped.wait(self._config['interval'])
+
+    def _count(self, name):
+        with self._lock:
+            self._stats[name] += 1
+
+    def refresh(self, time_range, min_age=None):
+        """
+        Rebuild one range's snapshot.
+
+        Args:
+            time_range: One of TIME_RANGES
+            min_age: Skip the rebuild when the current snapshot is younger
+                than this many seconds, e.g. because a concurrent caller
+                just built it
+
+        Returns:
+            (generated_at, payload), or None if the build failed and there
+            is no earlier snapshot
+        """
+        with self._range_locks[time_range]:
+            current = self._snapshots.get(time_range)
+            if current is not None and min_age is not None and time.time() - current[0] < min_age:
+                return current
+            started = time.perf_counter()
+            try:
+                payload = self._builder(time_range)
+            except Exception as e:
+                logger.error(f"Dashboard snapshot for {time_range} failed, keeping the previous one: {e}")
+                self._count('failed_refreshes')
+                return current
+            snapshot = (time.time(), payload)
+            self._snapshots[time_range] = snapshot
+            self._count('refreshes')
+            logger.debug(f"Dashboard snapshot for {time_range} built in {time.perf_counter() - started:.2f}s")
+            return snapshot
+
+    def refresh_all(self):
+        for time_range in TIME_RANGES:
+            self.refresh(time_range)
+
+    def get(self, time_range=DEFAULT_TIME_RANGE, refresh=False):
+        """
+        Dashboard payload for a time range, with a "snapshot" entry giving
+        when it was generated and how old it is.
+
+        Args:
+            time_range: 7d, 30d or 90d; anything else means DEFAULT_TIME_RANGE
+            refresh: Rebuild now unless the snapshot is younger than
+                DASHBOARD_SNAPSHOT_MIN_REFRESH seconds
+
+        Returns:
+            Dictionary with all dashboard data
+        """
+        if time_range not in TIME_RANGES:
+            time_range = DEFAULT_TIME_RANGE
+        if not self._config['enabled']:
+            return DashboardService.get_all_dashboard_data(time_range)
+
+        self._ensure_started()
+        if refresh:
+            self._count('on_demand_refreshes')
+            snapshot = self.refresh(time_range, min_age=self._config['min_refresh'])
+        else:
+            snapshot = self._snapshots.get(time_range) or self.refresh(time_range, min_age=self._config['interval'])
+        if snapshot is None:
+            return DashboardService.fallback_dashboard_data()
+
+        generated_at, payload = snapshot
+        age = time.time() - generated_at
+        return {
+            **payload,
+            'snapshot': {
+                'timeRange': time_range,
+                'generatedAt': datetime.fromtimestamp(generated_at, timezone.utc).isoformat(),
+                'ageSeconds': round(age, 1),
+                # The background rebuild has missed at least one interval
+                'stale': age > 2 * self._config['interval'],
+            },
+        }
+
+    def stop(self):
+        """Stop the background thread."""
+        self._stopped.set()
+
+    def stats(self):
+        """Refresh counters and the age in seconds of each range's snapshot."""
+        now = time.time()
+        with self._lock:
+            return {
+                **self._stats,
+                'ages': {time_range: round(now - generated_at, 1)
+                         for time_range, (generated_at, _) in self._snapshots.items()},
+            }
+
+
+# Global instance that can be imported
+dashboard_snapshots = DashboardSnapshots()
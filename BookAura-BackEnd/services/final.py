@@ -3,17 +3,25 @@ import base64
 import logging
 import os
 import re
+import shutil
 import sys
 import time
 import traceback
 import io
+import tempfile
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 
 import fitz  # PyMuPDF
 import pyttsx3
-import requests
 from pydub import AudioSegment
 
+# Allow running as a script: python services/final.py <pdf>
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from models.translation_memory import chunk_hash, translation_memory_model
+from services.ulca_client import ulca_client
+
 # Configure logging
 logging.basicConfig(
     level=logging.INFO,
@@ -25,13 +33,18 @@ logging.basicConfig(
 )
 logger = logging.getLogger('translation')
 
-# URLs and model IDs for translation and TTS
-TRANSLATE_URL = "https://meity-auth.ulcacontrib.org/ulca/apis/v0/model/compute"
+# Model IDs for translation and TTS (endpoint: ULCA_COMPUTE_URL, see get_ulca_config)
 MARATHI_TRANSLATE_MODEL_ID = "641d1d7c8ecee6735a1b37c3"  # English → Marathi
 HINDI_TRANSLATE_MODEL_ID = "641d1d6592a6a31751ff1f49"   # English → Hindi
 MARATHI_TTS_MODEL_ID = "6576a25f4e7d42484da63537"  # Marathi TTS
 HINDI_TTS_MODEL_ID = "633c021bfb796d5e100d4ff9"  # Hindi TTS
 
+# Languages produced by translation, run concurrently: code -> (name, translation model, TTS model)
+TRANSLATED_LANGUAGES = {
+    "mr": ("Marathi", MARATHI_TRANSLATE_MODEL_ID, MARATHI_TTS_MODEL_ID),
+    "hi": ("Hindi", HINDI_TRANSLATE_MODEL_ID, HINDI_TTS_MODEL_ID),
+}
+
 # Chunk sizes optimized for API limits
 TRANSLATE_CHUNK_SIZE = 4000  # Reduced to avoid API limits
 TTS_CHUNK_SIZE = 1000  # Reduced to avoid API limits
@@ -89,18 +102,10 @@ def translate_chunk(text, model_id, target_lang):
         "input": [{"source": text}],
         "userId": None
     }
-    
-    headers = {
-        'Content-Type': 'application/json',
-        'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) BookAuraBackend/1.0'
-    }
 
     try:
         logger.info(f"Sending translation request for {target_lang} chunk of size {len(text)}")
-        response = requests.post(TRANSLATE_URL, json=payload, headers=headers, timeout=60)
-        response.raise_for_status()
-        
-        result = response.json()
+        result = ulca_client.compute(payload)
         if "output" in result and len(result["output"]) > 0 and "target" in result["output"][0]:
             translated = result["output"][0]["target"]
             logger.info(f"Successfully translated chunk to {target_lang} ({len(translated)} chars)")
@@ -110,9 +115,8 @@ def translate_chunk(text, model_id, target_lang):
             return None
     except Exception as e:
         logger.error(f"Translation failed for {target_lang}: {e}")
-        if 'response' in locals():
-            logger.error(f"Response status: {response.status_code}")
-            logger.error(f"Response content: {response.text[:500]}...")
+        if getattr(e, 'body', None):
+            logger.error(f"Response content: {e.body}...")
         return None
 
 def tts_chunk(text, model_id, language):
@@ -124,18 +128,10 @@ def tts_chunk(text, model_id, language):
         "gender": "female",
         "userId": None
     }
-    
-    headers = {
-        'Content-Type': 'application/json',
-        'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) BookAuraBackend/1.0'
-    }
 
     try:
         logger.info(f"Sending TTS request for {language} chunk of size {len(text)}")
-        response = requests.post(TRANSLATE_URL, json=payload, headers=headers, timeout=60)
-        response.raise_for_status()
-        
-        result = response.json()
+        result = ulca_client.compute(payload)
         if "audio" in result and len(result["audio"]) > 0 and "audioContent" in result["audio"][0]:
             audio_base64 = result["audio"][0]["audioContent"]
             logger.info(f"Successfully received audio for {language} chunk")
@@ -143,9 +139,11 @@ def tts_chunk(text, model_id, language):
             # Decode base64 audio content
             try:
                 audio_data = base64.b64decode(audio_base64)
-                # Validate that this is actual audio data (check for WAV header)
+                # Validate that this is actual audio data (check for WAV header);
+                # anything returned here is kept in the translation memory
                 if audio_data[:4] != b'RIFF':
-                    logger.warning(f"Received data doesn't appear to be valid WAV format")
+                    logger.error(f"Received data for {language} chunk is not WAV audio; discarding it")
+                    return None
                 return audio_data
             except Exception as decode_error:
                 logger.error(f"Failed to decode audio data: {decode_error}")
@@ -155,11 +153,37 @@ def tts_chunk(text, model_id, language):
             return None
     except Exception as e:
         logger.error(f"TTS failed for {language}: {e}")
-        if 'response' in locals():
-            logger.error(f"Response status: {response.status_code}")
-            logger.error(f"Response content: {response.text[:500]}...")
+        if getattr(e, 'body', None):
+            logger.error(f"Response content: {e.body}...")
         return None
 
+def fetch_with_memory(chunks, fetch, model_id, language, encode, decode):
+    """
+    fetch(chunk) for every chunk, in order, answering chunks seen before
+    (in this book or any other) from the translation memory. Only distinct
+    chunks missing from it are sent to ULCA; successful results are stored.
+
+    Args:
+        encode, decode: Convert a result to and from the stored bytes
+    """
+    hashes = [chunk_hash(chunk) for chunk in chunks]
+    results = {digest: decode(content)
+               for digest, content in translation_memory_model.get_many(model_id, language, hashes).items()}
+
+    missing = {}
+    for digest, chunk in zip(hashes, chunks):
+        if digest not in results:
+            missing.setdefault(digest, chunk)
+    fetched = ulca_client.map(fetch, list(missing.values()))
+    fresh = {digest: result for digest, result in zip(missing, fetched) if result}
+    translation_memory_model.put_many(model_id, language, {digest: encode(result) for digest, result in fresh.items()})
+    results.update(fresh)
+
+    reused = sum(1 for digest in hashes if digest not in missing)
+    logger.info(f"Translation memory ({model_id}, {language}): {reused}/{len(chunks)} chunks reused, "
+                f"{len(missing)} API calls; process hit ratio {translation_memory_model.stats()['hit_ratio']}")
+    return [results.get(digest) for digest in hashes]
+
 def translate_text_chunked(text, model_id, target_lang):
     """Translate text in chunks and combine results"""
     logger.info(f"Translating text to {target_lang}...")
@@ -167,23 +191,21 @@ def translate_text_chunked(text, model_id, target_lang):
     chunks = split_into_chunks(text, TRANSLATE_CHUNK_SIZE)
     logger.info(f"Split into {len(chunks)} chunks for translation")
     
+    # Cached chunks are reused; the rest are sent concurrently under ulca_client's rate limit
+    translations = fetch_with_memory(
+        chunks, lambda chunk: translate_chunk(chunk, model_id, target_lang), model_id, target_lang,
+        encode=lambda text: text.encode('utf-8'), decode=lambda content: content.decode('utf-8')
+    )
+
     result = []
-    for i, chunk in enumerate(chunks):
-        logger.info(f"Translating chunk {i+1}/{len(chunks)} to {target_lang}")
-        translated = translate_chunk(chunk, model_id, target_lang)
-        
+    for i, translated in enumerate(translations):
         if translated:
             result.append(translated)
-            # Log progress periodically
-            if (i+1) % 5 == 0 or i+1 == len(chunks):
-                logger.info(f"Progress: {i+1}/{len(chunks)} chunks translated to {target_lang}")
         else:
             logger.warning(f"Failed to translate chunk {i+1} to {target_lang}")
             result.append(f"[Translation Failed for Chunk {i+1}]")
-            
-        # Respectful delay between API calls
-        time.sleep(1.5)
-    
+    logger.info(f"Progress: {len(chunks) - translations.count(None)}/{len(chunks)} chunks translated to {target_lang}")
+
     translated_text = "\n".join(result)
     logger.info(f"Translation to {target_lang} completed: {len(translated_text)} characters")
     return translated_text
@@ -197,19 +219,25 @@ def generate_tts_audio(text, model_id, language):
     # Use pydub to properly combine audio segments
     combined_audio = None
     temp_files = []
+    # Private directory: other pipelines and worker processes share the cwd
+    temp_dir = tempfile.mkdtemp(prefix=f"tts_{language}_")
     
+    def synthesize(chunk):
+        return tts_chunk(chunk, model_id, language) if chunk.strip() else None
+
     try:
-        for i, chunk in enumerate(chunks):
+        # Cached audio is reused; the rest is requested concurrently and combined in order
+        audio_chunks = fetch_with_memory(chunks, synthesize, model_id, language,
+                                         encode=bytes, decode=bytes)
+
+        for i, (chunk, audio_data) in enumerate(zip(chunks, audio_chunks)):
             if not chunk.strip():
                 logger.warning(f"Skipping empty chunk {i+1}")
                 continue
-                
-            logger.info(f"Processing TTS chunk {i+1}/{len(chunks)} for {language}")
-            audio_data = tts_chunk(chunk, model_id, language)
-            
+
             if audio_data:
                 # Save to temporary file
-                temp_file = f"temp_{language}_chunk_{i+1}.wav"
+                temp_file = os.path.join(temp_dir, f"chunk_{i+1}.wav")
                 with open(temp_file, "wb") as f:
                     f.write(audio_data)
                 temp_files.append(temp_file)
@@ -228,9 +256,6 @@ def generate_tts_audio(text, model_id, language):
                     logger.error(f"Error processing audio chunk {i+1}: {audio_error}")
             else:
                 logger.warning(f"Failed to generate audio for chunk {i+1}")
-            
-            # Respectful delay between API calls
-            time.sleep(1.5)
         
         # Check if we have any valid audio
         if combined_audio is None:
@@ -262,9 +287,11 @@ def generate_tts_audio(text, model_id, language):
                     os.remove(temp_file)
             except Exception as cleanup_error:
                 logger.warning(f"Failed to remove temp file {temp_file}: {cleanup_error}")
+        shutil.rmtree(temp_dir, ignore_errors=True)
 
 def generate_english_tts(text, output_path):
     """Generate English TTS using pyttsx3 with optimized settings"""
+    temp_dir = None
     try:
         logger.info(f"Generating English TTS using pyttsx3...")
         engine = pyttsx3.init()
@@ -273,8 +300,9 @@ def generate_english_tts(text, output_path):
         # Split text into smaller chunks to avoid memory issues
         chunks = split_into_chunks(text, 5000)  # Process 5000 chars at a time
         
-        # Use temporary WAV file
-        temp_wav = "temp_english.wav"
+        # Use temporary WAV files in a private directory
+        temp_dir = tempfile.mkdtemp(prefix="tts_en_")
+        temp_wav = os.path.join(temp_dir, "english.wav")
         
         # Process each chunk
         for i, chunk in enumerate(chunks):
@@ -285,7 +313,7 @@ def generate_english_tts(text, output_path):
                 engine.save_to_file(chunk, temp_wav)
             else:
                 # Append to existing file
-                engine.save_to_file(chunk, f"temp_chunk_{i}.wav")
+                engine.save_to_file(chunk, os.path.join(temp_dir, f"chunk_{i}.wav"))
             
             engine.runAndWait()
             
@@ -293,10 +321,10 @@ def generate_english_tts(text, output_path):
             if i > 0:
                 try:
                     main_audio = AudioSegment.from_wav(temp_wav)
-                    chunk_audio = AudioSegment.from_wav(f"temp_chunk_{i}.wav")
+                    chunk_audio = AudioSegment.from_wav(os.path.join(temp_dir, f"chunk_{i}.wav"))
                     combined = main_audio + chunk_audio
                     combined.export(temp_wav, format="wav")
-                    os.remove(f"temp_chunk_{i}.wav")
+                    os.remove(os.path.join(temp_dir, f"chunk_{i}.wav"))
                 except Exception as append_error:
                     logger.error(f"Error appending chunk {i}: {append_error}")
         
@@ -311,9 +339,6 @@ def generate_english_tts(text, output_path):
                     parameters=["-ac", "1"]  # Mono audio to reduce file size
                 )
                 logger.info(f"English TTS audio saved to {output_path} (length: {len(audio)}ms)")
-                
-                # Clean up temp file
-                os.remove(temp_wav)
                 return True
             except Exception as convert_error:
                 logger.error(f"Error converting to MP3: {convert_error}")
@@ -325,6 +350,10 @@ def generate_english_tts(text, output_path):
         logger.error(f"English TTS failed: {e}")
         logger.error(traceback.format_exc())
         return False
+    finally:
+        # Clean up temp files
+        if temp_dir:
+            shutil.rmtree(temp_dir, ignore_errors=True)
 
 def save_debug_info(text, translated_text, language, debug_folder, base_name):
     """Save original and translated text for debugging"""
@@ -344,8 +373,83 @@ def save_debug_info(text, translated_text, language, debug_folder, base_name):
     except Exception as e:
         logger.error(f"Failed to save debug info: {e}")
 
+def verify_audio(path, language_name):
+    """Log the size and duration of a generated MP3"""
+    try:
+        audio = AudioSegment.from_mp3(path)
+        file_size = os.path.getsize(path) / (1024 * 1024)  # Size in MB
+        duration = len(audio) / 1000  # Duration in seconds
+        logger.info(f"{language_name} audio: {file_size:.2f}MB, {duration:.2f}s")
+
+        # Check if file size seems reasonable for the duration
+        if file_size > (duration * 0.5):  # Rough estimate: ~0.5MB per second is reasonable
+            logger.info(f"{language_name} audio file size seems reasonable")
+        else:
+            logger.warning(f"{language_name} audio file size may be too small for its duration")
+    except Exception as verify_error:
+        logger.error(f"Error verifying {language_name} audio: {verify_error}")
+
+def run_english_pipeline(text, en_path):
+    """English TTS with pyttsx3. Returns True if the MP3 was written"""
+    logger.info("Starting English TTS generation...")
+    english_success = generate_english_tts(text, en_path)
+    if english_success:
+        verify_audio(en_path, "English")
+    logger.info(f"English TTS generation {'succeeded' if english_success else 'failed'}")
+    return english_success
+
+def run_translated_pipeline(text, language, output_path, debug_folder, base_name):
+    """Translate to one of TRANSLATED_LANGUAGES and generate its TTS. Returns True if the MP3 was written"""
+    language_name, translate_model_id, tts_model_id = TRANSLATED_LANGUAGES[language]
+
+    logger.info(f"Starting {language_name} translation...")
+    translated_text = translate_text_chunked(text, translate_model_id, language)
+    if not translated_text:
+        logger.error(f"Translation to {language_name} failed")
+        return False
+
+    # Save translation for debugging
+    save_debug_info(text, translated_text, language, debug_folder, base_name)
+
+    logger.info(f"Starting {language_name} TTS generation...")
+    audio_data = generate_tts_audio(translated_text, tts_model_id, language)
+    if not audio_data:
+        logger.error(f"Failed to generate {language_name} audio")
+        return False
+
+    with open(output_path, "wb") as f:
+        f.write(audio_data)
+    verify_audio(output_path, language_name)
+    logger.info(f"{language_name} TTS audio saved as {output_path}")
+    return True
+
+def timed_pipeline(language, pipeline, *args):
+    """
+    Run one language's pipeline, isolating its failures from the others.
+
+    Returns:
+        (succeeded, seconds taken)
+    """
+    started = time.perf_counter()
+    try:
+        succeeded = pipeline(*args)
+    except Exception as e:
+        logger.error(f"Exception during {language} processing: {e}")
+        logger.error(traceback.format_exc())
+        succeeded = False
+    elapsed = time.perf_counter() - started
+    logger.info(f"Pipeline {language} finished in {elapsed:.1f}s ({'ok' if succeeded else 'failed'})")
+    return succeeded, elapsed
+
 def process_pdf(pdf_path):
-    """Main function to process a PDF file"""
+    """
+    Main function to process a PDF file.
+
+    The English, Marathi and Hindi pipelines are independent, so Marathi
+    and Hindi (network bound) run on worker threads while English TTS runs
+    on the calling thread, where pyttsx3 expects to be driven. Wall time is
+    that of the slowest language rather than the sum of all three.
+    """
     try:
         logger.info(f"Starting to process PDF: {pdf_path}")
         
@@ -372,125 +476,29 @@ def process_pdf(pdf_path):
         os.makedirs(debug_folder, exist_ok=True)
         
         en_path = os.path.join(output_folder, f"{base_name}_en.mp3")
-        mr_path = os.path.join(output_folder, f"{base_name}_mr.mp3")
-        hi_path = os.path.join(output_folder, f"{base_name}_hi.mp3")
-        
-        # Track success of each step
-        english_success = False
-        marathi_success = False
-        hindi_success = False
-        
-        # Generate English TTS
-        try:
-            logger.info("Starting English TTS generation...")
-            english_success = generate_english_tts(text, en_path)
-            
-            if english_success:
-                # Verify the file size and duration
-                try:
-                    audio = AudioSegment.from_mp3(en_path)
-                    file_size = os.path.getsize(en_path) / (1024 * 1024)  # Size in MB
-                    duration = len(audio) / 1000  # Duration in seconds
-                    logger.info(f"English audio: {file_size:.2f}MB, {duration:.2f}s")
-                    
-                    # Check if file size seems reasonable for the duration
-                    if file_size > (duration * 0.5):  # Rough estimate: ~0.5MB per second is reasonable
-                        logger.info("English audio file size seems reasonable")
-                    else:
-                        logger.warning(f"English audio file size may be too small for its duration")
-                except Exception as verify_error:
-                    logger.error(f"Error verifying English audio: {verify_error}")
-            
-            logger.info(f"English TTS generation {'succeeded' if english_success else 'failed'}")
-        except Exception as e:
-            logger.error(f"Exception during English TTS generation: {e}")
-            logger.error(traceback.format_exc())
-        
-        # Translate to Marathi and generate TTS
-        try:
-            logger.info("Starting Marathi translation...")
-            marathi_text = translate_text_chunked(text, MARATHI_TRANSLATE_MODEL_ID, "mr")
-            
-            if marathi_text:
-                # Save Marathi translation for debugging
-                save_debug_info(text, marathi_text, "mr", debug_folder, base_name)
-                
-                # Generate Marathi TTS
-                logger.info("Starting Marathi TTS generation...")
-                marathi_audio = generate_tts_audio(marathi_text, MARATHI_TTS_MODEL_ID, "mr")
-                
-                if marathi_audio:
-                    with open(mr_path, "wb") as f:
-                        f.write(marathi_audio)
-                    
-                    # Verify the file size and duration
-                    try:
-                        audio = AudioSegment.from_mp3(mr_path)
-                        file_size = os.path.getsize(mr_path) / (1024 * 1024)  # Size in MB
-                        duration = len(audio) / 1000  # Duration in seconds
-                        logger.info(f"Marathi audio: {file_size:.2f}MB, {duration:.2f}s")
-                        
-                        # Check if file size seems reasonable for the duration
-                        if file_size > (duration * 0.5):  # Rough estimate: ~0.5MB per second is reasonable
-                            logger.info("Marathi audio file size seems reasonable")
-                        else:
-                            logger.warning(f"Marathi audio file size may be too small for its duration")
-                    except Exception as verify_error:
-                        logger.error(f"Error verifying Marathi audio: {verify_error}")
-                    
-                    logger.info(f"Marathi TTS audio saved as {mr_path}")
-                    marathi_success = True
-                else:
-                    logger.error("Failed to generate Marathi audio")
-            else:
-                logger.error("Translation to Marathi failed")
-        except Exception as e:
-            logger.error(f"Exception during Marathi processing: {e}")
-            logger.error(traceback.format_exc())
-        
-        # Translate to Hindi and generate TTS
-        try:
-            logger.info("Starting Hindi translation...")
-            hindi_text = translate_text_chunked(text, HINDI_TRANSLATE_MODEL_ID, "hi")
-            
-            if hindi_text:
-                # Save Hindi translation for debugging
-                save_debug_info(text, hindi_text, "hi", debug_folder, base_name)
-                
-                # Generate Hindi TTS
-                logger.info("Starting Hindi TTS generation...")
-                hindi_audio = generate_tts_audio(hindi_text, HINDI_TTS_MODEL_ID, "hi")
-                
-                if hindi_audio:
-                    with open(hi_path, "wb") as f:
-                        f.write(hindi_audio)
-                    
-                    # Verify the file size and duration
-                    try:
-                        audio = AudioSegment.from_mp3(hi_path)
-                        file_size = os.path.getsize(hi_path) / (1024 * 1024)  # Size in MB
-                        duration = len(audio) / 1000  # Duration in seconds
-                        logger.info(f"Hindi audio: {file_size:.2f}MB, {duration:.2f}s")
-                        
-                        # Check if file size seems reasonable for the duration
-                        if file_size > (duration * 0.5):  # Rough estimate: ~0.5MB per second is reasonable
-                            logger.info("Hindi audio file size seems reasonable")
-                        else:
-                            logger.warning(f"Hindi audio file size may be too small for its duration")
-                    except Exception as verify_error:
-                        logger.error(f"Error verifying Hindi audio: {verify_error}")
-                    
-                    logger.info(f"Hindi TTS audio saved as {hi_path}")
-                    hindi_success = True
-                else:
-                    logger.error("Failed to generate Hindi audio")
-            else:
-                logger.error("Translation to Hindi failed")
-        except Exception as e:
-            logger.error(f"Exception during Hindi processing: {e}")
-            logger.error(traceback.format_exc())
-        
-        # Report success
+
+        started = time.perf_counter()
+        with ThreadPoolExecutor(max_workers=len(TRANSLATED_LANGUAGES),
+                                thread_name_prefix="pipeline") as executor:
+            futures = {
+                language: executor.submit(
+                    timed_pipeline, language, run_translated_pipeline, text, language,
+                    os.path.join(output_folder, f"{base_name}_{language}.mp3"), debug_folder, base_name
+                )
+                for language in TRANSLATED_LANGUAGES
+            }
+            results = {'en': timed_pipeline('en', run_english_pipeline, text, en_path)}
+            for language, future in futures.items():
+                results[language] = future.result()
+        wall_time = time.perf_counter() - started
+
+        # Report success, with timings showing the pipelines overlapped
+        per_language = ", ".join(f"{language} {elapsed:.1f}s" for language, (_, elapsed) in results.items())
+        logger.info(f"Pipelines took {wall_time:.1f}s wall time vs {sum(e for _, e in results.values()):.1f}s "
+                    f"sequential ({per_language})")
+        english_success = results['en'][0]
+        marathi_success = results['mr'][0]
+        hindi_success = results['hi'][0]
         logger.info(f"Processing complete: English: {english_success}, Marathi: {marathi_success}, Hindi: {hindi_success}")
         
         # Call the API to mark the book as approved if at least one conversion succeeded
@@ -0,0 +1,167 @@
+import logging
+import random
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from email.utils import parsedate_to_datetime
+
+import requests
+
+from db.config import get_ulca_config
+from utils.http_client import get_session
+
+logger = logging.getLogger(__name__)
+
+RETRY_STATUSES = (429, 500, 502, 503, 504)
+
+DEFAULT_HEADERS = {'Content-Type': 'application/json'}
+
+
+class UlcaError(Exception):
+    """A compute request that failed for good, after any retries."""
+
+    def __init__(self, message, status_code=None, body=None):
+        super().__init__(message)
+        self.status_code = status_code
+        self.body = body
+
+
+class TokenBucket:
+    """
+    Thread-safe token bucket: acquire() blocks until a token is available.
+    Tokens refill at `rate` per second up to `capacity`, so the long-run
+    request rate is `rate` with bursts of up to `capacity`.
+    """
+
+    def __init__(self, rate, capacity):
+        if rate <= 0:
+            raise ValueError("rate must be positive")
+        self.rate = float(rate)
+        self.capacity = max(1.0, float(capacity))
+        self._tokens = self.capacity
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def acquire(self):
+        """Take one token, sleeping until one is available. Returns the seconds waited."""
+        waited = 0.0
+        while True:
+            with self._lock:
+                now = time.monotonic()
+                self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+                self._updated = now
+                if self._tokens >= 1:
+                    self._tokens -= 1
+                    return waited
+                delay = (1 - self._tokens) / self.rate
+            time.sleep(delay)
+            waited += delay
+
+
+def _retry_after(response):
+    """Seconds asked for by a Retry-After header, or None."""
+    value = response.headers.get('Retry-After') if response is not None else None
+    if not value:
+        return None
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    try:
+        return max(0.0, parsedate_to_datetime(value).timestamp() - time.time())
+    except (TypeError, ValueError):
+        return None
+
+
+class UlcaClient:
+    """
+    Client for the ULCA compute endpoint shared by every pipeline in the
+    process, so the rate limit and the in-flight cap are global rather
+    than per language. Requests go through the pooled keep-alive session
+    from utils.http_client unless a `post` callable is given.
+    """
+
+    def __init__(self, config=None, post=None):
+        self._config = config or get_ulca_config()
+        self._post = post
+        self._bucket = TokenBucket(self._config['rate'], self._config['burst'])
+        self._in_flight = threading.BoundedSemaphore(self._config['max_in_flight'])
+        self._lock = threading.Lock()
+        self._stats = {'requests': 0, 'retries': 0, 'failures': 0, 'throttled_seconds': 0.0}
+
+    @property
+    def max_in_flight(self):
+        return self._config['max_in_flight']
+
+    def _count(self, name, amount=1):
+        with self._lock:
+            self._stats[name] += amount
+
+    def _backoff(self, attempt, response=None):
+        delay = min(self._config['backoff_base'] * 2 ** attempt, self._config['backoff_max'])
+        # Jitter keeps parallel retries from landing together
+        delay *= random.uniform(0.5, 1.0)
+        return max(delay, _retry_after(response) or 0.0)
+
+    def compute(self, payload):
+        """
+        POST one compute request, rate limited and retried.
+
+        Args:
+            payload: Request body, e.g. a translation or tts task
+
+        Returns:
+            The decoded JSON response
+
+        Raises:
+            UlcaError: Non-retryable status, or retries exhausted
+        """
+        attempt = 0
+        while True:
+            self._count('throttled_seconds', self._bucket.acquire())
+            response, error = None, None
+            with self._in_flight:
+                self._count('requests')
+                try:
+                    post = self._post or get_session().post
+                    response = post(self._config['url'], json=payload, headers=DEFAULT_HEADERS,
+                                    timeout=self._config['timeout'])
+                    if response.status_code < 400:
+                        return response.json()
+                    error = f"HTTP {response.status_code}"
+                except (requests.ConnectionError, requests.Timeout) as e:
+                    error = f"{type(e).__name__}: {e}"
+
+            status = response.status_code if response is not None else None
+            retryable = status is None or status in RETRY_STATUSES
+            if not retryable or attempt >= self._config['max_retries']:
+                self._count('failures')
+                body = response.text[:500] if response is not None else None
+                raise UlcaError(f"{payload.get('task')} request failed after {attempt + 1} attempt(s): {error}",
+                                status, body)
+
+            delay = self._backoff(attempt, response)
+            logger.warning(f"{payload.get('task')} request got {error}, retrying in {delay:.1f}s")
+            self._count('retries')
+            time.sleep(delay)
+            attempt += 1
+
+    def map(self, func, items):
+        """
+        Apply func to every item concurrently, returning results in input
+        order. Concurrency beyond max_in_flight only queues on the shared cap.
+        """
+        items = list(items)
+        if len(items) <= 1:
+            return [func(item) for item in items]
+        with ThreadPoolExecutor(max_workers=min(len(items), self.max_in_flight),
+                                thread_name_prefix="ulca") as executor:
+            return list(executor.map(func, items))
+
+    def stats(self):
+        with self._lock:
+            return dict(self._stats)
+
+
+# Global instance that can be imported
+ulca_client = UlcaClient()
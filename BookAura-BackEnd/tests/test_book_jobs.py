@@ -0,0 +1,65 @@
+import time
+from unittest import mock
+
+from models.processing_jobs import ProcessingJobsModel
+from services.book_jobs import run_job
+
+CONFIG = {'heartbeat_interval': 0.01, 'retry_base_delay': 30.0, 'retry_max_delay': 1800.0}
+JOB = {'job_id': 7, 'book_id': 1, 'pdf_path': '/tmp/book.pdf', 'attempts': 1, 'max_attempts': 3}
+
+
+def slow_process(seconds, result=True):
+    def process_pdf(path):
+        time.sleep(seconds)
+        return result
+    return process_pdf
+
+
+def test_running_job_keeps_its_heartbeat_fresh():
+    jobs = mock.MagicMock()
+    jobs.heartbeat.return_value = True
+    jobs.complete.return_value = True
+    run_job(jobs, JOB, slow_process(0.1), CONFIG, 'host:1')
+    assert jobs.heartbeat.call_count >= 2
+    jobs.heartbeat.assert_called_with(7, 'host:1')
+    jobs.complete.assert_called_once_with(7, 'host:1')
+
+
+def test_result_of_a_requeued_run_is_discarded(caplog):
+    jobs = mock.MagicMock()
+    jobs.heartbeat.return_value = False
+    jobs.fail.return_value = False
+    run_job(jobs, JOB, slow_process(0.05, result=False), CONFIG, 'host:1')
+    # Stops refreshing a job it no longer holds
+    jobs.heartbeat.assert_called_once_with(7, 'host:1')
+    jobs.fail.assert_called_once_with(7, 'host:1', "No audio could be generated", 30.0)
+    assert 'discarded its result' in caplog.text
+
+
+def make_model(rowcount):
+    model = ProcessingJobsModel()
+    cursor = mock.MagicMock(rowcount=rowcount)
+    conn = mock.MagicMock()
+    conn.cursor.return_value.__enter__.return_value = cursor
+    model.db_pool = mock.MagicMock()
+    model.db_pool.get_connection.return_value = conn
+    return model, cursor
+
+
+def test_outcome_is_only_recorded_for_the_holding_worker():
+    model, cursor = make_model(rowcount=0)
+    assert model.complete(7, 'host:1') is False
+    sql, params = cursor.execute.call_args[0]
+    assert 'locked_by = %s' in sql
+    assert params == (7, 'host:1')
+
+    model, cursor = make_model(rowcount=1)
+    assert model.fail(7, 'host:1', 'boom', 30) is True
+    assert cursor.execute.call_args[0][1] == (30, 'boom', 7, 'host:1')
+
+
+def test_stale_jobs_are_found_by_heartbeat():
+    model, cursor = make_model(rowcount=2)
+    assert model.requeue_stale(300) == 2
+    sql = cursor.execute.call_args[0][0]
+    assert 'heartbeat_at' in sql.split('WHERE')[1]
@@ -0,0 +1,65 @@
+from contextlib import contextmanager
+from unittest import mock
+
+import models.bookmarks as bookmarks
+import models.reading_history as reading_history
+from models.book_stats import BookStatsModel
+
+
+def fake_conn(rowcount=1, fetchone=None):
+    cur = mock.MagicMock(rowcount=rowcount)
+    cur.fetchone.return_value = fetchone
+    conn = mock.MagicMock()
+    conn.cursor.return_value = cur
+    conn.cursor.return_value.__enter__.return_value = cur
+    return conn, cur
+
+
+def test_adjust_applies_deltas_without_recounting():
+    model = BookStatsModel()
+    conn, cur = fake_conn(rowcount=1)
+    with mock.patch.object(model, 'refresh_books') as refresh:
+        model.adjust(5, conn, bookmarks=-1, readers=1)
+    sql, params = cur.execute.call_args[0]
+    assert sql.strip().startswith('UPDATE book_stats')
+    assert 'COUNT' not in sql
+    assert params == (-1, 1, 5)
+    refresh.assert_not_called()
+
+
+def test_adjust_recomputes_a_missing_row():
+    model = BookStatsModel()
+    conn, _ = fake_conn(rowcount=0)
+    with mock.patch.object(model, 'refresh_books') as refresh:
+        model.adjust(5, conn, bookmarks=1)
+    refresh.assert_called_once_with([5], conn)
+
+
+def test_bookmark_writes_adjust_the_count():
+    conn, cur = fake_conn(rowcount=1)
+    model = bookmarks.BookmarksModel()
+
+    @contextmanager
+    def connection():
+        yield conn
+
+    stats = mock.MagicMock()
+    with mock.patch.object(model, 'connection', connection), \
+            mock.patch.object(bookmarks, 'book_stats_model', stats), \
+            mock.patch.object(bookmarks, 'ResponseCache'):
+        model.add_bookmark(1, 5)
+        model.delete_bookmarks_by_user_id_and_book_id(1, 5)
+    assert stats.adjust.call_args_list == [mock.call(5, conn, bookmarks=1), mock.call(5, conn, bookmarks=-1)]
+    stats.refresh_books.assert_not_called()
+
+
+def test_only_a_first_read_adds_a_reader():
+    model = reading_history.ReadingHistoryModel()
+    stats = mock.MagicMock()
+    with mock.patch.object(reading_history, 'book_stats_model', stats):
+        conn, _ = fake_conn(fetchone=None)
+        assert model.create_reading_history(1, 5, conn=conn)
+        conn, _ = fake_conn(fetchone=(1,))
+        assert model.create_reading_history(1, 5, conn=conn)
+    stats.adjust.assert_called_once_with(5, mock.ANY, readers=1)
+    stats.refresh_books.assert_not_called()
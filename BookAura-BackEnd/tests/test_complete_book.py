@@ -0,0 +1,22 @@
+from unittest import mock
+
+from models.books import BooksModel
+
+BOOK = {'book_id': 1, 'author_id': 2, 'title': 'Title', 'categories': 'Fiction'}
+
+
+def test_complete_book_uses_one_connection():
+    model = BooksModel()
+    conn = mock.MagicMock()
+    conn.prepared_cursor.return_value.fetchall.return_value = [dict(BOOK)]
+    cur = conn.cursor.return_value.__enter__.return_value
+    cur.fetchall.side_effect = [[{'category_name': 'Fiction'}], [], []]
+    cur.fetchone.return_value = {'total_readers': 3}
+    model.db_pool = mock.MagicMock()
+    with mock.patch.object(model, 'get_connection', return_value=conn) as get_connection:
+        result = model.fetch_complete_book(1)
+
+    assert result['book']['title'] == 'Title'
+    assert result['stats'] == {'total_readers': 3}
+    get_connection.assert_called_once_with()
+    model.db_pool.close_connection.assert_called_once_with(conn)
@@ -0,0 +1,103 @@
+from datetime import datetime
+from unittest import mock
+
+import pytest
+from flask import Flask
+
+import controllers.books_controller as books_controller
+import controllers.category_controller as category_controller
+from utils.response_cache import MemoryBackend, ResponseCache
+
+VERSION = (datetime(2024, 5, 1, 12, 0, 0, 123456), datetime(2024, 5, 2, 8, 30, 0, 654321))
+
+BOOK_ROW = {
+    'book_id': 1, 'author_id': 2, 'author_name': 'author', 'title': 'Title', 'description': '',
+    'fileUrl': 'book.pdf', 'audioUrl': None, 'is_public': 1, 'is_approved': 1,
+    'uploaded_at': '2024-05-01T12:00:00', 'uploaded_by_role': 3, 'coverUrl': None,
+    'categories': 'Fiction', 'views': 10,
+}
+
+
+@pytest.fixture
+def client():
+    app = Flask(__name__)
+    app.register_blueprint(books_controller.app, url_prefix='/books')
+    app.register_blueprint(category_controller.app, url_prefix='/categories')
+    books = mock.MagicMock()
+    books.get_book_version.return_value = VERSION
+    books.get_book_by_id.return_value = BOOK_ROW
+    books.get_catalog_version.return_value = (1,) + VERSION
+    books.get_all_books.return_value = [BOOK_ROW]
+    categories = mock.MagicMock()
+    categories.get_category_version.return_value = VERSION[0]
+    categories.fetch_category_by_id.return_value = (4, 'Fiction', VERSION[0])
+    with mock.patch.object(books_controller, 'books_model', books), \
+            mock.patch.object(category_controller, 'categories_model', categories):
+        yield app.test_client(), books, categories
+
+
+def test_matching_etag_skips_the_book_query(client):
+    client, books, _ = client
+    first = client.get('/books/1')
+    assert first.status_code == 200
+    assert first.get_json()['title'] == 'Title'
+    books.get_book_by_id.assert_called_once_with(1)
+
+    revalidated = client.get('/books/1', headers={'If-None-Match': first.headers['ETag']})
+    assert revalidated.status_code == 304
+    assert revalidated.headers['ETag'] == first.headers['ETag']
+    books.get_book_by_id.assert_called_once_with(1)
+    assert books.get_book_version.call_count == 2
+
+
+def test_changed_version_returns_the_new_body(client):
+    client, books, _ = client
+    etag = client.get('/books/1').headers['ETag']
+    books.get_book_version.return_value = (VERSION[0], datetime(2024, 5, 3))
+    response = client.get('/books/1', headers={'If-None-Match': etag})
+    assert response.status_code == 200
+    assert response.headers['ETag'] != etag
+    assert books.get_book_by_id.call_count == 2
+
+
+def test_missing_book_has_no_validators(client):
+    client, books, _ = client
+    books.get_book_version.return_value = None
+    books.get_book_by_id.return_value = None
+    response = client.get('/books/1', headers={'If-None-Match': '*'})
+    assert response.status_code == 404
+    assert 'ETag' not in response.headers
+
+
+def test_matching_etag_skips_the_category_query(client):
+    client, _, categories = client
+    first = client.get('/categories/4')
+    assert first.get_json() == {'category_id': 4, 'category_name': 'Fiction'}
+    revalidated = client.get('/categories/4', headers={'If-None-Match': first.headers['ETag']})
+    assert revalidated.status_code == 304
+    categories.fetch_category_by_id.assert_called_once_with(4)
+
+
+def test_unchanged_catalog_poll_skips_the_listing_query(client):
+    client, books, _ = client
+    first = client.get('/books/')
+    assert first.status_code == 200
+    assert client.get('/books/', headers={'If-None-Match': first.headers['ETag']}).status_code == 304
+    books.get_all_books.assert_called_once()
+
+    # Each page has its own validator
+    page = client.get('/books/?limit=1')
+    assert page.headers['ETag'] != first.headers['ETag']
+
+
+def test_cached_body_keeps_the_cache_etag(client):
+    client, books, _ = client
+    with mock.patch.object(ResponseCache, '_config', {'enabled': True}), \
+            mock.patch.object(ResponseCache, '_backend', MemoryBackend()):
+        built = client.get('/books/')
+        assert built.headers['X-Cache'] == 'MISS'
+        served = client.get('/books/')
+        assert served.headers['X-Cache'] == 'HIT'
+    # A cached body may predate the current version, so it is not given the versioned ETag
+    assert served.headers['ETag'] != built.headers['ETag']
+    books.get_all_books.assert_called_once()
@@ -0,0 +1,88 @@
+from datetime import date, timedelta
+from unittest import mock
+
+import pytest
+from flask import Flask
+
+import controllers.platform_administrators_controller as admin_controller
+from models.platform_administrators import PlatformAdministratorsModel
+
+COUNTS = {'total_publishers': 3, 'flagged_publishers': 1, 'total_moderators': 2, 'total_books': 40}
+
+# Methods that load every row of a table into the app
+FULL_TABLE_LOADERS = ('fetch_all_publishers', 'fetch_all_moderators', 'get_all_books')
+
+MODEL_NAMES = ('platform_administrator_model', 'publishers_model', 'moderator_model',
+               'books_model', 'books_views_model', 'reading_history_model')
+
+
+@pytest.fixture
+def models():
+    """Replace every model the admin controller uses with a recording mock."""
+    mocks = {name: mock.MagicMock(name=name) for name in MODEL_NAMES}
+    mocks['platform_administrator_model'].get_dashboard_counts.return_value = dict(COUNTS)
+    today = date.today()
+    mocks['books_views_model'].get_daily_views.return_value = [(today - timedelta(days=i), i) for i in range(7)]
+    for name in ('get_growth_data', 'get_top_publishers2'):
+        getattr(mocks['publishers_model'], name).return_value = []
+    for name in ('get_books_by_category2', 'get_top_books2'):
+        getattr(mocks['books_model'], name).return_value = []
+
+    with mock.patch.multiple(admin_controller, **mocks), \
+            mock.patch.object(admin_controller, 'decode_token', return_value={'user_id': 1, 'role_id': 1}):
+        yield mocks
+
+
+@pytest.fixture
+def client():
+    app = Flask(__name__)
+    app.register_blueprint(admin_controller.app, url_prefix='/platform_administrators')
+    return app.test_client()
+
+
+def called_methods(models):
+    return [call[0].split('.')[0] for model in models.values() for call in model.method_calls]
+
+
+def assert_no_full_table_loads(models):
+    loads = [name for name in called_methods(models) if name.startswith(FULL_TABLE_LOADERS)]
+    assert loads == [], f"dashboard loaded whole tables via {loads}"
+
+
+def test_dashboard_stats_uses_only_the_counts_query(client, models):
+    response = client.get('/platform_administrators/dashboard/stats', headers={'Authorization': 'token'})
+
+    assert response.status_code == 200
+    models['platform_administrator_model'].get_dashboard_counts.assert_called_once_with()
+    assert called_methods(models) == ['get_dashboard_counts']
+    values = {stat['title']: stat['value'] for stat in response.get_json()}
+    assert values['Total Publishers'] == COUNTS['total_publishers']
+    assert values['Total Books'] == COUNTS['total_books']
+
+
+def test_all_dashboard_data_counts_without_loading_tables(client, models):
+    response = client.get('/platform_administrators/dashboard/all-data?timeRange=7d',
+                          headers={'Authorization': 'token'})
+
+    assert response.status_code == 200
+    models['platform_administrator_model'].get_dashboard_counts.assert_called_once_with()
+    assert_no_full_table_loads(models)
+    # The only admin-model call is the single counts query
+    assert models['platform_administrator_model'].method_calls == [mock.call.get_dashboard_counts()]
+    values = {stat['title']: stat['value'] for stat in response.get_json()['stats']}
+    assert values['Total Moderators'] == COUNTS['total_moderators']
+    assert values['Flagged Content'] == COUNTS['flagged_publishers']
+
+
+def test_get_dashboard_counts_is_one_aggregate_row():
+    model = PlatformAdministratorsModel()
+    row = {name: str(value) for name, value in COUNTS.items()}
+    with mock.patch.object(model, 'execute_query_single', return_value=row) as query, \
+            mock.patch.object(model, 'execute_query') as query_rows:
+        assert model.get_dashboard_counts() == COUNTS
+
+    query.assert_called_once()
+    sql = query.call_args[0][0]
+    assert sql.count('COUNT(*)') == 3
+    assert 'SELECT *' not in sql
+    query_rows.assert_not_called()
@@ -0,0 +1,65 @@
+import pytest
+
+from utils.pagination import (DEFAULT_PAGE_SIZE, MAX_PAGE_SIZE, decode_cursor, encode_cursor, fetch_limit,
+                              parse_page_args, split_page)
+
+
+def test_unpaged_request_returns_everything():
+    assert parse_page_args(None, None, 2) == (None, None)
+    assert parse_page_args('', '', 2) == (None, None)
+    rows = list(range(500))
+    assert fetch_limit(None) is None
+    assert split_page(rows, None, lambda row: [row]) == (rows, None)
+
+
+def test_limit_pages_and_is_capped():
+    assert parse_page_args('10', None, 1) == (10, None)
+    assert parse_page_args(str(MAX_PAGE_SIZE * 10), None, 1) == (MAX_PAGE_SIZE, None)
+    with pytest.raises(ValueError):
+        parse_page_args('ten', None, 1)
+
+
+def test_cursor_alone_uses_default_page_size():
+    cursor = encode_cursor(['2024-01-01 00:00:00', 7])
+    assert parse_page_args(None, cursor, 2) == (DEFAULT_PAGE_SIZE, ['2024-01-01 00:00:00', 7])
+    with pytest.raises(ValueError):
+        decode_cursor(cursor, 1)
+
+
+def test_split_page_returns_cursor_for_last_row():
+    rows = [1, 2, 3, 4]
+    page, cursor = split_page(rows, 3, lambda row: [row])
+    assert page == [1, 2, 3]
+    assert decode_cursor(cursor, 1) == [3]
+    assert split_page(rows[:3], 3, lambda row: [row]) == ([1, 2, 3], None)
+
+
+@pytest.fixture
+def users_client():
+    from flask import Flask
+    from unittest import mock
+    import controllers.users_controller as users_controller
+
+    app = Flask(__name__)
+    app.register_blueprint(users_controller.app, url_prefix='/users')
+    rows = [{'user_id': i} for i in range(1, 121)]
+    model = mock.MagicMock()
+    model.fetch_all_users.side_effect = lambda limit=None, after=None: rows[:limit] if limit else rows
+    with mock.patch.object(users_controller, 'users_model', model):
+        yield app.test_client(), model
+
+
+def test_list_endpoint_without_paging_args_is_unchanged(users_client):
+    client, model = users_client
+    response = client.get('/users/')
+    assert len(response.get_json()) == 120
+    assert 'X-Next-Cursor' not in response.headers
+    model.fetch_all_users.assert_called_once_with(limit=None, after=None)
+
+
+def test_list_endpoint_pages_when_asked(users_client):
+    client, model = users_client
+    response = client.get('/users/?limit=50')
+    assert len(response.get_json()) == 50
+    assert decode_cursor(response.headers['X-Next-Cursor'], 1) == [50]
+    model.fetch_all_users.assert_called_once_with(limit=51, after=None)
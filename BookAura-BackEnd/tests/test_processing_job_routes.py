@@ -0,0 +1,58 @@
+from unittest import mock
+
+import pytest
+from flask import Flask
+
+import controllers.books_controller as books_controller
+
+JOB = {
+    'job_id': 9, 'book_id': 1, 'status': 'failed', 'attempts': 3, 'max_attempts': 3, 'run_after': None,
+    'last_error': 'FileNotFoundError: /srv/uploads/book.pdf', 'created_at': '2024-05-01 12:00:00',
+    'finished_at': '2024-05-01 12:05:00',
+}
+
+TOKENS = {
+    'owner': {'user_id': 2, 'role_id': 3},
+    'other': {'user_id': 3, 'role_id': 3},
+    'admin': {'user_id': 1, 'role_id': 1},
+}
+
+
+@pytest.fixture
+def client():
+    app = Flask(__name__)
+    app.register_blueprint(books_controller.app, url_prefix='/books')
+    books = mock.MagicMock()
+    books.get_book_owner.return_value = 2
+    jobs = mock.MagicMock()
+    jobs.get_job.return_value = JOB
+    jobs.get_jobs_for_book.return_value = [JOB]
+    with mock.patch.object(books_controller, 'books_model', books), \
+            mock.patch.object(books_controller, 'processing_jobs_model', jobs), \
+            mock.patch.object(books_controller, 'decode_token', TOKENS.get):
+        yield app.test_client()
+
+
+@pytest.mark.parametrize('path', ['/books/jobs/9', '/books/1/jobs'])
+def test_job_routes_require_a_token(client, path):
+    assert client.get(path).status_code == 401
+    assert client.get(path, headers={'Authorization': 'forged'}).status_code == 401
+
+
+@pytest.mark.parametrize('path', ['/books/jobs/9', '/books/1/jobs'])
+def test_job_routes_refuse_other_users(client, path):
+    assert client.get(path, headers={'Authorization': 'other'}).status_code == 403
+
+
+def test_owner_sees_jobs_without_error_text(client):
+    job = client.get('/books/jobs/9', headers={'Authorization': 'owner'}).get_json()
+    assert job['status'] == 'failed'
+    assert 'last_error' not in job
+    jobs = client.get('/books/1/jobs', headers={'Authorization': 'owner'}).get_json()
+    assert [job['job_id'] for job in jobs] == [9]
+    assert 'last_error' not in jobs[0]
+
+
+def test_administrator_sees_error_text(client):
+    job = client.get('/books/jobs/9', headers={'Authorization': 'admin'}).get_json()
+    assert job['last_error'] == JOB['last_error']
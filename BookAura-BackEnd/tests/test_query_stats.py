@@ -0,0 +1,30 @@
+from types import SimpleNamespace
+from unittest import mock
+
+from db.query_stats import find_caller
+
+MODEL_SOURCE = '''
+class FakeModel:
+    def fetch(self):
+        return lookup()
+'''
+
+
+def lookup():
+    # Stands in for TimedCursor._timed, one frame above the model method
+    return find_caller()
+
+
+def test_find_caller_reports_the_model_method():
+    namespace = {'__name__': 'models.fake', 'lookup': lookup}
+    exec(MODEL_SOURCE, namespace)
+    assert namespace['FakeModel']().fetch() == 'FakeModel.fetch'
+    assert lookup() == 'unknown'
+
+
+def test_find_caller_without_co_qualname():
+    # Code objects before Python 3.11 only have co_name
+    frame = SimpleNamespace(f_globals={'__name__': 'models.fake'}, f_code=SimpleNamespace(co_name='fetch'),
+                            f_back=None)
+    with mock.patch('db.query_stats.sys._getframe', return_value=frame):
+        assert find_caller() == 'fetch'
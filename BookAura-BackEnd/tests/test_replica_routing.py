@@ -0,0 +1,42 @@
+from unittest import mock
+
+import pytest
+
+from db.routing import ReplicaRouter
+
+
+def fake_pool(status_row):
+    cursor = mock.MagicMock()
+    cursor.fetchone.return_value = status_row
+    pool = mock.MagicMock(__name__='ReplicaPool0')
+    pool.get_connection.return_value.cursor.return_value = cursor
+    return pool
+
+
+@pytest.fixture(autouse=True)
+def router():
+    with mock.patch('db.routing.DatabasePool.close_connection'), \
+            mock.patch.object(ReplicaRouter, '_health', {}), \
+            mock.patch.object(ReplicaRouter, '_routing_config',
+                              {'max_lag': 5.0, 'lag_check_interval': 5.0, 'assume_in_sync': False}):
+        yield ReplicaRouter
+
+
+def test_server_without_replication_is_skipped_by_default(router):
+    pool = fake_pool(None)
+    assert router._measure_lag(pool) is None
+    assert not router._is_healthy(pool)
+
+
+def test_server_without_replication_routes_reads_when_assumed_in_sync(router):
+    router._routing_config['assume_in_sync'] = True
+    pool = fake_pool(None)
+    assert router._measure_lag(pool, assume_in_sync=True) == 0.0
+    assert router._is_healthy(pool)
+
+
+def test_stopped_or_lagging_replica_is_skipped_even_when_assumed_in_sync(router):
+    router._routing_config['assume_in_sync'] = True
+    assert not router._is_healthy(fake_pool({'Seconds_Behind_Source': None}))
+    assert not router._is_healthy(fake_pool({'Seconds_Behind_Source': 30}))
+    assert router._is_healthy(fake_pool({'Seconds_Behind_Source': 1}))
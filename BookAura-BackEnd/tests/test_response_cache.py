@@ -0,0 +1,40 @@
+from utils.response_cache import MemoryBackend, book_tag
+
+ENTRY = (b'{}', 'application/json', '"etag"', 0.0, {})
+
+
+def test_unrelated_invalidation_does_not_block_store():
+    backend = MemoryBackend()
+    generation = backend.generation()
+    backend.invalidate_tags({book_tag(2)})
+    assert backend.set('/books/1', ENTRY, 60, {book_tag(1)}, generation)
+    assert backend.get('/books/1') == ENTRY
+
+
+def test_invalidation_of_own_tag_during_build_blocks_store():
+    backend = MemoryBackend()
+    generation = backend.generation()
+    backend.invalidate_tags({book_tag(1)})
+    assert not backend.set('/books/1', ENTRY, 60, {book_tag(1)}, generation)
+    assert backend.get('/books/1') is None
+    # A build started after the invalidation is stored
+    assert backend.set('/books/1', ENTRY, 60, {book_tag(1)}, backend.generation())
+
+
+def test_clear_blocks_every_build_in_flight():
+    backend = MemoryBackend()
+    generation = backend.generation()
+    backend.clear()
+    assert not backend.set('/books/1', ENTRY, 60, {book_tag(1)}, generation)
+    assert not backend.set('/untagged', ENTRY, 60, set(), generation)
+
+
+def test_pruned_versions_fall_back_to_refusing_older_builds():
+    backend = MemoryBackend(max_entries=1)
+    generation = backend.generation()
+    for book_id in range(10):
+        backend.invalidate_tags({book_tag(book_id)})
+    assert len(backend._tag_versions) <= 4
+    # book:0 was pruned, so the build cannot prove it missed that invalidation
+    assert not backend.set('/books/0', ENTRY, 60, {book_tag(0)}, generation)
+    assert backend.set('/books/0', ENTRY, 60, {book_tag(0)}, backend.generation())
@@ -0,0 +1,20 @@
+import random
+from datetime import date
+
+from scripts.seed_database import DAILY_BUCKETS_PER_BOOK, daily_view_buckets
+
+
+def test_daily_buckets_add_up_to_the_lifetime_views():
+    rng = random.Random(1)
+    first_day, last_day = date(2024, 1, 1), date(2024, 12, 31)
+    for total in (0, 1, 7, 12_345):
+        buckets = daily_view_buckets(rng, total, first_day, last_day)
+        assert sum(views for _, views in buckets) == total
+        assert len(buckets) <= DAILY_BUCKETS_PER_BOOK
+        days = [day for day, _ in buckets]
+        assert days == sorted(set(days))
+        assert all(first_day <= day <= last_day and views > 0 for day, views in buckets)
+
+
+def test_book_uploaded_today_gets_one_bucket():
+    assert daily_view_buckets(random.Random(1), 50, date(2024, 5, 1), date(2024, 5, 1)) == [(date(2024, 5, 1), 50)]
@@ -0,0 +1,55 @@
+from datetime import date, datetime
+from decimal import Decimal
+from unittest import mock
+
+import pytest
+
+from models.time_series import TimeSeriesModel, bucket_starts
+
+
+def test_day_buckets_end_on_the_given_day():
+    assert bucket_starts('day', 3, date(2024, 3, 1)) == [date(2024, 2, 28), date(2024, 2, 29), date(2024, 3, 1)]
+
+
+def test_month_buckets_cross_the_year_boundary():
+    assert bucket_starts('month', 4, date(2024, 2, 15)) == [
+        date(2023, 11, 1), date(2023, 12, 1), date(2024, 1, 1), date(2024, 2, 1)
+    ]
+
+
+def fake_conn(rows):
+    conn = mock.MagicMock()
+    cur = conn.cursor.return_value.__enter__.return_value
+    cur.fetchall.return_value = rows
+    return conn, cur
+
+
+def test_series_fills_missing_buckets_with_zero():
+    # Buckets come back as DATE, DATETIME or string depending on the driver; SUM() as Decimal
+    conn, cur = fake_conn([
+        {'bucket': date(2024, 1, 1), 'value': 4},
+        {'bucket': datetime(2024, 3, 1), 'value': Decimal('7')},
+        {'bucket': '2024-04-01', 'value': None},
+    ])
+    series = TimeSeriesModel().series('book_views', 'month', 4, end=date(2024, 4, 20), conn=conn)
+    assert series == [(date(2024, 1, 1), 4), (date(2024, 2, 1), 0), (date(2024, 3, 1), 7), (date(2024, 4, 1), 0)]
+
+    sql, params = cur.execute.call_args[0]
+    assert 'GROUP BY bucket' in sql
+    # Range on the raw column: from the first bucket to the start of the one after the last
+    assert params == (date(2024, 1, 1), date(2024, 5, 1))
+
+
+def test_series_passes_extra_conditions():
+    conn, cur = fake_conn([])
+    series = TimeSeriesModel().series('book_views_by_book', 'day', 2, where='b.user_id = %s', params=(9,),
+                                      end=date(2024, 1, 1), conn=conn)
+    assert series == [(date(2023, 12, 31), 0), (date(2024, 1, 1), 0)]
+    sql, params = cur.execute.call_args[0]
+    assert sql.endswith('AND (b.user_id = %s) GROUP BY bucket')
+    assert params == (date(2023, 12, 31), date(2024, 1, 2), 9)
+
+
+def test_series_rejects_unknown_intervals():
+    with pytest.raises(ValueError):
+        TimeSeriesModel().series('users', 'week', conn=mock.MagicMock())
@@ -0,0 +1,35 @@
+import base64
+from unittest import mock
+
+import pytest
+
+import services.final as final
+
+WAV = b'RIFF' + b'\0' * 40
+
+
+def tts_response(audio):
+    return {'audio': [{'audioContent': base64.b64encode(audio).decode()}]}
+
+
+@pytest.fixture
+def memory():
+    model = mock.MagicMock()
+    model.get_many.return_value = {}
+    model.stats.return_value = {'hit_ratio': None}
+    client = mock.MagicMock()
+    client.map.side_effect = lambda func, items: [func(item) for item in items]
+    with mock.patch.object(final, 'translation_memory_model', model), \
+            mock.patch.object(final, 'ulca_client', client):
+        yield model, client
+
+
+def test_non_wav_audio_is_not_cached(memory):
+    model, client = memory
+    client.compute.side_effect = [tts_response(WAV), tts_response(b'<html>error</html>')]
+    fetch = lambda chunk: final.tts_chunk(chunk, 'tts-model', 'hi')
+    audio = final.fetch_with_memory(['first', 'second'], fetch, 'tts-model', 'hi', encode=bytes, decode=bytes)
+
+    assert audio == [WAV, None]
+    stored = model.put_many.call_args[0][2]
+    assert list(stored.values()) == [WAV]
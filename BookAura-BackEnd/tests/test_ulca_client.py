@@ -0,0 +1,103 @@
+from types import SimpleNamespace
+from unittest import mock
+
+import pytest
+import requests
+
+from services.ulca_client import TokenBucket, UlcaClient, UlcaError
+
+CONFIG = {
+    'url': 'https://ulca.test/compute', 'rate': 100.0, 'burst': 10, 'max_in_flight': 2,
+    'max_retries': 2, 'backoff_base': 0.01, 'backoff_max': 0.05, 'timeout': 5,
+}
+
+
+class FakeClock:
+    """Stands in for the time module so the bucket's sleeps advance a fake clock."""
+
+    def __init__(self):
+        self.now = 0.0
+        self.sleeps = []
+
+    def monotonic(self):
+        return self.now
+
+    def sleep(self, seconds):
+        self.sleeps.append(seconds)
+        self.now += seconds
+
+
+@pytest.fixture
+def clock():
+    clock = FakeClock()
+    with mock.patch('services.ulca_client.time', clock):
+        yield clock
+
+
+def response(status, body=None, headers=None):
+    return SimpleNamespace(status_code=status, headers=headers or {}, text=str(body),
+                           json=lambda: body)
+
+
+def test_bucket_serves_the_burst_without_waiting(clock):
+    bucket = TokenBucket(rate=2, capacity=3)
+    assert [bucket.acquire() for _ in range(3)] == [0.0, 0.0, 0.0]
+    assert clock.sleeps == []
+
+
+def test_empty_bucket_waits_for_the_refill(clock):
+    bucket = TokenBucket(rate=2, capacity=1)
+    assert bucket.acquire() == 0.0
+    assert bucket.acquire() == pytest.approx(0.5)
+    clock.now += 10
+    # Refill is capped at the capacity
+    assert bucket.acquire() == 0.0
+    assert bucket.acquire() == pytest.approx(0.5)
+
+
+def test_bucket_rejects_a_non_positive_rate():
+    with pytest.raises(ValueError):
+        TokenBucket(rate=0, capacity=1)
+
+
+@pytest.mark.parametrize('status', [429, 500, 503])
+def test_retryable_status_is_retried_until_it_succeeds(clock, status):
+    post = mock.Mock(side_effect=[response(status), response(status), response(200, {'ok': True})])
+    client = UlcaClient(CONFIG, post=post)
+    assert client.compute({'task': 'tts'}) == {'ok': True}
+    assert post.call_count == 3
+    assert client.stats()['retries'] == 2
+    assert all(delay <= CONFIG['backoff_max'] for delay in clock.sleeps)
+
+
+def test_retry_after_header_sets_the_minimum_delay(clock):
+    post = mock.Mock(side_effect=[response(429, headers={'Retry-After': '3'}), response(200, {})])
+    UlcaClient(CONFIG, post=post).compute({'task': 'tts'})
+    assert clock.sleeps == [3.0]
+
+
+def test_gives_up_after_max_retries(clock):
+    post = mock.Mock(side_effect=[response(502, 'bad gateway')] * 3
+                     + [requests.ConnectionError('refused')])
+    client = UlcaClient(CONFIG, post=post)
+    with pytest.raises(UlcaError) as excinfo:
+        client.compute({'task': 'translation'})
+    assert excinfo.value.status_code == 502
+    assert excinfo.value.body == 'bad gateway'
+    assert post.call_count == CONFIG['max_retries'] + 1
+    assert client.stats()['failures'] == 1
+
+
+def test_connection_errors_are_retried(clock):
+    post = mock.Mock(side_effect=[requests.Timeout('slow'), response(200, {'ok': True})])
+    assert UlcaClient(CONFIG, post=post).compute({'task': 'tts'}) == {'ok': True}
+
+
+def test_client_error_is_not_retried(clock):
+    post = mock.Mock(return_value=response(400, 'bad payload'))
+    client = UlcaClient(CONFIG, post=post)
+    with pytest.raises(UlcaError) as excinfo:
+        client.compute({'task': 'tts'})
+    assert excinfo.value.status_code == 400
+    post.assert_called_once()
+    assert client.stats()['retries'] == 0
@@ -0,0 +1,77 @@
+from unittest import mock
+
+import pytest
+from mysql.connector import errors
+
+from db.view_counter import ViewCounter
+
+CONFIG = {'enabled': True, 'flush_interval': 60.0, 'max_pending': 1000}
+
+
+@pytest.fixture
+def pool():
+    cur = mock.MagicMock()
+    conn = mock.MagicMock()
+    conn.cursor.return_value.__enter__.return_value = cur
+    with mock.patch('db.view_counter.DatabasePool') as pool:
+        pool.get_connection.return_value = conn
+        yield pool, conn, cur
+
+
+@pytest.fixture
+def counter():
+    counter = ViewCounter(CONFIG)
+    yield counter
+    with mock.patch('db.view_counter.DatabasePool'):
+        counter.shutdown()
+
+
+def test_failed_write_requeues_the_counts(pool, counter):
+    pool_mock, conn, cur = pool
+    counter.increment(1, 3)
+    counter.increment(2)
+    pool_mock.get_connection.side_effect = errors.OperationalError("MySQL server has gone away")
+
+    assert counter.flush() is False
+    assert counter.pending(1) == 3
+    assert counter.pending() == 4
+    assert counter.stats()['failed_flushes'] == 1
+
+    pool_mock.get_connection.side_effect = None
+    assert counter.flush() is True
+    assert counter.pending() == 0
+    conn.commit.assert_called_once()
+
+
+def test_integrity_error_drops_only_the_missing_book(pool, counter):
+    _, conn, cur = pool
+
+    def execute(sql, params):
+        book_ids = params[0::3] if 'book_views_daily' in sql else params[0::2]
+        if 2 in book_ids:
+            raise errors.IntegrityError("Cannot add or update a child row: a foreign key constraint fails")
+
+    cur.execute.side_effect = execute
+    counter.increment(1, 3)
+    counter.increment(2, 5)
+
+    assert counter.flush() is True
+    stats = counter.stats()
+    assert stats['dropped'] == 5
+    assert stats['rows_written'] == 1
+    assert stats['pending'] == 0
+    conn.rollback.assert_called_once()
+    conn.commit.assert_called_once()
+    # After the batch failed, book 1 was written on its own (views, book_stats, daily) and book 2 refused
+    assert [call.args[1][0] for call in cur.execute.call_args_list[-4:]] == [1, 1, 1, 2]
+
+
+def test_shutdown_writes_pending_views(pool):
+    _, conn, cur = pool
+    counter = ViewCounter(CONFIG)
+    counter.increment(7, 2)
+    counter.shutdown()
+
+    assert counter.pending() == 0
+    assert cur.execute.call_count == 3
+    conn.commit.assert_called_once()
@@ -0,0 +1,86 @@
+import hashlib
+from functools import wraps
+
+from flask import current_app, make_response, request
+
+
+def body_etag(body):
+    """Strong ETag value for a response body, or any other bytes that identify its content."""
+    return hashlib.blake2b(body, digest_size=16).hexdigest()
+
+
+def is_not_modified(etag, last_modified=None):
+    """
+    Whether the client's cached copy is still current.
+
+    If-None-Match takes precedence; If-Modified-Since is only consulted
+    when the client sent no ETag.
+
+    Args:
+        etag: Current ETag value (unquoted)
+        last_modified: Current Last-Modified as an aware UTC datetime (optional)
+    """
+    if request.method not in ('GET', 'HEAD'):
+        return False
+    if request.if_none_match:
+        return request.if_none_match.contains_weak(etag)
+    if last_modified is not None and request.if_modified_since is not None:
+        # HTTP dates have one-second resolution
+        return last_modified.replace(microsecond=0) <= request.if_modified_since
+    return False
+
+
+def set_validators(response, etag, last_modified=None, private=False):
+    """Attach ETag, Last-Modified and a Cache-Control that makes clients revalidate."""
+    response.set_etag(etag)
+    if last_modified is not None:
+        response.last_modified = last_modified
+    response.headers['Cache-Control'] = 'private, no-cache' if private else 'no-cache'
+    return response
+
+
+def not_modified_response(etag, last_modified=None, private=False):
+    """Empty 304 response carrying the current validators."""
+    return set_validators(current_app.response_class(status=304), etag, last_modified, private)
+
+
+def versioned_response(version):
+    """
+    Give a GET view an ETag derived from a cheap version lookup, checked
+    before the view runs: a matching If-None-Match is answered 304 without
+    the view's queries or JSON encoding. The ETag covers the path and
+    query string, so each page of a listing has its own.
+
+    The version is read before the view, so a write that lands while the
+    view runs leaves the ETag older than the body and the next request
+    gets a full response.
+
+    Put it above cached_response to skip the cache lookup as well. A body
+    served from the cache keeps the cache's own ETag: it may predate the
+    current version (another worker's cache can miss an invalidation until
+    its TTL runs out), so only bodies built in this request get the
+    versioned one.
+
+    Args:
+        version: Callable (**view_args) -> value that changes whenever the
+            response would, e.g. the row's updated_at. None (missing row,
+            failed lookup) runs the view without validators.
+    """
+    def decorator(view):
+        @wraps(view)
+        def wrapper(*args, **kwargs):
+            if request.method not in ('GET', 'HEAD'):
+                return view(*args, **kwargs)
+            current = version(**kwargs)
+            if current is None:
+                return view(*args, **kwargs)
+            etag = body_etag(repr((request.full_path, current)).encode('utf-8'))
+            if is_not_modified(etag):
+                return not_modified_response(etag)
+            response = make_response(view(*args, **kwargs))
+            if (response.status_code != 200 or response.direct_passthrough
+                    or response.headers.get('X-Cache') == 'HIT'):
+                return response
+            return set_validators(response, etag)
+        return wrapper
+    return decorator
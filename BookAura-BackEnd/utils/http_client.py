@@ -0,0 +1,68 @@
+import os
+import threading
+
+import requests
+from requests.adapters import HTTPAdapter
+
+from db.config import get_http_client_config
+
+USER_AGENT = 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) BookAuraBackend/1.0'
+
+_session = None
+_session_pid = None
+_lock = threading.Lock()
+
+
+class PooledSession(requests.Session):
+    """requests.Session that applies a default (connect, read) timeout."""
+
+    def __init__(self, timeout):
+        super().__init__()
+        self.default_timeout = timeout
+
+    def request(self, method, url, **kwargs):
+        kwargs.setdefault('timeout', self.default_timeout)
+        return super().request(method, url, **kwargs)
+
+
+def create_session(config=None):
+    """
+    New keep-alive session with a bounded connection pool per host.
+
+    Responses are gzip/deflate compressed when the server supports it and
+    decoded transparently.
+
+    Args:
+        config: Settings from get_http_client_config (optional)
+    """
+    config = config or get_http_client_config()
+    session = PooledSession((config['connect_timeout'], config['read_timeout']))
+    adapter = HTTPAdapter(
+        pool_connections=config['pool_hosts'],
+        pool_maxsize=config['pool_maxsize'],
+        pool_block=config['pool_block'],
+    )
+    session.mount('https://', adapter)
+    session.mount('http://', adapter)
+    session.headers.update({
+        'User-Agent': USER_AGENT,
+        'Accept-Encoding': 'gzip, deflate',
+        'Connection': 'keep-alive',
+    })
+    return session
+
+
+def get_session():
+    """
+    The process-wide shared session, so repeated calls to the same host
+    reuse open connections instead of a new TCP and TLS handshake each.
+    A forked child gets its own session rather than the parent's sockets.
+    """
+    global _session, _session_pid
+    pid = os.getpid()
+    if _session is None or _session_pid != pid:
+        with _lock:
+            if _session is None or _session_pid != pid:
+                _session = create_session()
+                _session_pid = pid
+    return _session
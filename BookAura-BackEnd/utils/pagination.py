@@ -0,0 +1,131 @@
+import base64
+import binascii
+import json
+
+from flask import jsonify, request
+
+# Pagination is opt-in: without ?limit= or ?cursor= a list endpoint returns
+# every row, as it did before paging existed. A ?cursor= alone pages at
+# DEFAULT_PAGE_SIZE.
+DEFAULT_PAGE_SIZE = 50
+MAX_PAGE_SIZE = 200
+
+# List endpoints keep returning a JSON array; the cursor for the next page,
+# if there is one, travels in this header (exposed to browsers in app.py)
+NEXT_CURSOR_HEADER = 'X-Next-Cursor'
+
+
+def encode_cursor(values):
+    """Opaque cursor for the sort key of the last row on a page."""
+    raw = json.dumps(list(values), default=str, separators=(',', ':')).encode('utf-8')
+    return base64.urlsafe_b64encode(raw).decode('ascii').rstrip('=')
+
+
+def decode_cursor(cursor, key_size):
+    """
+    Sort key values from a cursor made by encode_cursor.
+
+    Raises:
+        ValueError: if the cursor is malformed or has the wrong number of values
+    """
+    try:
+        raw = base64.urlsafe_b64decode(cursor + '=' * (-len(cursor) % 4))
+        values = json.loads(raw)
+    except (binascii.Error, UnicodeDecodeError, ValueError):
+        raise ValueError("Invalid cursor")
+    if (not isinstance(values, list) or len(values) != key_size
+            or not all(isinstance(v, (str, int, float)) for v in values)):
+        raise ValueError("Invalid cursor")
+    return values
+
+
+def parse_page_args(limit, cursor, key_size):
+    """
+    Validate raw limit and cursor query values.
+
+    Args:
+        limit: Requested page size as given by the client, or None
+        cursor: Cursor from a previous page's X-Next-Cursor, or None
+        key_size: Number of columns in the endpoint's sort key
+
+    Returns:
+        (limit, after) where limit is capped at MAX_PAGE_SIZE and after is
+        the decoded sort key or None for the first page. (None, None) when
+        neither was given: the caller returns the whole listing.
+
+    Raises:
+        ValueError: on a non-numeric limit or a bad cursor
+    """
+    if limit in (None, '') and not cursor:
+        return None, None
+    if limit in (None, ''):
+        limit = DEFAULT_PAGE_SIZE
+    else:
+        try:
+            limit = int(limit)
+        except ValueError:
+            raise ValueError("limit must be an integer")
+    limit = max(1, min(limit, MAX_PAGE_SIZE))
+    after = decode_cursor(cursor, key_size) if cursor else None
+    return limit, after
+
+
+def page_args(key_size):
+    """parse_page_args for the current Flask request's ?limit= and ?cursor=."""
+    return parse_page_args(request.args.get('limit'), request.args.get('cursor'), key_size)
+
+
+def fetch_limit(limit):
+    """Rows to fetch for a page: one extra to detect a next page, or all when unpaged."""
+    return None if limit is None else limit + 1
+
+
+def keyset_condition(columns, after, descending=False):
+    """
+    WHERE condition selecting rows strictly after a sort key.
+
+    Written out as OR-ed prefixes rather than a row comparison so MySQL can
+    use a range scan on an index over the columns.
+
+    Args:
+        columns: Sort key columns, e.g. ['b.uploaded_at', 'b.book_id']
+        after: Values of the last row already returned
+        descending: Whether the listing is ordered by the key descending
+
+    Returns:
+        (sql, params)
+    """
+    op = '<' if descending else '>'
+    clauses = []
+    params = []
+    for i, column in enumerate(columns):
+        parts = [f"{prefix} = %s" for prefix in columns[:i]] + [f"{column} {op} %s"]
+        clauses.append("(" + " AND ".join(parts) + ")")
+        params.extend(list(after[:i]) + [after[i]])
+    return "(" + " OR ".join(clauses) + ")", params
+
+
+def split_page(rows, limit, key):
+    """
+    Trim rows fetched with LIMIT limit + 1 to one page.
+
+    Args:
+        rows: Rows in sort order, at most limit + 1 of them
+        limit: Page size, or None for an unpaged listing
+        key: Callable returning a row's sort key values
+
+    Returns:
+        (page_rows, next_cursor) where next_cursor is None on the last page
+    """
+    if limit is None or len(rows) <= limit:
+        return rows, None
+    page = rows[:limit]
+    return page, encode_cursor(key(page[-1]))
+
+
+def page_response(items, next_cursor):
+    """JSON array response with the next page's cursor in X-Next-Cursor."""
+    response = jsonify(items)
+    if next_cursor:
+        response.headers[NEXT_CURSOR_HEADER] = next_cursor
+    return response
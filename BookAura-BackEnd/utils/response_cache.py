@@ -0,0 +1,432 @@
+import json
+import logging
+import threading
+import time
+from collections import OrderedDict
+from datetime import datetime, timezone
+from functools import wraps
+
+from flask import current_app, make_response, request
+
+from db.config import get_response_cache_config
+from utils.conditional_requests import body_etag, is_not_modified, not_modified_response, set_validators
+from utils.pagination import NEXT_CURSOR_HEADER
+
+logger = logging.getLogger(__name__)
+
+
+# --------------------------
+# Tags
+# --------------------------
+# Every cached response carries tags naming the rows it was built from;
+# invalidating a tag drops exactly the responses that carry it.
+
+BOOK_LIST_TAG = 'books:list'      # GET /books/
+BOOK_SEARCH_TAG = 'books:search'  # GET /books/search/<q>; any new match changes results
+CATEGORIES_TAG = 'categories'     # GET /categories/
+
+
+# Response headers that are part of a cached entry and replayed on a hit
+CACHED_HEADERS = (NEXT_CURSOR_HEADER,)
+
+
+def book_tag(book_id):
+    return f'book:{book_id}'
+
+
+def category_tag(category_id):
+    return f'category:{category_id}'
+
+
+def user_bookmarks_tag(user_id):
+    return f'bookmarks:user:{user_id}'
+
+
+def book_change_tags(book_id, category_ids=()):
+    """
+    Tags to invalidate when a book is created, edited, approved or deleted:
+    responses that contain it, and every listing whose membership it affects.
+
+    Args:
+        book_id: ID of the changed book
+        category_ids: Categories the book belonged to before or after the change
+    """
+    return {BOOK_LIST_TAG, BOOK_SEARCH_TAG, book_tag(book_id)} | {category_tag(cid) for cid in category_ids}
+
+
+def category_change_tags(category_id, book_ids=()):
+    """Tags to invalidate when a category is renamed or deleted; its name is embedded in book listings."""
+    return ({CATEGORIES_TAG, BOOK_LIST_TAG, BOOK_SEARCH_TAG, category_tag(category_id)}
+            | {book_tag(book_id) for book_id in book_ids})
+
+
+# --------------------------
+# Backends
+# --------------------------
+
+# Generations: generation() returns a token taken before a view runs, and
+# set() refuses to store the response if any of the entry's own tags was
+# invalidated after that token, since the build may have read the old rows.
+# Invalidating unrelated tags does not affect it; clear() affects everything.
+
+class MemoryBackend:
+    """Per-process LRU of (body, mimetype, etag, stored_at, headers) entries with expiry and a tag index."""
+
+    def __init__(self, max_entries=1024):
+        self.max_entries = max_entries
+        self._lock = threading.Lock()
+        self._entries = OrderedDict()  # key -> (expires_at, value, tags)
+        self._tag_index = {}           # tag -> set of keys
+        self._clock = 0                # bumped by every invalidation
+        self._tag_versions = OrderedDict()  # tag -> clock at its last invalidation, oldest first
+        # Tokens older than this can no longer be checked tag by tag:
+        # clear() ran, or the versions they depend on were pruned
+        self._floor = 0
+
+    def get(self, key):
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            if entry[0] <= time.monotonic():
+                self._remove(key)
+                return None
+            self._entries.move_to_end(key)
+            return entry[1]
+
+    def set(self, key, value, ttl, tags, generation):
+        with self._lock:
+            # One of its tags was invalidated while the response was being
+            # built, so it may already be stale; serve it but do not store it
+            if generation < self._floor or any(self._tag_versions.get(tag, 0) > generation for tag in tags):
+                return False
+            self._remove(key)
+            self._entries[key] = (time.monotonic() + ttl, value, frozenset(tags))
+            for tag in tags:
+                self._tag_index.setdefault(tag, set()).add(key)
+            while len(self._entries) > self.max_entries:
+                self._remove(next(iter(self._entries)))
+            return True
+
+    def generation(self):
+        with self._lock:
+            return self._clock
+
+    def invalidate_tags(self, tags):
+        with self._lock:
+            self._clock += 1
+            keys = set()
+            for tag in tags:
+                self._tag_versions[tag] = self._clock
+                self._tag_versions.move_to_end(tag)
+                keys |= self._tag_index.pop(tag, set())
+            for key in keys:
+                self._remove(key)
+            # Bound the version map; builds older than the dropped versions are refused instead
+            while len(self._tag_versions) > 4 * self.max_entries:
+                _, version = self._tag_versions.popitem(last=False)
+                self._floor = max(self._floor, version)
+            return len(keys)
+
+    def clear(self):
+        with self._lock:
+            self._clock += 1
+            self._floor = self._clock
+            self._tag_versions.clear()
+            self._entries.clear()
+            self._tag_index.clear()
+
+    def size(self):
+        with self._lock:
+            return len(self._entries)
+
+    def _remove(self, key):
+        entry = self._entries.pop(key, None)
+        if entry is None:
+            return
+        for tag in entry[2]:
+            keys = self._tag_index.get(tag)
+            if keys is not None:
+                keys.discard(key)
+                if not keys:
+                    del self._tag_index[tag]
+
+
+class RedisBackend:
+    """
+    Cache shared by every worker process, so an invalidation in one worker
+    reaches all of them. Needs the optional redis package (pip install redis).
+    Each tag is a Redis set of the keys that carry it.
+    """
+
+    TAG_TTL = 24 * 3600
+    # How long a tag's invalidation version is kept; builds that take longer
+    # than this could store a response their tags made stale
+    TAG_VERSION_TTL = 3600
+
+    def __init__(self, url, key_prefix='bookaura:response:'):
+        import redis
+
+        self._redis = redis.Redis.from_url(url)
+        self._prefix = key_prefix
+        self._clock_key = key_prefix + 'clock'
+        self._floor_key = key_prefix + 'floor'
+
+    def _key(self, key):
+        return self._prefix + 'entry:' + key
+
+    def _tag_key(self, tag):
+        return self._prefix + 'tag:' + tag
+
+    def _version_key(self, tag):
+        return self._prefix + 'version:' + tag
+
+    def get(self, key):
+        raw = self._redis.get(self._key(key))
+        if raw is None:
+            return None
+        entry = json.loads(raw)
+        return (entry['body'].encode('utf-8'), entry['mimetype'], entry['etag'], entry['stored_at'],
+                entry.get('headers', {}))
+
+    def set(self, key, value, ttl, tags, generation):
+        tags = list(tags)
+        versions = self._redis.mget([self._floor_key] + [self._version_key(tag) for tag in tags])
+        if int(versions[0] or 0) > generation or any(int(v or 0) > generation for v in versions[1:]):
+            return False
+        body, mimetype, etag, stored_at, headers = value
+        entry = {'body': body.decode('utf-8'), 'mimetype': mimetype, 'etag': etag, 'stored_at': stored_at,
+                 'headers': headers}
+        pipe = self._redis.pipeline()
+        pipe.set(self._key(key), json.dumps(entry), ex=ttl)
+        for tag in tags:
+            pipe.sadd(self._tag_key(tag), key)
+            # Outlives any entry it points at; members whose entry already
+            # expired are harmless and go when the set does
+            pipe.expire(self._tag_key(tag), self.TAG_TTL)
+        pipe.execute()
+        return True
+
+    def generation(self):
+        return int(self._redis.get(self._clock_key) or 0)
+
+    def invalidate_tags(self, tags):
+        version = self._redis.incr(self._clock_key)
+        pipe = self._redis.pipeline()
+        for tag in tags:
+            pipe.set(self._version_key(tag), version, ex=self.TAG_VERSION_TTL)
+        pipe.execute()
+        removed = 0
+        for tag in tags:
+            keys = self._redis.smembers(self._tag_key(tag))
+            pipe = self._redis.pipeline()
+            for key in keys:
+                pipe.delete(self._key(key.decode('utf-8')))
+            pipe.delete(self._tag_key(tag))
+            removed += sum(pipe.execute()[:-1])
+        return removed
+
+    def clear(self):
+        self._redis.set(self._floor_key, self._redis.incr(self._clock_key))
+        for key in self._redis.scan_iter(match=self._prefix + 'entry:*'):
+            self._redis.delete(key)
+        for key in self._redis.scan_iter(match=self._prefix + 'tag:*'):
+            self._redis.delete(key)
+
+    def size(self):
+        return sum(1 for _ in self._redis.scan_iter(match=self._prefix + 'entry:*'))
+
+
+# --------------------------
+# Cache
+# --------------------------
+
+class ResponseCache:
+    """
+    Cache of serialised JSON responses for anonymous GET endpoints.
+
+    The backend is chosen by RESPONSE_CACHE_BACKEND (see
+    db.config.get_response_cache_config); it is created on first use.
+    Backend errors are logged and treated as misses, so an unavailable
+    shared cache never fails a request.
+    """
+
+    _config = None
+    _backend = None
+    _lock = threading.Lock()
+    _stats = {'hits': 0, 'misses': 0, 'stores': 0, 'invalidations': 0, 'invalidated': 0, 'errors': 0}
+
+    @classmethod
+    def enabled(cls):
+        if cls._config is None:
+            cls._config = get_response_cache_config()
+        return cls._config['enabled']
+
+    @classmethod
+    def backend(cls):
+        if cls._backend is None:
+            with cls._lock:
+                if cls._backend is None:
+                    if cls._config is None:
+                        cls._config = get_response_cache_config()
+                    if cls._config['backend'] == 'redis':
+                        cls._backend = RedisBackend(cls._config['redis_url'], cls._config['key_prefix'])
+                    else:
+                        cls._backend = MemoryBackend(cls._config['max_entries'])
+                    logger.info(f"Response cache using {type(cls._backend).__name__}")
+        return cls._backend
+
+    @classmethod
+    def set_backend(cls, backend):
+        """Plug in a backend object with the MemoryBackend interface."""
+        with cls._lock:
+            cls._backend = backend
+
+    @classmethod
+    def _count(cls, name, amount=1):
+        with cls._lock:
+            cls._stats[name] += amount
+
+    @classmethod
+    def get(cls, key):
+        try:
+            value = cls.backend().get(key)
+        except Exception as e:
+            logger.warning(f"Response cache read failed: {e}")
+            cls._count('errors')
+            return None
+        cls._count('hits' if value is not None else 'misses')
+        return value
+
+    @classmethod
+    def generation(cls):
+        try:
+            return cls.backend().generation()
+        except Exception as e:
+            logger.warning(f"Response cache read failed: {e}")
+            cls._count('errors')
+            return None
+
+    @classmethod
+    def set(cls, key, value, ttl, tags, generation):
+        if generation is None:
+            return False
+        try:
+            stored = cls.backend().set(key, value, ttl, tags, generation)
+        except Exception as e:
+            logger.warning(f"Response cache write failed: {e}")
+            cls._count('errors')
+            return False
+        if stored:
+            cls._count('stores')
+        return stored
+
+    @classmethod
+    def invalidate(cls, tags):
+        """
+        Drop every cached response carrying any of the tags.
+
+        Returns:
+            Number of responses removed
+        """
+        if not cls.enabled() or not tags:
+            return 0
+        try:
+            removed = cls.backend().invalidate_tags(set(tags))
+        except Exception as e:
+            logger.error(f"Response cache invalidation failed for {sorted(tags)}: {e}")
+            cls._count('errors')
+            return 0
+        cls._count('invalidations')
+        cls._count('invalidated', removed)
+        return removed
+
+    @classmethod
+    def clear(cls):
+        try:
+            cls.backend().clear()
+        except Exception as e:
+            logger.error(f"Response cache clear failed: {e}")
+            cls._count('errors')
+
+    @classmethod
+    def stats(cls):
+        """Hit, miss, store and invalidation counters plus the current entry count."""
+        with cls._lock:
+            stats = dict(cls._stats)
+        try:
+            stats['entries'] = cls.backend().size()
+        except Exception:
+            stats['entries'] = None
+        return stats
+
+
+def cached_response(ttl, tags=None, vary=None):
+    """
+    Cache a GET view's 200 responses for ttl seconds, keyed by path and query string.
+
+    Entries keep an ETag and the time they were stored, so a conditional
+    request that hits the cache is answered 304 without running the view.
+
+    Args:
+        ttl: Seconds an entry may be served
+        tags: Callable (payload, **view_args) -> iterable of tags, where
+            payload is the decoded JSON body; entries without tags expire
+            by TTL only
+        vary: Callable (**view_args) -> key suffix for per-user responses,
+            or None to bypass the cache for this request. Without it the
+            response must be the same for every caller: the Authorization
+            header and cookies are not part of the key. With it, the suffix
+            is also passed to tags as `variant` and responses are marked private.
+    """
+    def decorator(view):
+        @wraps(view)
+        def wrapper(*args, **kwargs):
+            if request.method != 'GET' or not ResponseCache.enabled():
+                return view(*args, **kwargs)
+
+            key = request.full_path
+            tag_args = dict(kwargs)
+            private = vary is not None
+            if private:
+                variant = vary(**kwargs)
+                if variant is None:
+                    return view(*args, **kwargs)
+                key = f"{key}#{variant}"
+                tag_args['variant'] = variant
+
+            cached = ResponseCache.get(key)
+            if cached is not None:
+                body, mimetype, etag, stored_at, headers = cached
+                last_modified = datetime.fromtimestamp(stored_at, timezone.utc)
+                if is_not_modified(etag, last_modified):
+                    response = not_modified_response(etag, last_modified, private)
+                else:
+                    response = current_app.response_class(body, status=200, mimetype=mimetype)
+                    set_validators(response, etag, last_modified, private)
+                response.headers.update(headers)
+                response.headers['X-Cache'] = 'HIT'
+                return response
+
+            generation = ResponseCache.generation()
+            response = make_response(view(*args, **kwargs))
+            if response.status_code != 200 or response.direct_passthrough:
+                return response
+
+            body = response.get_data()
+            etag = body_etag(body)
+            stored_at = time.time()
+            headers = {name: response.headers[name] for name in CACHED_HEADERS if name in response.headers}
+            entry_tags = set(tags(response.get_json(silent=True), **tag_args)) if tags else set()
+            ResponseCache.set(key, (body, response.mimetype, etag, stored_at, headers), ttl, entry_tags, generation)
+
+            last_modified = datetime.fromtimestamp(stored_at, timezone.utc)
+            if is_not_modified(etag):
+                response = not_modified_response(etag, last_modified, private)
+                response.headers.update(headers)
+            else:
+                set_validators(response, etag, last_modified, private)
+            response.headers['X-Cache'] = 'MISS'
+            return response
+        return wrapper
+    return decorator
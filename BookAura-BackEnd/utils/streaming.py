@@ -0,0 +1,61 @@
+import json
+
+from flask import Response, request, stream_with_context
+
+NDJSON_MIMETYPE = 'application/x-ndjson'
+EXPORT_FORMATS = ('ndjson', 'json')
+
+
+def _dumps(row):
+    return json.dumps(row, default=str, separators=(',', ':'))
+
+
+def _ndjson_chunks(batches, transform):
+    for batch in batches:
+        yield ''.join(_dumps(transform(row)) + '\n' for row in batch)
+
+
+def _json_array_chunks(batches, transform):
+    yield '['
+    first = True
+    for batch in batches:
+        chunk = ','.join(_dumps(transform(row)) for row in batch)
+        yield chunk if first else ',' + chunk
+        first = False
+    yield ']'
+
+
+def export_format():
+    """Export format requested with ?format=, "ndjson" by default."""
+    fmt = request.args.get('format', 'ndjson').lower()
+    if fmt not in EXPORT_FORMATS:
+        raise ValueError(f"format must be one of: {', '.join(EXPORT_FORMATS)}")
+    return fmt
+
+
+def stream_rows_response(batches, transform=dict, fmt='ndjson', filename=None):
+    """
+    Chunked response that writes rows as they are read.
+
+    Each batch becomes one chunk, so memory holds one batch rather than the
+    whole result. Errors after the first chunk can no longer change the
+    status code; the body is then cut short.
+
+    Args:
+        batches: Iterable of row lists, e.g. from BaseModel.stream_query
+        transform: Callable turning a row into a JSON-serialisable value
+        fmt: "ndjson" for one JSON document per line, or "json" for a
+            single array
+        filename: Download name for a Content-Disposition header (optional)
+    """
+    if fmt == 'ndjson':
+        chunks, mimetype = _ndjson_chunks(batches, transform), NDJSON_MIMETYPE
+    else:
+        chunks, mimetype = _json_array_chunks(batches, transform), 'application/json'
+    response = Response(stream_with_context(chunks), mimetype=mimetype)
+    if filename:
+        extension = 'ndjson' if fmt == 'ndjson' else 'json'
+        response.headers['Content-Disposition'] = f'attachment; filename="{filename}.{extension}"'
+    # Keep reverse proxies from buffering the whole export
+    response.headers['X-Accel-Buffering'] = 'no'
+    return response